@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+boto3 client 复用模块
+
+功能：
+- 按 (service, access_key, secret_key, region) 复用 boto3 client，避免每次采集都重新创建 Session、解析服务模型和建立 TLS 连接
+- 所有 API 封装类（EC2Client、CloudWatchClient 等）共用
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+from retry.client_config import AWS_CLIENT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# 同一个 client 会被并发采集线程共享（默认凭证链下所有账号共用），连接池至少覆盖并发线程数
+# 可通过 AWS_CLIENT_MAX_POOL_CONNECTIONS 显式指定
+_MAX_POOL_CONNECTIONS = int(os.getenv(
+    'AWS_CLIENT_MAX_POOL_CONNECTIONS',
+    str(max(16, int(os.getenv('COLLECTION_MAX_WORKERS', '32'))))
+))
+_CLIENT_CONFIG = AWS_CLIENT_CONFIG.merge(Config(max_pool_connections=_MAX_POOL_CONNECTIONS))
+
+# boto3 Session 非线程安全，但创建好的 client 是线程安全的，因此只在锁内创建
+_client_cache: Dict[Tuple[str, Optional[str], Optional[str], str], object] = {}
+_client_cache_lock = threading.Lock()
+
+
+def get_client(service_name: str, region: str, access_key: str = None, secret_key: str = None):
+    """
+    获取（或创建并缓存）boto3 client
+
+    Args:
+        service_name: boto3 服务名（如 'ec2', 'cloudwatch', 'elbv2'）
+        region: AWS 区域
+        access_key: AWS Access Key（可选，如果提供则使用指定凭证）
+        secret_key: AWS Secret Key（可选，如果提供则使用指定凭证）
+
+    Returns:
+        boto3 client（线程安全，可跨线程共享）
+    """
+    if access_key and secret_key:
+        cache_key = (service_name, access_key, secret_key, region)
+    else:
+        cache_key = (service_name, None, None, region)
+
+    with _client_cache_lock:
+        client = _client_cache.get(cache_key)
+        if client is None:
+            if access_key and secret_key:
+                session = boto3.Session(
+                    aws_access_key_id=access_key,
+                    aws_secret_access_key=secret_key
+                )
+                logger.debug(f"{service_name} 客户端初始化成功（使用指定凭证），区域: {region}")
+            else:
+                # 使用默认凭证链（环境变量、配置文件、IAM 角色等）
+                session = boto3.Session()
+                logger.debug(f"{service_name} 客户端初始化成功（使用默认凭证链），区域: {region}")
+            client = session.client(service_name, region_name=region, config=_CLIENT_CONFIG)
+            _client_cache[cache_key] = client
+    return client
@@ -8,8 +8,8 @@ CloudFront API 客户端模块
 """
 
 import logging
-import boto3
 from botocore.exceptions import ClientError, BotoCoreError
+from api.aws.client_cache import get_client
 from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
@@ -36,16 +36,8 @@ class CloudFrontClient:
         self.region = region
         
         try:
-            if access_key and secret_key:
-                # 使用指定的凭证创建 Session
-                session = boto3.Session(
-                    aws_access_key_id=access_key,
-                    aws_secret_access_key=secret_key
-                )
-                self.client = session.client('cloudfront', region_name=region)
-            else:
-                # 使用默认凭证链
-                self.client = boto3.client('cloudfront', region_name=region)
+            # 同一凭证 + region 复用同一个 boto3 client（共享连接池，不重复创建 Session）
+            self.client = get_client('cloudfront', region, access_key, secret_key)
             
             logger.debug(f"CloudFront 客户端初始化成功 (region: {region})")
         except Exception as e:
@@ -7,10 +7,10 @@ EC2/EBS API 客户端模块
 - 返回资源数据供使用量计算
 """
 
-import boto3
 import logging
 from typing import List, Dict, Any, Optional
 from botocore.exceptions import ClientError, BotoCoreError
+from api.aws.client_cache import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -36,16 +36,8 @@ class EC2Client:
         """
         self.region = region
         try:
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key,
-                    aws_secret_access_key=secret_key
-                )
-                self.client = session.client('ec2', region_name=region)
-                logger.debug(f"EC2 客户端初始化成功（使用指定凭证），区域: {region}")
-            else:
-                self.client = boto3.client('ec2', region_name=region)
-                logger.debug(f"EC2 客户端初始化成功（使用默认凭证链），区域: {region}")
+            # 同一凭证 + region 复用同一个 boto3 client（共享连接池，不重复创建 Session）
+            self.client = get_client('ec2', region, access_key, secret_key)
         except Exception as e:
             logger.error(f"初始化 EC2 客户端失败: {e}")
             raise
@@ -55,21 +47,22 @@ class EC2Client:
         描述 EBS 卷
         
         Args:
-            volume_type: 卷类型过滤（如 'gp3', 'io1', 'io2', 'st1', 'sc1'）
+            volume_type: 卷类型过滤（如 'gp3', 'io1', 'io2', 'st1', 'sc1'；None 表示所有卷）
         
         Returns:
             卷列表，每个卷包含 Size, VolumeType, Iops 等字段
         """
         try:
             volumes = []
-            filters = []
             
+            # 不指定卷类型时不传 Filters（botocore 不接受 Filters=None），一次扫描返回所有卷
+            params = {}
             if volume_type:
-                filters.append({'Name': 'volume-type', 'Values': [volume_type]})
+                params['Filters'] = [{'Name': 'volume-type', 'Values': [volume_type]}]
             
             paginator = self.client.get_paginator('describe_volumes')
             
-            for page in paginator.paginate(Filters=filters if filters else None):
+            for page in paginator.paginate(**params):
                 for volume in page.get('Volumes', []):
                     volumes.append({
                         'VolumeId': volume.get('VolumeId', ''),
@@ -170,6 +163,66 @@ class EC2Client:
             logger.error(f"DescribeVpnConnections 失败: {e}")
             raise
     
+    def count_snapshots(self, owner_id: str = 'self') -> int:
+        """
+        统计 EBS 快照数量（逐页计数，不构建快照列表）
+        
+        Args:
+            owner_id: 所有者 ID（默认 'self'）
+        
+        Returns:
+            快照数量
+        """
+        try:
+            count = 0
+            
+            # 指定分页大小：不指定 MaxResults 时 DescribeSnapshots 会一次返回全部快照
+            paginator = self.client.get_paginator('describe_snapshots')
+            
+            for page in paginator.paginate(OwnerIds=[owner_id], PaginationConfig={'PageSize': 1000}):
+                count += len(page.get('Snapshots', []))
+            
+            logger.debug(f"快照数量: {count}")
+            return count
+            
+        except Exception as e:
+            logger.error(f"DescribeSnapshots 失败: {e}")
+            raise
+    
+    def count_addresses(self) -> int:
+        """
+        统计弹性 IP 地址数量（不构建地址列表）
+        
+        Returns:
+            弹性 IP 数量
+        """
+        try:
+            response = self.client.describe_addresses()
+            count = len(response.get('Addresses', []))
+            logger.debug(f"弹性 IP 数量: {count}")
+            return count
+            
+        except Exception as e:
+            logger.error(f"DescribeAddresses 失败: {e}")
+            raise
+    
+    def count_vpn_connections(self) -> int:
+        """
+        统计 VPN 连接数量（不构建连接列表）
+        
+        Returns:
+            VPN 连接数量
+        """
+        try:
+            response = self.client.describe_vpn_connections()
+            count = len(response.get('VpnConnections', []))
+            logger.debug(f"VPN 连接数量: {count}")
+            return count
+            
+        except Exception as e:
+            logger.error(f"DescribeVpnConnections 失败: {e}")
+            raise
+    
     def describe_instances(self, filters: Optional[List[Dict]] = None) -> List[Dict[str, Any]]:
         """
         描述 EC2 实例
@@ -7,10 +7,10 @@ EKS API 客户端模块
 - 获取集群、节点组、Fargate profiles 等资源信息
 """
 
-import boto3
 import logging
 from typing import List, Dict, Any, Optional
 from botocore.exceptions import ClientError, BotoCoreError
+from api.aws.client_cache import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -35,16 +35,8 @@ class EKSClient:
         """
         self.region = region
         try:
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key,
-                    aws_secret_access_key=secret_key
-                )
-                self.client = session.client('eks', region_name=region)
-                logger.debug(f"EKS 客户端初始化成功（使用指定凭证），区域: {region}")
-            else:
-                self.client = boto3.client('eks', region_name=region)
-                logger.debug(f"EKS 客户端初始化成功（使用默认凭证链），区域: {region}")
+            # 同一凭证 + region 复用同一个 boto3 client（共享连接池，不重复创建 Session）
+            self.client = get_client('eks', region, access_key, secret_key)
         except Exception as e:
             logger.error(f"初始化 EKS 客户端失败: {e}")
             raise
@@ -7,10 +7,10 @@ Elastic Load Balancing API 客户端模块
 - 获取负载均衡器、目标组、规则等资源信息
 """
 
-import boto3
 import logging
 from typing import List, Dict, Any, Optional
 from botocore.exceptions import ClientError, BotoCoreError
+from api.aws.client_cache import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -36,17 +36,8 @@ class ELBClient:
         """
         self.region = region
         try:
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key,
-                    aws_secret_access_key=secret_key
-                )
-                self.client = session.client('elbv2', region_name=region)
-                logger.debug(f"ELB 客户端初始化成功（使用指定凭证），区域: {region}")
-            else:
-                # ELBv2 客户端（支持 ALB 和 NLB）
-                self.client = boto3.client('elbv2', region_name=region)
-                logger.debug(f"ELB 客户端初始化成功（使用默认凭证链），区域: {region}")
+            # 同一凭证 + region 复用同一个 boto3 client（共享连接池，不重复创建 Session）
+            self.client = get_client('elbv2', region, access_key, secret_key)
         except Exception as e:
             logger.error(f"初始化 ELB 客户端失败: {e}")
             raise
@@ -7,10 +7,10 @@ Route 53 API 客户端模块
 - 获取配额限制和资源使用量
 """
 
-import boto3
 import logging
 from typing import Dict, Any, Optional
 from botocore.exceptions import ClientError, BotoCoreError
+from api.aws.client_cache import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -35,19 +35,8 @@ class Route53Client:
         """
         self.region = region
         try:
-            # 如果提供了 access_key 和 secret_key，使用指定凭证
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key,
-                    aws_secret_access_key=secret_key
-                )
-                self.client = session.client('route53', region_name=region)
-                logger.debug(f"Route53 客户端初始化成功（使用指定凭证），区域: {region}")
-            else:
-                # Route 53 是全局服务，但 boto3 客户端需要指定 region（通常使用 us-east-1）
-                # 使用默认凭证链（环境变量、配置文件、IAM 角色等）
-                self.client = boto3.client('route53', region_name=region)
-                logger.debug(f"Route53 客户端初始化成功（使用默认凭证链），区域: {region}")
+            # 同一凭证 + region 复用同一个 boto3 client（共享连接池，不重复创建 Session）
+            self.client = get_client('route53', region, access_key, secret_key)
         except Exception as e:
             logger.error(f"初始化 Route53 客户端失败: {e}")
             raise
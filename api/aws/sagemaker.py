@@ -8,11 +8,11 @@ SageMaker API 客户端模块
 - 使用免费的 List API，控制成本
 """
 
-import boto3
 import logging
 import time
 from typing import List, Dict, Optional
 from botocore.exceptions import ClientError, BotoCoreError
+from api.aws.client_cache import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +27,9 @@ class SageMakerClient:
     - 使用免费的 List API，控制成本
     """
     
+    # List* API 允许的最大页大小（默认仅 10 条/页）
+    LIST_PAGE_SIZE = 100
+    
     def __init__(self, region: str = 'us-east-1', access_key: str = None, secret_key: str = None):
         """
         初始化 SageMaker 客户端
@@ -38,18 +41,8 @@ class SageMakerClient:
         """
         self.region = region
         try:
-            # 如果提供了 access_key 和 secret_key，使用指定凭证
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key,
-                    aws_secret_access_key=secret_key
-                )
-                self.client = session.client('sagemaker', region_name=region)
-                logger.debug(f"SageMaker 客户端初始化成功（使用指定凭证），区域: {region}")
-            else:
-                # 使用默认凭证链（环境变量、配置文件、IAM 角色等）
-                self.client = boto3.client('sagemaker', region_name=region)
-                logger.debug(f"SageMaker 客户端初始化成功（使用默认凭证链），区域: {region}")
+            # 同一凭证 + region 复用同一个 boto3 client（共享连接池，不重复创建 Session）
+            self.client = get_client('sagemaker', region, access_key, secret_key)
         except Exception as e:
             logger.error(f"初始化 SageMaker 客户端失败: {e}")
             raise
@@ -78,7 +71,7 @@ class SageMakerClient:
                 paginate_params['StatusEquals'] = status_filter
             
             # 分页获取所有 Notebook Instances
-            for page in paginator.paginate(**paginate_params):
+            for page in paginator.paginate(**paginate_params, PaginationConfig={'PageSize': self.LIST_PAGE_SIZE}):
                 for instance in page.get('NotebookInstances', []):
                     notebook_instances.append({
                         'NotebookInstanceName': instance.get('NotebookInstanceName', ''),
@@ -124,7 +117,7 @@ class SageMakerClient:
             
             # 分页获取所有 Training Jobs
             page_count = 0
-            for page in paginator.paginate(**paginate_params):
+            for page in paginator.paginate(**paginate_params, PaginationConfig={'PageSize': self.LIST_PAGE_SIZE}):
                 page_count += 1
                 page_jobs = page.get('TrainingJobSummaries', [])
                 for job in page_jobs:
@@ -174,7 +167,7 @@ class SageMakerClient:
             
             # 分页获取所有 Endpoints
             page_count = 0
-            for page in paginator.paginate(**paginate_params):
+            for page in paginator.paginate(**paginate_params, PaginationConfig={'PageSize': self.LIST_PAGE_SIZE}):
                 page_count += 1
                 page_endpoints = page.get('Endpoints', [])
                 for endpoint in page_endpoints:
@@ -223,7 +216,7 @@ class SageMakerClient:
                 paginate_params['StatusEquals'] = status_filter
             
             # 只计数，不构建对象列表
-            for page in paginator.paginate(**paginate_params):
+            for page in paginator.paginate(**paginate_params, PaginationConfig={'PageSize': self.LIST_PAGE_SIZE}):
                 count += len(page.get('NotebookInstances', []))
             
             logger.debug(f"Notebook Instance 数量: {count}")
@@ -274,7 +267,7 @@ class SageMakerClient:
             last_count = 0
             no_progress_pages = 0  # 连续无进展的页数
             
-            for page in paginator.paginate(**paginate_params):
+            for page in paginator.paginate(**paginate_params, PaginationConfig={'PageSize': self.LIST_PAGE_SIZE}):
                 page_count += 1
                 page_jobs = page.get('TrainingJobSummaries', [])
                 page_count_value = len(page_jobs)
@@ -352,7 +345,7 @@ class SageMakerClient:
             
             # 只计数，不构建对象列表
             page_count = 0
-            for page in paginator.paginate(**paginate_params):
+            for page in paginator.paginate(**paginate_params, PaginationConfig={'PageSize': self.LIST_PAGE_SIZE}):
                 page_count += 1
                 page_endpoints = page.get('Endpoints', [])
                 count += len(page_endpoints)
@@ -4,12 +4,21 @@
 
 功能：
 - 内存缓存实现（带 TTL）
+- LRU 容量上限，长时间运行时内存不会无限增长
 - 支持缓存命中率统计
+- cached 装饰器：为实例方法的返回值加上 MemoryCache 缓存
 """
 
+import os
 import time
+import random
+import logging
 import threading
-from typing import Optional, Tuple, Dict, Any
+import functools
+from collections import OrderedDict
+from typing import Optional, Tuple, Any, Callable
+
+logger = logging.getLogger(__name__)
 
 
 class MemoryCache:
@@ -20,11 +29,18 @@ class MemoryCache:
     - 存储 API 响应数据
     - 支持 TTL（Time To Live）
     - 自动清理过期条目
+    - 超过 max_entries 时淘汰最久未使用的条目
     """
     
-    def __init__(self):
-        """初始化内存缓存"""
-        self._cache: Dict[str, Tuple[Any, float]] = {}  # key -> (value, expiration_time)
+    def __init__(self, max_entries: int = None):
+        """
+        初始化内存缓存
+        
+        Args:
+            max_entries: 最大条目数（默认读取 USAGE_CACHE_MAX，10000）
+        """
+        self.max_entries = max_entries or int(os.getenv('USAGE_CACHE_MAX', '10000'))
+        self._cache: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()  # key -> (value, expiration_time)
         self._lock = threading.RLock()  # 线程安全锁
     
     def get(self, key: str) -> Tuple[Optional[Any], bool]:
@@ -49,7 +65,8 @@ class MemoryCache:
                 del self._cache[key]
                 return None, False
             
-            # 缓存命中
+            # 缓存命中（标记为最近使用）
+            self._cache.move_to_end(key)
             return value, True
     
     def set(self, key: str, value: Any, ttl: int):
@@ -64,6 +81,9 @@ class MemoryCache:
         with self._lock:
             expiration_time = time.time() + ttl
             self._cache[key] = (value, expiration_time)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
     
     def delete(self, key: str):
         """删除缓存值"""
@@ -86,3 +106,41 @@ class MemoryCache:
             ]
             for key in expired_keys:
                 del self._cache[key]
+
+
+def cached(key: Callable[..., str], ttl: Optional[int] = None, jitter: float = 0.1):
+    """
+    方法结果缓存装饰器（被装饰方法所属实例需提供 self.cache: MemoryCache）
+    
+    只缓存真值结果：空结果（如 API 全部失败返回的 {}）不写入缓存，下次调用重新执行。
+    实际 TTL 在 [ttl * (1 - jitter), ttl] 内随机，同一批写入的条目不会在同一时刻集中过期；
+    只向下抖动，保证不晚于按 ttl 周期调度的下一次采集过期。
+    
+    被装饰方法带有 cache_key 属性（即 key），可据此删除指定参数对应的缓存条目。
+    
+    Args:
+        key: 根据方法参数生成缓存键的函数，签名与被装饰方法相同（包含 self）
+        ttl: 缓存时间（秒，默认使用实例的 self.cache_ttl）
+        jitter: TTL 向下随机抖动的比例（默认 0.1，0 表示不抖动）
+    
+    Returns:
+        装饰器
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            cache_key = key(self, *args, **kwargs)
+            value, exists = self.cache.get(cache_key)
+            if exists:
+                logger.debug("缓存命中: %s", cache_key)
+                return value
+            
+            result = fn(self, *args, **kwargs)
+            if result:
+                base_ttl = self.cache_ttl if ttl is None else ttl
+                self.cache.set(cache_key, result, base_ttl - random.randint(0, int(base_ttl * jitter)))
+            return result
+        # 暴露缓存键函数，供调用方定向失效某个条目
+        wrapper.cache_key = key
+        return wrapper
+    return decorator
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+在途请求合并模块（single-flight）
+
+功能：
+- 同一 key 的请求在途时，后来的线程等待第一个请求的结果，不重复发起 API 调用
+- 请求完成（成功或异常）后立即移除在途记录，后续调用重新发起
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class InflightRegistry:
+    """
+    在途请求登记表
+
+    功能：
+    - do(key, fn): 同一 key 只有一个线程执行 fn，其余线程共享其结果（或异常）
+    """
+
+    def __init__(self):
+        """初始化在途请求登记表"""
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        执行（或等待）key 对应的请求
+
+        返回值在所有等待线程之间共享，调用方不应原地修改。
+
+        Args:
+            key: 请求标识
+            fn: 实际发起请求的函数
+
+        Returns:
+            fn 的返回值
+
+        Raises:
+            fn 抛出的异常（等待线程同样收到该异常）
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
@@ -3,30 +3,52 @@
 配额 Limit 缓存模块
 
 功能：
-- 文件缓存配额 Limit 数据（24 小时）
-- 减少 API 调用，大幅提升采集速度
+- SQLite 单文件持久化配额 Limit 数据（24 小时）
+- 内存 LRU 缓存热点数据（有容量上限），避免重复查询磁盘
+- 按 (account, region, service) 批量预读，减少 API 调用，大幅提升采集速度
 """
 
 import os
 import json
 import time
 import logging
-from typing import Optional, Dict, Any
-from pathlib import Path
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple, Iterable
+
+from collector.quota_result import QuotaResult, QuotaStatus
 
 logger = logging.getLogger(__name__)
 
+# orjson 直接序列化为 bytes，速度明显快于标准库 json；未安装时回退到 json
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    logger.info("orjson 未安装，配额 Limit 缓存使用标准库 json 序列化。可运行: pip install orjson")
+    
+    def _dumps(quota_data: Dict[str, Any]) -> str:
+        return json.dumps(quota_data, ensure_ascii=False)
+    
+    _loads = json.loads
+
 
 class QuotaLimitCache:
     """
-    配额 Limit 文件缓存
+    配额 Limit 缓存（SQLite 持久化 + 内存 LRU）
     
     功能：
     - 缓存配额 Limit 数据（24 小时）
     - 缓存键格式：{account_id}:{region}:{service}:{quota_code}
-    - 缓存文件：.quota_limit_cache/{account_id}/{region}/{service}.json
+    - 缓存文件：.quota_limit_cache/quota_limits.sqlite3（每个配额一行，独立记录写入时间）
+    - 内存层：以 (account_id, region, service, quota_code) 为键的 LRU，最多 QUOTA_CACHE_MAX 条
+    - 内存层同时保存由缓存数据构建的成功 QuotaResult，命中时直接复用同一个对象
     """
     
+    DB_FILE = 'quota_limits.sqlite3'
+    
     def __init__(self, cache_dir: str = None, cache_ttl: int = None):
         """
         初始化配额 Limit 缓存
@@ -37,17 +59,47 @@ class QuotaLimitCache:
         """
         self.cache_dir = cache_dir or os.getenv('QUOTA_LIMIT_CACHE_DIR', '.quota_limit_cache')
         self.cache_ttl = cache_ttl or int(os.getenv('QUOTA_LIMIT_CACHE_TTL', '86400'))  # 默认 24 小时
+        self.max_entries = int(os.getenv('QUOTA_CACHE_MAX', '10000'))  # 内存层最大条目数
+        
+        # 内存 LRU：key -> (quota_data, 写入时间, 已构建的 QuotaResult 或 None)
+        self._memory: "OrderedDict[Tuple[str, str, str, str], Tuple[Dict[str, Any], float, Optional[QuotaResult]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # 负缓存：确定性失败（配额不存在 / 权限不足）在 TTL 内不再重复调用 API
+        # key -> (reason, error, 过期时间)
+        self.negative_ttls = {
+            'quota_not_found': int(os.getenv('QUOTA_NEGATIVE_CACHE_TTL_NOT_FOUND', '86400')),    # 默认 24 小时
+            'permission_denied': int(os.getenv('QUOTA_NEGATIVE_CACHE_TTL_DENIED', '21600')),     # 默认 6 小时
+        }
+        self._negative: "OrderedDict[Tuple[str, str, str, str], Tuple[str, str, float]]" = OrderedDict()
         
         # 创建缓存目录
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir, exist_ok=True)
         
-        logger.info(f"初始化配额 Limit 缓存: {self.cache_dir}, TTL: {self.cache_ttl} 秒 ({self.cache_ttl // 3600} 小时)")
+        # 单连接供所有采集线程共享，读写统一由 _db_lock 串行化
+        self.db_path = os.path.join(self.cache_dir, self.DB_FILE)
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        with self._db_lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS quota_limits ('
+                'account_id TEXT NOT NULL, region TEXT NOT NULL, service TEXT NOT NULL, quota_code TEXT NOT NULL, '
+                'data BLOB NOT NULL, ts REAL NOT NULL, '
+                'PRIMARY KEY (account_id, region, service, quota_code))'
+            )
+        
+        logger.info(f"初始化配额 Limit 缓存: {self.db_path}, TTL: {self.cache_ttl} 秒 ({self.cache_ttl // 3600} 小时)")
     
-    def _get_cache_file_path(self, account_id: str, region: str, service: str) -> str:
-        """获取缓存文件路径"""
-        cache_subdir = os.path.join(self.cache_dir, account_id, region)
-        return os.path.join(cache_subdir, f"{service}.json")
+    def _remember(self, key: Tuple[str, str, str, str], quota_data: Dict[str, Any], timestamp: float):
+        """写入内存 LRU，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            self._memory[key] = (quota_data, timestamp, None)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
     
     def get(self, account_id: str, region: str, service: str, quota_code: str) -> Optional[Dict[str, Any]]:
         """
@@ -62,34 +114,117 @@ class QuotaLimitCache:
         Returns:
             配额 Limit 数据（如果缓存有效），否则返回 None
         """
-        cache_file = self._get_cache_file_path(account_id, region, service)
+        key = (account_id, region, service, quota_code)
         
-        if not os.path.exists(cache_file):
-            return None
+        # 先查内存层（返回副本，调用方会原地补充上下文字段）
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                quota_data, timestamp, _ = entry
+                if time.time() - timestamp <= self.cache_ttl:
+                    self._memory.move_to_end(key)
+                    return dict(quota_data)
+                del self._memory[key]
         
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            
-            # 检查缓存是否过期
-            cache_time = cache_data.get('timestamp', 0)
-            if time.time() - cache_time > self.cache_ttl:
-                logger.debug(f"配额 Limit 缓存已过期: {account_id}:{region}:{service}")
+        quota_data = self.get_many(account_id, region, service, (quota_code,)).get(quota_code)
+        if quota_data:
+            logger.debug(f"从缓存获取配额 Limit: {account_id}:{region}:{service}:{quota_code}")
+            return dict(quota_data)
+        return None
+    
+    def get_result(self, account_id: str, region: str, service: str, quota_code: str,
+                   quota_name: str) -> Optional[QuotaResult]:
+        """
+        获取由缓存数据构建的成功采集结果
+        
+        同一条缓存数据只构建一次 QuotaResult，之后的命中直接返回同一个对象（调用方只读）；
+        set() 写入新数据或条目过期 / 被淘汰时随之失效。
+        
+        Args:
+            account_id: 账号 ID
+            region: 区域
+            service: 服务代码
+            quota_code: 配额代码
+            quota_name: 配额名称（与已构建结果不一致时重新构建）
+        
+        Returns:
+            QuotaResult 对象（如果缓存有效），否则返回 None
+        """
+        key = (account_id, region, service, quota_code)
+        
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                quota_data, timestamp, result = entry
+                if time.time() - timestamp > self.cache_ttl:
+                    del self._memory[key]
+                    entry = None
+                else:
+                    self._memory.move_to_end(key)
+                    if result is not None and result.quota_name == quota_name:
+                        return result
+        
+        if entry is None:
+            quota_data = self.get_many(account_id, region, service, (quota_code,)).get(quota_code)
+            if not quota_data:
                 return None
-            
-            # 获取指定配额的数据
-            quotas = cache_data.get('quotas', {})
-            quota_data = quotas.get(quota_code)
-            
-            if quota_data:
-                logger.debug(f"从缓存获取配额 Limit: {account_id}:{region}:{service}:{quota_code}")
-                return quota_data
-            
-            return None
-            
-        except Exception as e:
-            logger.warning(f"读取配额 Limit 缓存失败: {cache_file}, 错误: {e}")
-            return None
+        
+        quota_info = dict(quota_data)
+        quota_info['account_id'] = account_id
+        quota_info['region'] = region
+        result = QuotaResult(
+            service=service,
+            quota_code=quota_code,
+            quota_name=quota_name,
+            status=QuotaStatus.SUCCESS,
+            quota_info=quota_info,
+            account_id=account_id,
+            region=region
+        )
+        
+        # 只在缓存数据未被并发的 set() 替换时挂上构建结果
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] is quota_data:
+                self._memory[key] = (quota_data, entry[1], result)
+        return result
+    
+    def get_many(self, account_id: str, region: str, service: str,
+                 quota_codes: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        一次查询批量获取某个 (account, region, service) 下未过期的配额 Limit，并写入内存层
+        
+        Args:
+            account_id: 账号 ID
+            region: 区域
+            service: 服务代码
+            quota_codes: 只查询这些配额代码（None 表示该服务下全部）
+        
+        Returns:
+            quota_code → 配额 Limit 数据（调用方只读，需要修改时先复制）
+        """
+        sql = 'SELECT quota_code, data, ts FROM quota_limits WHERE account_id = ? AND region = ? AND service = ? AND ts >= ?'
+        params = [account_id, region, service, time.time() - self.cache_ttl]
+        if quota_codes is not None:
+            quota_codes = list(quota_codes)
+            if not quota_codes:
+                return {}
+            sql += f" AND quota_code IN ({', '.join('?' * len(quota_codes))})"
+            params.extend(quota_codes)
+        
+        try:
+            with self._db_lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"读取配额 Limit 缓存失败: {account_id}:{region}:{service}, 错误: {e}")
+            return {}
+        
+        found = {}
+        for quota_code, data, ts in rows:
+            quota_data = _loads(data)
+            self._remember((account_id, region, service, quota_code), quota_data, ts)
+            found[quota_code] = quota_data
+        return found
     
     def set(self, account_id: str, region: str, service: str, quota_code: str, quota_data: Dict[str, Any]):
         """
@@ -102,41 +237,18 @@ class QuotaLimitCache:
             quota_code: 配额代码
             quota_data: 配额 Limit 数据
         """
-        cache_file = self._get_cache_file_path(account_id, region, service)
-        cache_subdir = os.path.dirname(cache_file)
-        
-        # 创建缓存子目录
-        if not os.path.exists(cache_subdir):
-            os.makedirs(cache_subdir, exist_ok=True)
+        now = time.time()
+        self._remember((account_id, region, service, quota_code), dict(quota_data), now)
         
         try:
-            # 读取现有缓存（如果存在）
-            cache_data = {}
-            if os.path.exists(cache_file):
-                try:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        cache_data = json.load(f)
-                except:
-                    pass
-            
-            # 更新缓存数据
-            if 'quotas' not in cache_data:
-                cache_data['quotas'] = {}
-            
-            cache_data['timestamp'] = time.time()
-            cache_data['account_id'] = account_id
-            cache_data['region'] = region
-            cache_data['service'] = service
-            cache_data['quotas'][quota_code] = quota_data
-            
-            # 保存到文件
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
-            
+            with self._db_lock, self._conn:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO quota_limits VALUES (?, ?, ?, ?, ?, ?)',
+                    (account_id, region, service, quota_code, _dumps(quota_data), now)
+                )
             logger.debug(f"已缓存配额 Limit: {account_id}:{region}:{service}:{quota_code}")
-            
-        except Exception as e:
-            logger.warning(f"保存配额 Limit 缓存失败: {cache_file}, 错误: {e}")
+        except sqlite3.Error as e:
+            logger.warning(f"保存配额 Limit 缓存失败: {account_id}:{region}:{service}:{quota_code}, 错误: {e}")
     
     def clear(self, account_id: str = None, region: str = None, service: str = None):
         """
@@ -147,36 +259,79 @@ class QuotaLimitCache:
             region: 区域（如果指定，只清除该区域的缓存）
             service: 服务（如果指定，只清除该服务的缓存）
         """
-        if account_id and region and service:
-            # 清除特定服务的缓存
-            cache_file = self._get_cache_file_path(account_id, region, service)
-            if os.path.exists(cache_file):
-                os.remove(cache_file)
-                logger.info(f"已清除缓存: {account_id}:{region}:{service}")
-        elif account_id and region:
-            # 清除特定区域的缓存
-            cache_subdir = os.path.join(self.cache_dir, account_id, region)
-            if os.path.exists(cache_subdir):
-                import shutil
-                shutil.rmtree(cache_subdir)
-                logger.info(f"已清除缓存: {account_id}:{region}")
-        elif account_id:
-            # 清除特定账号的缓存
-            cache_subdir = os.path.join(self.cache_dir, account_id)
-            if os.path.exists(cache_subdir):
-                import shutil
-                shutil.rmtree(cache_subdir)
-                logger.info(f"已清除缓存: {account_id}")
+        # 按 account → region → service 逐级收窄（内存层与 SQLite 一致）
+        prefix = ()
+        for part in (account_id, region, service):
+            if not part:
+                break
+            prefix += (part,)
+        with self._lock:
+            for key in [k for k in self._memory if k[:len(prefix)] == prefix]:
+                del self._memory[key]
+            for key in [k for k in self._negative if k[:len(prefix)] == prefix]:
+                del self._negative[key]
+        
+        columns = ('account_id', 'region', 'service')[:len(prefix)]
+        sql = 'DELETE FROM quota_limits'
+        if columns:
+            sql += ' WHERE ' + ' AND '.join(f'{column} = ?' for column in columns)
+        with self._db_lock, self._conn:
+            self._conn.execute(sql, prefix)
+        
+        if prefix:
+            logger.info(f"已清除缓存: {':'.join(prefix)}")
         else:
-            # 清除所有缓存
-            if os.path.exists(self.cache_dir):
-                import shutil
-                shutil.rmtree(self.cache_dir)
-                os.makedirs(self.cache_dir, exist_ok=True)
-                logger.info(f"已清除所有配额 Limit 缓存")
+            logger.info(f"已清除所有配额 Limit 缓存")
+    
+    def get_negative(self, account_id: str, region: str, service: str, quota_code: str) -> Optional[Tuple[str, str]]:
+        """
+        获取缓存的失败结果
+        
+        Args:
+            account_id: 账号 ID
+            region: 区域
+            service: 服务代码
+            quota_code: 配额代码
+        
+        Returns:
+            (reason, error) 元组（如果负缓存有效），否则返回 None
+        """
+        key = (account_id, region, service, quota_code)
+        with self._lock:
+            entry = self._negative.get(key)
+            if entry is None:
+                return None
+            reason, error, expires_at = entry
+            if time.time() > expires_at:
+                del self._negative[key]
+                return None
+            self._negative.move_to_end(key)
+            return reason, error
+    
+    def set_negative(self, account_id: str, region: str, service: str, quota_code: str, reason: str, error: str):
+        """
+        缓存确定性失败结果（只缓存 negative_ttls 中列出的 reason）
+        
+        Args:
+            account_id: 账号 ID
+            region: 区域
+            service: 服务代码
+            quota_code: 配额代码
+            reason: 失败原因（quota_not_found / permission_denied）
+            error: 错误信息
+        """
+        ttl = self.negative_ttls.get(reason)
+        if not ttl:
+            return
+        
+        key = (account_id, region, service, quota_code)
+        with self._lock:
+            self._negative[key] = (reason, error, time.time() + ttl)
+            self._negative.move_to_end(key)
+            while len(self._negative) > self.max_entries:
+                self._negative.popitem(last=False)
+        logger.debug(f"已缓存配额失败结果: {account_id}:{region}:{service}:{quota_code} ({reason}, TTL: {ttl} 秒)")
     
     def is_force_refresh(self) -> bool:
         """检查是否强制刷新缓存"""
         return os.getenv('FORCE_REFRESH_QUOTA_LIMITS', 'false').lower() == 'true'
-
-
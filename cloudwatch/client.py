@@ -8,11 +8,11 @@ AWS CloudWatch 指标收集模块
 - 处理指标响应数据
 """
 
-import boto3
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 from botocore.exceptions import ClientError, BotoCoreError
+from api.aws.client_cache import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +27,9 @@ class CloudWatchClient:
     - 处理指标数据并返回使用量
     """
     
+    # GetMetricData 单次请求允许的最大查询数
+    MAX_METRIC_DATA_QUERIES = 500
+    
     def __init__(self, region: str = 'us-east-1', access_key: str = None, secret_key: str = None):
         """
         初始化 CloudWatch 客户端
@@ -38,16 +41,8 @@ class CloudWatchClient:
         """
         self.region = region
         try:
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key,
-                    aws_secret_access_key=secret_key
-                )
-                self.client = session.client('cloudwatch', region_name=region)
-                logger.debug(f"CloudWatch 客户端初始化成功（使用指定凭证），区域: {region}")
-            else:
-                self.client = boto3.client('cloudwatch', region_name=region)
-                logger.debug(f"CloudWatch 客户端初始化成功（使用默认凭证链），区域: {region}")
+            # 同一凭证 + region 复用同一个 boto3 client（共享连接池，不重复创建 Session）
+            self.client = get_client('cloudwatch', region, access_key, secret_key)
         except Exception as e:
             logger.error(f"初始化 CloudWatch 客户端失败: {e}")
             raise
@@ -60,7 +55,8 @@ class CloudWatchClient:
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
         period: int = 300,
-        statistic: str = 'Average'
+        statistic: str = 'Average',
+        latency_seconds: int = 0
     ) -> Optional[float]:
         """
         获取 CloudWatch 指标统计数据
@@ -70,16 +66,17 @@ class CloudWatchClient:
             metric_name: 指标名称
             dimensions: 维度字典
             start_time: 开始时间（默认：15分钟前）
-            end_time: 结束时间（默认：现在）
+            end_time: 结束时间（默认：现在减去 latency_seconds）
             period: 统计周期（秒，默认 300）
             statistic: 统计方法（'Average', 'Sum', 'Maximum' 等）
+            latency_seconds: 指标发布延迟（秒），未指定 end_time 时整个时间窗口向前平移，避免取到尚未发布的空窗口
         
         Returns:
             最新的指标值，如果无数据返回 None
         """
         try:
             if end_time is None:
-                end_time = datetime.utcnow()
+                end_time = datetime.utcnow() - timedelta(seconds=latency_seconds)
             if start_time is None:
                 start_time = end_time - timedelta(minutes=15)
             
@@ -122,3 +119,90 @@ class CloudWatchClient:
             # CloudWatch API 调用异常：重新抛出异常，让上层区分 API 异常和无数据
             logger.error(f"CloudWatch API 调用异常 {namespace}/{metric_name}: {e}")
             raise
+    
+    def get_metric_data_batch(
+        self,
+        queries: Dict[str, Dict[str, Any]],
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        period: int = 300,
+        statistic: str = 'Average',
+        latency_seconds: int = 0
+    ) -> Dict[str, Optional[float]]:
+        """
+        通过 GetMetricData 一次请求获取多个指标的最新值（替代逐个调用 GetMetricStatistics）
+        
+        Args:
+            queries: 查询标识 → {'namespace': ..., 'metric_name': ..., 'dimensions': {...}}
+            start_time: 开始时间（默认：15分钟前）
+            end_time: 结束时间（默认：现在减去 latency_seconds）
+            period: 统计周期（秒，默认 300）
+            statistic: 统计方法（'Average', 'Sum', 'Maximum' 等）
+            latency_seconds: 指标发布延迟（秒），未指定 end_time 时整个时间窗口向前平移，避免取到尚未发布的空窗口
+        
+        Returns:
+            查询标识 → 最新的指标值（无数据时为 None）
+        """
+        if end_time is None:
+            end_time = datetime.utcnow() - timedelta(seconds=latency_seconds)
+        if start_time is None:
+            start_time = end_time - timedelta(minutes=15)
+        
+        # MetricDataQuery.Id 只允许小写字母开头的标识符，这里按序号生成并映射回查询标识
+        id_to_key = {}
+        metric_queries = []
+        for index, (key, query) in enumerate(queries.items()):
+            query_id = f"q{index}"
+            id_to_key[query_id] = key
+            metric_queries.append({
+                'Id': query_id,
+                'MetricStat': {
+                    'Metric': {
+                        'Namespace': query['namespace'],
+                        'MetricName': query['metric_name'],
+                        'Dimensions': [{'Name': k, 'Value': v} for k, v in query['dimensions'].items()]
+                    },
+                    'Period': period,
+                    'Stat': statistic
+                },
+                'ReturnData': True
+            })
+        
+        results: Dict[str, Optional[float]] = dict.fromkeys(queries)
+        try:
+            # 单次请求最多 500 个查询
+            for offset in range(0, len(metric_queries), self.MAX_METRIC_DATA_QUERIES):
+                chunk = metric_queries[offset:offset + self.MAX_METRIC_DATA_QUERIES]
+                pending = {query['Id'] for query in chunk}
+                request = {
+                    'MetricDataQueries': chunk,
+                    'StartTime': start_time,
+                    'EndTime': end_time,
+                    'ScanBy': 'TimestampDescending'
+                }
+                while True:
+                    response = self.client.get_metric_data(**request)
+                    for metric_result in response.get('MetricDataResults', []):
+                        query_id = metric_result.get('Id')
+                        values = metric_result.get('Values')
+                        # 按时间倒序返回，每个查询最先出现的值即最新数据点
+                        if values and query_id in pending:
+                            results[id_to_key[query_id]] = values[0]
+                            pending.discard(query_id)
+                    # 只需要最新数据点：所有查询都已取到值时不再翻页拉取更早的数据点
+                    next_token = response.get('NextToken')
+                    if not next_token or not pending:
+                        break
+                    request['NextToken'] = next_token
+        except ClientError as e:
+            # CloudWatch API 调用异常：重新抛出异常，让上层区分 API 异常和无数据
+            error_code = e.response.get("Error", {}).get("Code")
+            error_message = e.response.get("Error", {}).get("Message")
+            logger.error(f"CloudWatch GetMetricData 调用异常（{len(queries)} 个指标）: {error_code} - {error_message}")
+            raise
+        except Exception as e:
+            logger.error(f"CloudWatch GetMetricData 调用异常（{len(queries)} 个指标）: {e}")
+            raise
+        
+        logger.debug(f"CloudWatch GetMetricData 返回 {sum(v is not None for v in results.values())}/{len(queries)} 个指标有数据")
+        return results
@@ -11,12 +11,26 @@ Prometheus Collector 实现模块
 import time
 import math
 import logging
-from typing import List, Dict, Optional
-from prometheus_client import Gauge, Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterator
+from prometheus_client import Gauge, Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST, REGISTRY
 from collector.quota_result import QuotaResult, QuotaStatus
 
 logger = logging.getLogger(__name__)
 
+# 单独统计的失败类型（其余失败统一记为 api_error）
+_CLASSIFIED_ERROR_TYPES = frozenset({'quota_not_found', 'permission_denied'})
+
+
+class _SingleFamily:
+    """只包含一个 MetricFamily 的最小 registry，用于按 family 分块渲染"""
+    
+    def __init__(self, family):
+        self._family = family
+    
+    def collect(self):
+        return [self._family]
+
 
 class QuotaCollector:
     """
@@ -77,6 +91,47 @@ class QuotaCollector:
         # 存储 usage 数据（service-level）
         # key: (account_id, region, service), value: {quota_code: usage_value}
         self.usage_data: Dict[tuple, Dict[str, float]] = {}
+        
+        # 配额指标名 -> Gauge（用于统一设置指标值）
+        self._gauges: Dict[str, Gauge] = {
+            'cloud_service_quota_limit': self.quota_limit,
+            'cloud_service_quota_usage': self.quota_usage,
+            'cloud_quota_usage_percent': self.quota_usage_percent
+        }
+        
+        # 非 NaN 指标序列计数
+        # key: (service, metric_name), value: 该服务下值不为 NaN 的 label 组合集合
+        self._series: Dict[Tuple[str, str], Set[tuple]] = defaultdict(set)
+    
+    def _set_gauge(self, metric_name: str, labels: Dict[str, str], value: float):
+        """
+        设置配额指标值，并同步维护非 NaN 序列计数
+        
+        Args:
+            metric_name: 指标名称（如 'cloud_service_quota_limit'）
+            labels: 指标 labels
+            value: 指标值（NaN 表示无数据）
+        """
+        self._gauges[metric_name].labels(**labels).set(value)
+        
+        series = self._series[(labels['service'], metric_name)]
+        if math.isnan(value):
+            series.discard(tuple(labels.values()))
+        else:
+            series.add(tuple(labels.values()))
+    
+    def count(self, service: str, metric_name: str) -> int:
+        """
+        获取指定服务某个配额指标的序列数量（不含 NaN）
+        
+        Args:
+            service: 服务代码（如 'sagemaker'）
+            metric_name: 指标名称（如 'cloud_service_quota_limit'）
+        
+        Returns:
+            值不为 NaN 的指标序列数量
+        """
+        return len(self._series.get((service, metric_name), ()))
     
     def add_result(self, result: QuotaResult):
         """
@@ -86,7 +141,15 @@ class QuotaCollector:
             result: 配额采集结果
         """
         self.results.append(result)
+        self._update_metrics(result)
+    
+    def _update_metrics(self, result: QuotaResult):
+        """
+        根据单个采集结果的状态更新指标（不修改 self.results）
         
+        Args:
+            result: 配额采集结果
+        """
         # 根据状态更新指标
         if result.is_success():
             # 更新配额 limit 指标
@@ -108,7 +171,7 @@ class QuotaCollector:
             }
             
             # 1. 设置 limit 值（从 API 获取）
-            self.quota_limit.labels(**labels).set(limit_value)
+            self._set_gauge('cloud_service_quota_limit', labels, limit_value)
             
             # 2. 设置 usage 值
             # 从 usage_data 中查找对应的 usage 值
@@ -121,19 +184,19 @@ class QuotaCollector:
             
             if usage_value is not None:
                 # usage_value 可能是 0（账号没有使用资源），这是正常情况
-                self.quota_usage.labels(**labels).set(usage_value)
+                self._set_gauge('cloud_service_quota_usage', labels, usage_value)
                 
                 # 3. 设置 usage_percent 值
                 # percent = (usage / limit) * 100
                 if limit_value > 0:
                     percent_value = (usage_value / limit_value) * 100.0
-                    self.quota_usage_percent.labels(**labels).set(percent_value)
+                    self._set_gauge('cloud_quota_usage_percent', labels, percent_value)
                 else:
-                    self.quota_usage_percent.labels(**labels).set(float('nan'))
+                    self._set_gauge('cloud_quota_usage_percent', labels, float('nan'))
             else:
                 # 没有 usage 数据，设置为 NaN（其他服务或未实现）
-                self.quota_usage.labels(**labels).set(float('nan'))
-                self.quota_usage_percent.labels(**labels).set(float('nan'))
+                self._set_gauge('cloud_service_quota_usage', labels, float('nan'))
+                self._set_gauge('cloud_quota_usage_percent', labels, float('nan'))
             
         elif result.is_skipped():
             # 更新跳过计数
@@ -144,11 +207,8 @@ class QuotaCollector:
             
         elif result.is_failed():
             # 更新错误计数
-            error_type = 'api_error'
-            if 'NoSuchResourceException' in (result.error or ''):
-                error_type = 'quota_not_found'
-            elif 'AccessDeniedException' in (result.error or ''):
-                error_type = 'permission_denied'
+            # reason 在采集时已按 ClientError 的 Error.Code 分类，这里直接查表，不再对错误信息做子串匹配
+            error_type = result.reason if result.reason in _CLASSIFIED_ERROR_TYPES else 'api_error'
             
             self.scrape_errors_total.labels(
                 service=result.service,
@@ -165,8 +225,11 @@ class QuotaCollector:
         """
         start_time = time.time()
         
+        # 结果列表一次性 extend，逐个结果只更新指标
+        self.results.extend(results)
+        update_metrics = self._update_metrics
         for result in results:
-            self.add_result(result)
+            update_metrics(result)
         
         # 记录采集耗时
         duration = time.time() - start_time
@@ -181,6 +244,18 @@ class QuotaCollector:
         """
         return generate_latest().decode('utf-8')
     
+    def iter_metrics(self) -> Iterator[bytes]:
+        """
+        按 MetricFamily 逐块生成 Prometheus 格式的指标数据
+        
+        用于 /metrics 流式响应，避免一次性构建完整响应体
+        
+        Yields:
+            单个 MetricFamily 的 Prometheus text format 字节串
+        """
+        for family in REGISTRY.collect():
+            yield generate_latest(_SingleFamily(family))
+    
     def set_usage_data(self, account_id: str, region: str, service: str, usage_data: Dict[str, float]):
         """
         设置服务的 usage 数据（service-level）
@@ -192,66 +267,77 @@ class QuotaCollector:
             usage_data: {quota_code: usage_value} 字典
         """
         key = (account_id, region, service)
-        self.usage_data[key] = usage_data
+        self._apply_usage(key, usage_data, self._index_results().get(key, ()))
+    
+    def set_usage_batch(self, items: List[Dict[str, Any]]):
+        """
+        批量设置多个服务的 usage 数据
         
-        # 更新已存在的指标（有 Limit 的情况）
-        for result in self.results:
-            if (result.is_success() and 
-                result.quota_info and
-                result.quota_info.get('account_id') == account_id and
-                result.quota_info.get('region') == region and
-                result.service == service):
-                
-                quota_code = result.quota_code
-                if quota_code in usage_data:
-                    usage_value = usage_data[quota_code]
-                    limit_value = result.quota_info.get('value', 0.0)
-                    
-                    labels = {
-                        'provider': 'aws',
-                        'account_id': account_id,
-                        'region': region,
-                        'service': service,
-                        'quota_name': result.quota_name,
-                        'quota_code': quota_code
-                    }
-                    
-                    # 更新 usage 指标
-                    self.quota_usage.labels(**labels).set(usage_value)
-                    
-                    # 更新 percent 指标
-                    if limit_value > 0:
-                        percent_value = (usage_value / limit_value) * 100.0
-                        self.quota_usage_percent.labels(**labels).set(percent_value)
-                    else:
-                        self.quota_usage_percent.labels(**labels).set(float('nan'))
-        
-        # 处理没有 Limit 的情况（如 CloudFront，配额不在 Service Quotas API 中）
-        # 查找该服务的 skipped 结果，为它们设置 Usage
+        只遍历一次 self.results 建立索引，避免每个服务都全量扫描结果列表
+        
+        Args:
+            items: usage 数据列表，每项包含 account_id / region / service / usage_data
+        """
+        index = self._index_results()
+        for item in items:
+            key = (item['account_id'], item['region'], item['service'])
+            try:
+                self._apply_usage(key, item['usage_data'], index.get(key, ()))
+            except Exception as e:
+                logger.error(f"设置 Usage 数据失败: {key}: {e}", exc_info=True)
+    
+    def _index_results(self) -> Dict[tuple, List[QuotaResult]]:
+        """
+        按 (account_id, region, service) 索引可设置 usage 的结果（success 与 skipped）
+        
+        Returns:
+            {(account_id, region, service): [QuotaResult, ...]}
+        """
+        index: Dict[tuple, List[QuotaResult]] = defaultdict(list)
         for result in self.results:
-            if (result.is_skipped() and
-                result.account_id == account_id and
-                result.region == region and
-                result.service == service):
-                
-                quota_code = result.quota_code
-                if quota_code in usage_data:
-                    usage_value = usage_data[quota_code]
-                    
-                    labels = {
-                        'provider': 'aws',
-                        'account_id': account_id,
-                        'region': region,
-                        'service': service,
-                        'quota_name': result.quota_name,
-                        'quota_code': quota_code
-                    }
-                    
-                    # 设置 usage 指标（即使没有 Limit）
-                    self.quota_usage.labels(**labels).set(usage_value)
-                    
-                    # 没有 Limit，percent 设置为 NaN
-                    self.quota_usage_percent.labels(**labels).set(float('nan'))
+            if result.is_success() and result.quota_info:
+                index[(result.quota_info.get('account_id'), result.quota_info.get('region'), result.service)].append(result)
+            elif result.is_skipped():
+                index[(result.account_id, result.region, result.service)].append(result)
+        return index
+    
+    def _apply_usage(self, key: tuple, usage_data: Dict[str, float], results):
+        """
+        保存 usage 数据并更新对应结果的 usage / percent 指标
+        
+        Args:
+            key: (account_id, region, service)
+            usage_data: {quota_code: usage_value} 字典
+            results: 该 key 下的 success / skipped 结果
+        """
+        account_id, region, service = key
+        self.usage_data[key] = usage_data
+        
+        for result in results:
+            quota_code = result.quota_code
+            if quota_code not in usage_data:
+                continue
+            
+            usage_value = usage_data[quota_code]
+            labels = {
+                'provider': 'aws',
+                'account_id': account_id,
+                'region': region,
+                'service': service,
+                'quota_name': result.quota_name,
+                'quota_code': quota_code
+            }
+            
+            # 更新 usage 指标（没有 Limit 的情况也设置，如 CloudFront 配额不在 Service Quotas API 中）
+            self._set_gauge('cloud_service_quota_usage', labels, usage_value)
+            
+            # 更新 percent 指标（没有 Limit 时为 NaN）
+            limit_value = result.quota_info.get('value', 0.0) if result.is_success() else 0.0
+            if limit_value > 0:
+                percent_value = (usage_value / limit_value) * 100.0
+                self._set_gauge('cloud_quota_usage_percent', labels, percent_value)
+            else:
+                self._set_gauge('cloud_quota_usage_percent', labels, float('nan'))
     
     def _get_usage_value(self, account_id: str, region: str, service: str, quota_code: str) -> Optional[float]:
         """
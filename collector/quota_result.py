@@ -7,10 +7,15 @@
 - 统一管理配额采集结果
 """
 
+import sys
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
 from enum import Enum
 
+# 每个 (account, region, service, quota) 都会创建一个结果对象，使用 __slots__ 去掉实例 __dict__
+# dataclass(slots=True) 需要 Python 3.10+，旧版本退化为普通 dataclass
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 class QuotaStatus(Enum):
     """配额采集状态"""
@@ -19,7 +24,7 @@ class QuotaStatus(Enum):
     FAILED = "failed"      # 采集失败
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class QuotaResult:
     """配额采集结果"""
     service: str                    # 服务代码
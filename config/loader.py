@@ -10,8 +10,26 @@
 
 import yaml
 import os
-from typing import Dict, List
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+# libyaml 的 C 实现解析速度约为纯 Python SafeLoader 的十倍以上；PyYAML 未编译 libyaml 时回退
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Limit 采集模式（加载配置时为每个服务确定一次，采集时按模式分发）
+LIMIT_MODE_DISCOVERY = 'discovery'      # 动态发现配额（如 SageMaker）
+LIMIT_MODE_HARDCODED = 'hardcoded'      # 配额不在 Service Quotas API 中，使用默认值
+LIMIT_MODE_DECLARATIVE = 'declarative'  # 配置中声明的配额列表
+
+# 使用硬编码 Limit 的服务
+HARDCODED_LIMIT_SERVICES = frozenset({'cloudfront'})
+
+# 全局服务（固定在 us-east-1 采集），其余服务均为区域型服务（只在 EC2 使用的 Region 采集）
+GLOBAL_SERVICES = frozenset({'route53', 'cloudfront'})
+GLOBAL_SERVICE_REGION = 'us-east-1'
 
 
 @dataclass
@@ -31,6 +49,14 @@ class DiscoveryConfig:
     enabled: bool                    # 是否启用 discovery
     match_rules: List[Dict]          # 匹配规则列表
     default_priority: str            # 默认优先级
+    # 每条规则预先转为小写的 name_contains 关键词（构造时编译一次，匹配时直接使用）
+    name_keywords: Tuple[Tuple[str, ...], ...] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.name_keywords = tuple(
+            tuple(keyword.lower() for keyword in rule['name_contains'])
+            for rule in self.match_rules if 'name_contains' in rule
+        )
 
 
 @dataclass
@@ -40,12 +66,24 @@ class ServiceQuotas:
     quotas: List[QuotaItem]         # 配额列表
 
 
+@dataclass(frozen=True)
+class ServicePlan:
+    """单个服务的 Limit 采集计划（加载配置时编译一次，采集时直接按 mode 分发）"""
+    service: str                                  # 服务代码
+    mode: str                                     # Limit 采集模式（LIMIT_MODE_*）
+    region: Optional[str] = None                  # 固定采集区域（全局服务），None 表示跟随当前 EC2 Region
+    quotas: Tuple[QuotaItem, ...] = ()            # 声明的配额（declarative / hardcoded 模式）
+    discovery: Optional[DiscoveryConfig] = None   # Discovery 配置（discovery 模式）
+
+
 @dataclass
 class QuotaConfig:
     """配额配置的根数据结构"""
     aws: Dict[str, any]     # AWS 服务的配额配置，key 是服务代码
                               # 值可以是 List[QuotaItem]（声明型）或 Dict（discovery 配置）
     aliyun: Dict[str, List[QuotaItem]]  # Aliyun 服务的配额配置（可选）
+    effective_usage_services: tuple = ()  # 启动时预排序的 usage 服务列表（已过滤未配置/无 collector 的服务）
+    limit_plan: Tuple[ServicePlan, ...] = ()  # 按配置顺序编译好的 Limit 采集计划
 
 
 def load_quota_config(quotas_path: str) -> QuotaConfig:
@@ -67,16 +105,16 @@ def load_quota_config(quotas_path: str) -> QuotaConfig:
     if not os.path.exists(quotas_path):
         raise FileNotFoundError(f"配额配置文件不存在: {quotas_path}")
     
-    # 读取文件内容
+    # 读取文件内容（二进制读取，由 YAML 解析器按 BOM / UTF-8 解码）
     try:
-        with open(quotas_path, 'r', encoding='utf-8') as f:
+        with open(quotas_path, 'rb') as f:
             content = f.read()
     except IOError as e:
         raise IOError(f"无法读取配额配置文件 {quotas_path}: {e}")
     
     # 解析 YAML
     try:
-        data = yaml.safe_load(content)
+        data = yaml.load(content, Loader=_YamlLoader)
     except yaml.YAMLError as e:
         raise yaml.YAMLError(f"YAML 解析失败: {e}")
     
@@ -85,6 +123,7 @@ def load_quota_config(quotas_path: str) -> QuotaConfig:
     
     # 解析 AWS 配额配置
     aws_quotas = {}
+    limit_plan = []
     if 'aws' in data:
         aws_data = data['aws']
         if not isinstance(aws_data, dict):
@@ -101,6 +140,7 @@ def load_quota_config(quotas_path: str) -> QuotaConfig:
                 try:
                     discovery = _parse_discovery_config(discovery_config, service)
                     aws_quotas[service] = {'discovery': discovery}
+                    limit_plan.append(_compile_service_plan(service, LIMIT_MODE_DISCOVERY, discovery=discovery))
                 except (KeyError, ValueError) as e:
                     raise ValueError(f"配置格式错误: 'aws.{service}.discovery': {e}")
             else:
@@ -117,6 +157,8 @@ def load_quota_config(quotas_path: str) -> QuotaConfig:
                         raise ValueError(f"配置格式错误: 'aws.{service}[{idx}]': {e}")
                 
                 aws_quotas[service] = quota_items
+                mode = LIMIT_MODE_HARDCODED if service in HARDCODED_LIMIT_SERVICES else LIMIT_MODE_DECLARATIVE
+                limit_plan.append(_compile_service_plan(service, mode, quotas=tuple(quota_items)))
     
     # 解析 Aliyun 配额配置（可选）
     aliyun_quotas = {}
@@ -139,7 +181,30 @@ def load_quota_config(quotas_path: str) -> QuotaConfig:
             
             aliyun_quotas[service] = quota_items
     
-    return QuotaConfig(aws=aws_quotas, aliyun=aliyun_quotas)
+    return QuotaConfig(aws=aws_quotas, aliyun=aliyun_quotas, limit_plan=tuple(limit_plan))
+
+
+def _compile_service_plan(service: str, mode: str, quotas: Tuple[QuotaItem, ...] = (),
+                          discovery: Optional[DiscoveryConfig] = None) -> ServicePlan:
+    """
+    编译单个服务的 Limit 采集计划（一次性确定模式与采集区域）
+    
+    Args:
+        service: 服务代码
+        mode: Limit 采集模式（LIMIT_MODE_*）
+        quotas: 声明的配额列表
+        discovery: Discovery 配置
+    
+    Returns:
+        ServicePlan 对象
+    """
+    return ServicePlan(
+        service=service,
+        mode=mode,
+        region=GLOBAL_SERVICE_REGION if service in GLOBAL_SERVICES else None,
+        quotas=quotas,
+        discovery=discovery
+    )
 
 
 def _parse_discovery_config(discovery_dict: dict, service: str) -> DiscoveryConfig:
@@ -9,23 +9,30 @@ Service Quota Exporter 主程序入口
 - 暴露 /health 健康检查端点
 """
 
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify, request
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 import logging
 import sys
 import os
-import urllib.request
+import itertools
 import json
-import time
-from typing import List, Dict, Any, Optional
+import zlib
+import errno
+import socket
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Callable, Mapping, Sequence, Set, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from botocore.exceptions import ClientError
 from threading import Lock
 
 # 导入配额配置加载模块
-from config.loader import load_quota_config, print_quota_config, QuotaItem
+from config.loader import (
+    load_quota_config, print_quota_config, QuotaItem, ServicePlan, GLOBAL_SERVICES,
+    LIMIT_MODE_DISCOVERY, LIMIT_MODE_HARDCODED, LIMIT_MODE_DECLARATIVE
+)
 
 # 导入 AWS Service Quotas 客户端
-from provider.aws.service_quotas import ServiceQuotasClient
+from provider.aws.service_quotas import ServiceQuotasClient, DEFAULT_COLLECTION_MAX_WORKERS
 
 # 导入 Route53 API 客户端（用于直接获取配额）
 from api.aws.route53 import Route53Client
@@ -51,6 +58,8 @@ from provider.discovery.active_region_discoverer import ActiveRegionDiscoverer
 from provider.aws.usage_collector import EC2UsageCollector, EBSUsageCollector, ELBUsageCollector, EKSUsageCollector, ElastiCacheUsageCollector, Route53UsageCollector, CloudFrontUsageCollector, SageMakerUsageCollector
 from cache.cache import MemoryCache
 from cache.quota_limit_cache import QuotaLimitCache
+from cache.inflight import InflightRegistry
+from retry.rate_limiter import get_rate_limiter
 
 # 导入 Scheduler
 from scheduler.scheduler import QuotaScheduler
@@ -62,6 +71,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 生产 WSGI 服务器（多线程处理并发抓取，替代 werkzeug 开发服务器）
+try:
+    from waitress import serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+    logger.warning("waitress 未安装，将回退到 Flask 开发服务器。请运行: pip install waitress")
+
 # 设置特定模块的日志级别
 logging.getLogger('werkzeug').setLevel(logging.WARNING)  # 减少 Flask 日志
 
@@ -72,6 +89,25 @@ app = Flask(__name__)
 quota_collector = None
 
 
+def _gzip_stream(chunks):
+    """
+    对分块输出进行流式 gzip 压缩
+    
+    Args:
+        chunks: 字节串迭代器
+    
+    Yields:
+        gzip 压缩后的字节串
+    """
+    # compresslevel=1：Prometheus 文本重复度高，最低压缩级别已足够且 CPU 开销最小
+    compressor = zlib.compressobj(1, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
 @app.route('/metrics')
 def metrics():
     """
@@ -84,9 +120,15 @@ def metrics():
         # 如果收集器未初始化，返回空指标
         return "# Exporter not initialized\n", 200, {'Content-Type': CONTENT_TYPE_LATEST}
     
-    # 返回 Prometheus 指标
-    metrics_data = quota_collector.get_metrics()
-    return metrics_data, 200, {'Content-Type': CONTENT_TYPE_LATEST}
+    # 按 MetricFamily 流式返回 Prometheus 指标
+    chunks = quota_collector.iter_metrics()
+    
+    # 客户端支持 gzip 时压缩响应（Prometheus 默认发送 Accept-Encoding: gzip）
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        return Response(_gzip_stream(chunks), status=200, content_type=CONTENT_TYPE_LATEST,
+                        headers={'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'})
+    
+    return Response(chunks, status=200, content_type=CONTENT_TYPE_LATEST)
 
 
 @app.route('/health')
@@ -136,15 +178,8 @@ def trigger_sagemaker_limit():
             quota_limit_cache=_quota_limit_cache
         )
         
-        # 统计 SageMaker Limit 指标数量
-        try:
-            with urllib.request.urlopen('http://localhost:8000/metrics', timeout=5) as response:
-                metrics_text = response.read().decode('utf-8')
-            sagemaker_limit_count = len([line for line in metrics_text.split('\n') 
-                                         if 'service="sagemaker"' in line and 'cloud_service_quota_limit' in line])
-        except Exception as e:
-            logger.warning(f"[手动触发] 无法统计指标数量: {e}")
-            sagemaker_limit_count = 0
+        # 统计 SageMaker Limit 指标数量（直接读取收集器计数，无需抓取 /metrics）
+        sagemaker_limit_count = _quota_collector.count('sagemaker', 'cloud_service_quota_limit')
         
         return jsonify({
             'success': True,
@@ -190,17 +225,8 @@ def trigger_sagemaker_usage():
             quota_limit_cache=_quota_limit_cache
         )
         
-        # 统计 SageMaker Usage 指标数量（非 NaN）
-        try:
-            with urllib.request.urlopen('http://localhost:8000/metrics', timeout=5) as response:
-                metrics_text = response.read().decode('utf-8')
-            sagemaker_usage_count = len([line for line in metrics_text.split('\n') 
-                                         if 'service="sagemaker"' in line 
-                                         and 'cloud_service_quota_usage' in line 
-                                         and 'NaN' not in line])
-        except Exception as e:
-            logger.warning(f"[手动触发] 无法统计指标数量: {e}")
-            sagemaker_usage_count = 0
+        # 统计 SageMaker Usage 指标数量（非 NaN，直接读取收集器计数）
+        sagemaker_usage_count = _quota_collector.count('sagemaker', 'cloud_service_quota_usage')
         
         return jsonify({
             'success': True,
@@ -262,20 +288,9 @@ def trigger_sagemaker_all():
             quota_limit_cache=_quota_limit_cache
         )
         
-        # 统计指标数量
-        try:
-            with urllib.request.urlopen('http://localhost:8000/metrics', timeout=5) as response:
-                metrics_text = response.read().decode('utf-8')
-            sagemaker_limit_count = len([line for line in metrics_text.split('\n') 
-                                         if 'service="sagemaker"' in line and 'cloud_service_quota_limit' in line])
-            sagemaker_usage_count = len([line for line in metrics_text.split('\n') 
-                                         if 'service="sagemaker"' in line 
-                                         and 'cloud_service_quota_usage' in line 
-                                         and 'NaN' not in line])
-        except Exception as e:
-            logger.warning(f"[手动触发] 无法统计指标数量: {e}")
-            sagemaker_limit_count = 0
-            sagemaker_usage_count = 0
+        # 统计指标数量（直接读取收集器计数）
+        sagemaker_limit_count = _quota_collector.count('sagemaker', 'cloud_service_quota_limit')
+        sagemaker_usage_count = _quota_collector.count('sagemaker', 'cloud_service_quota_usage')
         
         return jsonify({
             'success': True,
@@ -292,6 +307,100 @@ def trigger_sagemaker_all():
         }), 500
 
 
+@app.route('/invalidate/usage/<service>', methods=['POST'])
+def invalidate_usage(service: str):
+    """
+    失效指定服务的 usage 缓存（供资源变更事件调用，如 EventBridge API Destination）
+    
+    请求参数（JSON body 或 query string）：
+    - account_id: 账号 ID（必填）
+    - region: 区域（全局服务可省略，默认 us-east-1）
+    
+    只删除缓存，不立即采集：下一次定时 usage 采集会重新调用 API 获取最新值。
+    
+    返回 JSON 格式的结果
+    """
+    if not _usage_collectors:
+        return jsonify({
+            'success': False,
+            'error': 'Exporter 未初始化，无法失效缓存'
+        }), 503
+    
+    collector = _usage_collectors.get(service)
+    if collector is None:
+        return jsonify({
+            'success': False,
+            'error': f'未知的 usage 服务: {service}'
+        }), 404
+    
+    params = request.get_json(silent=True) or request.args
+    account_id = params.get('account_id')
+    if not account_id:
+        return jsonify({
+            'success': False,
+            'error': '缺少参数 account_id'
+        }), 400
+    region = params.get('region') or 'us-east-1'
+    
+    invalidated = collector.invalidate_usage(account_id, region)
+    logger.info("[缓存失效] %s usage: account=%s, region=%s, invalidated=%s", service, account_id, region, invalidated)
+    
+    return jsonify({
+        'success': invalidated,
+        'service': service,
+        'account_id': account_id,
+        'region': region
+    }), 200
+
+
+# Usage 采集的服务顺序（启动时与 quota_config.aws / usage_collectors 求交集后固化）
+_ORDERED_USAGE_SERVICES = ('ec2', 'ebs', 'elasticloadbalancing', 'eks', 'elasticache', 'route53', 'cloudfront', 'sagemaker')
+
+# CloudFront 的默认配额限制值（AWS 标准默认值，配额不在 Service Quotas API 中；模块级只读常量）
+_CLOUDFRONT_DEFAULT_LIMITS: Mapping[str, float] = MappingProxyType({
+    'L-24B04930': 200.0,  # Web distributions per AWS account
+    'L-7D134442': 20.0,   # Cache policies per AWS account
+    'L-CF0D4FC5': 20.0,   # Response headers policies
+    'L-08884E5C': 100.0   # Origin access identities per account
+})
+
+
+def _build_cloudfront_limit_results(quotas: Sequence[QuotaItem], account_id: str, service_region: str) -> List[QuotaResult]:
+    """
+    根据硬编码默认值构建 CloudFront Limit 结果
+    
+    Args:
+        quotas: CloudFront 声明型配额列表
+        account_id: 账号 ID
+        service_region: 指标 region（固定 us-east-1）
+    
+    Returns:
+        QuotaResult 列表（未配置默认值的配额会被跳过）
+    """
+    for q in quotas:
+        if q.quota_code not in _CLOUDFRONT_DEFAULT_LIMITS:
+            logger.warning("[采集] CloudFront 配额 %s: 未找到默认值，跳过", q.quota_code)
+    
+    return [
+        QuotaResult(
+            service='cloudfront',
+            quota_code=q.quota_code,
+            quota_name=q.quota_name,
+            status=QuotaStatus.SUCCESS,
+            quota_info={
+                'quota_code': q.quota_code,
+                'quota_name': q.quota_name,
+                'value': _CLOUDFRONT_DEFAULT_LIMITS[q.quota_code],
+                'account_id': account_id,
+                'region': service_region
+            },
+            account_id=account_id,
+            region=service_region
+        )
+        for q in quotas if q.quota_code in _CLOUDFRONT_DEFAULT_LIMITS
+    ]
+
+
 # 全局变量（在 main 函数中初始化）
 scheduler: Optional[QuotaScheduler] = None
 _quota_config: Optional[Any] = None
@@ -353,6 +462,452 @@ def collect_usage():
     )
 
 
+# 单个账号/服务内并发获取配额 Limit 的线程数
+_QUOTA_FETCH_CONCURRENCY = int(os.getenv('QUOTA_FETCH_CONCURRENCY', '10'))
+
+# 单个账号内并发处理 Region 的线程数（不同 Region 使用各自的令牌桶，互不抢占）
+_REGION_FETCH_CONCURRENCY = int(os.getenv('REGION_FETCH_CONCURRENCY', '4'))
+
+# ServiceQuotasClient 实例缓存：(account_id, region, access_key, secret_key) → client
+# （secret 轮换后按新凭证新建 client，不会继续使用旧 secret 签名）
+_sq_client_cache: Dict[tuple, ServiceQuotasClient] = {}
+_sq_client_cache_lock = Lock()
+
+# GetServiceQuota 在途请求合并：(account_id, region, service, quota_code) → 正在进行的调用
+_inflight_quota_calls = InflightRegistry()
+
+# AWS ClientError 错误码 → QuotaResult.reason
+_CLIENT_ERROR_REASONS = {
+    'NoSuchResourceException': 'quota_not_found',
+    'AccessDeniedException': 'permission_denied',
+}
+
+
+def _get_sq_client(region: str, credentials: Optional[Dict[str, str]] = None, account_id: str = None) -> ServiceQuotasClient:
+    """
+    获取指定 region 的 Service Quotas 客户端（按 account + region + 凭证复用同一实例）
+    
+    Args:
+        region: 区域
+        credentials: 账号凭证（可选，None 时使用默认凭证链）
+        account_id: 账号 ID（用于区分使用默认凭证链的不同账号）
+    
+    Returns:
+        ServiceQuotasClient 对象
+    """
+    access_key = credentials.get('access_key') if credentials else None
+    secret_key = credentials.get('secret_key') if credentials else None
+    key = (account_id, region, access_key, secret_key)
+    
+    with _sq_client_cache_lock:
+        client = _sq_client_cache.get(key)
+    if client is not None:
+        return client
+    
+    # 在锁外创建 client（底层 boto3 client 按凭证复用），不同账号线程的初始化互不阻塞
+    client = ServiceQuotasClient(
+        region=region,
+        access_key=access_key,
+        secret_key=secret_key
+    )
+    with _sq_client_cache_lock:
+        # 并发创建时以先写入的为准
+        return _sq_client_cache.setdefault(key, client)
+
+
+def _call_get_service_quota(
+    service: str,
+    quota_code: str,
+    sq_client: ServiceQuotasClient,
+    account_id: str,
+    service_region: str,
+    quota_limit_cache: QuotaLimitCache = None
+) -> Optional[Dict]:
+    """
+    经令牌桶限流调用 GetServiceQuota，成功时写入 Limit 缓存
+    
+    Args:
+        service: 服务代码
+        quota_code: 配额代码
+        sq_client: 目标 region 的 Service Quotas 客户端
+        account_id: 账号 ID
+        service_region: 服务使用的 region
+        quota_limit_cache: 配额 Limit 缓存（None 时不写缓存）
+    
+    Returns:
+        配额详情字典（可能为 None）
+    
+    Raises:
+        ClientError: AWS API 错误
+    """
+    # 按 (account, region) 令牌桶主动限流，只有令牌耗尽时才等待
+    rate_limiter = get_rate_limiter(account_id, service_region)
+    
+    # 调用 GetServiceQuota API（限流重试由 botocore adaptive 模式在 client 内部完成）
+    rate_limiter.acquire()
+    try:
+        quota_info = sq_client.get_service_quota(
+            service_code=service,
+            quota_code=quota_code
+        )
+    except ClientError as api_error:
+        if api_error.response.get('Error', {}).get('Code', '') == 'TooManyRequestsException':
+            # 重试耗尽仍被限流，收紧该 (account, region) 的令牌桶
+            rate_limiter.penalize()
+        raise
+    
+    # 如果 API 调用成功，更新缓存
+    if quota_info and quota_limit_cache:
+        quota_limit_cache.set(account_id, service_region, service, quota_code, quota_info)
+    return quota_info
+
+
+def _fetch_quota_limit(
+    service: str,
+    quota_code: str,
+    quota_name: str,
+    sq_client: ServiceQuotasClient,
+    account_id: str,
+    service_region: str,
+    quota_limit_cache: QuotaLimitCache = None,
+    quota_lookup: Optional[Callable[[str], Optional[Dict]]] = None
+) -> QuotaResult:
+    """
+    获取单个配额的 Limit 值并构建采集结果
+    
+    查找顺序：Limit 缓存 → 负缓存 → quota_lookup（ListServiceQuotas 批量结果）→ GetServiceQuota
+    
+    Args:
+        service: 服务代码
+        quota_code: 配额代码
+        quota_name: 配额名称
+        sq_client: 目标 region 的 Service Quotas 客户端
+        account_id: 账号 ID
+        service_region: 服务使用的 region
+        quota_limit_cache: 配额 Limit 缓存（None 时不读写缓存）
+        quota_lookup: 按 quota_code 查询批量结果的函数（可选，未命中时回退到 GetServiceQuota）
+    
+    Returns:
+        QuotaResult 对象（成功或失败）
+    """
+    try:
+        # 先检查缓存（如果启用）
+        quota_info = None
+        
+        if quota_limit_cache and not quota_limit_cache.is_force_refresh():
+            # 缓存命中时直接复用缓存层已构建好的成功结果，不再逐次构建 QuotaResult
+            cached_result = quota_limit_cache.get_result(account_id, service_region, service, quota_code, quota_name)
+            if cached_result is not None:
+                logger.debug("[采集] 使用缓存的配额 Limit: %s:%s:%s:%s", account_id, service_region, service, quota_code)
+                return cached_result
+            
+            # 已知的确定性失败（配额不存在 / 权限不足），直接返回缓存的失败结果
+            negative = quota_limit_cache.get_negative(account_id, service_region, service, quota_code)
+            if negative:
+                reason, error = negative
+                logger.debug("[采集] 使用缓存的失败结果: %s:%s:%s:%s (%s)", account_id, service_region, service, quota_code, reason)
+                return QuotaResult(
+                    service=service,
+                    quota_code=quota_code,
+                    quota_name=quota_name,
+                    status=QuotaStatus.FAILED,
+                    reason=reason,
+                    error=error,
+                    account_id=account_id,
+                    region=service_region
+                )
+        
+        # 缓存未命中时，先查 ListServiceQuotas 的批量结果
+        if not quota_info and quota_lookup:
+            quota_info = quota_lookup(quota_code)
+            if quota_info and quota_limit_cache:
+                quota_limit_cache.set(account_id, service_region, service, quota_code, quota_info)
+        
+        # 批量结果中也没有（部分配额只能单独查询），调用 GetServiceQuota
+        # 同一配额的并发请求合并为一次 API 调用，结果在等待线程间共享，这里取副本
+        if not quota_info:
+            shared_info = _inflight_quota_calls.do(
+                (account_id, service_region, service, quota_code),
+                lambda: _call_get_service_quota(service, quota_code, sq_client, account_id, service_region, quota_limit_cache)
+            )
+            quota_info = dict(shared_info) if shared_info else None
+        
+        if quota_info:
+            # 创建成功结果（包含 account_id 和 region）
+            # quota_info 为本次调用独占（合并 API 结果的副本 / 缓存返回副本 / 批量结果每个 quota_code 只取一次），直接原地补充上下文，避免额外拷贝
+            quota_info['account_id'] = account_id
+            quota_info['region'] = service_region
+            
+            logger.debug("[采集] 配额 %s: Limit = %s", quota_code, quota_info.get('value', 0.0))
+            return QuotaResult(
+                service=service,
+                quota_code=quota_code,
+                quota_name=quota_name,
+                status=QuotaStatus.SUCCESS,
+                quota_info=quota_info,
+                account_id=account_id,
+                region=service_region
+            )
+        
+        logger.warning("[采集] 配额 %s: 返回值为空", quota_code)
+        
+        # 创建失败结果
+        return QuotaResult(
+            service=service,
+            quota_code=quota_code,
+            quota_name=quota_name,
+            status=QuotaStatus.FAILED,
+            reason='empty_response',
+            error='API returned empty response',
+            account_id=account_id,
+            region=service_region
+        )
+        
+    except Exception as e:
+        error_msg = str(e)
+        logger.error("[采集] 配额 %s: %s", quota_code, error_msg)
+        
+        # 创建失败结果（AWS 错误按 Error.Code 精确分类，其他错误统一为 api_error）
+        error_code = e.response.get('Error', {}).get('Code', '') if isinstance(e, ClientError) else ''
+        reason = _CLIENT_ERROR_REASONS.get(error_code, 'api_error')
+        if quota_limit_cache:
+            quota_limit_cache.set_negative(account_id, service_region, service, quota_code, reason, error_msg)
+        
+        return QuotaResult(
+            service=service,
+            quota_code=quota_code,
+            quota_name=quota_name,
+            status=QuotaStatus.FAILED,
+            reason=reason,
+            error=error_msg,
+            account_id=account_id,
+            region=service_region
+        )
+
+
+def _list_quota_map(sq_client: ServiceQuotasClient, service: str, account_id: str, service_region: str) -> Dict[str, Dict]:
+    """
+    调用 ListServiceQuotas 批量获取服务的所有配额
+    
+    Args:
+        sq_client: 目标 region 的 Service Quotas 客户端
+        service: 服务代码
+        account_id: 账号 ID
+        service_region: 服务使用的 region
+    
+    Returns:
+        quota_code → 配额详情的字典（失败时返回空字典，由调用方回退到 GetServiceQuota）
+    """
+    try:
+        get_rate_limiter(account_id, service_region).acquire()
+        quota_map = sq_client.list_service_quotas_map(service_code=service)
+        logger.debug("[采集] ListServiceQuotas: %s:%s:%s 共 %s 个配额", account_id, service_region, service, len(quota_map))
+        return quota_map
+    except Exception as e:
+        logger.warning("[采集] ListServiceQuotas 失败，回退到 GetServiceQuota: %s:%s:%s, 错误: %s", account_id, service_region, service, e)
+        return {}
+
+
+def _map_ordered(fn: Callable[[Any], Any], items: Sequence[Any], max_workers: int) -> List[Any]:
+    """
+    用线程池并发执行 fn（保持结果顺序），只有一个任务时直接在当前线程执行
+    
+    Args:
+        fn: 处理单个元素的函数
+        items: 待处理的元素列表
+        max_workers: 最大并发线程数
+    
+    Returns:
+        结果列表（与 items 顺序一致）
+    """
+    concurrency = min(max_workers, len(items))
+    if concurrency <= 1:
+        return [fn(item) for item in items]
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(fn, items))
+
+
+def _map_quotas(fetch: Callable[[QuotaItem], QuotaResult], quotas: Sequence[QuotaItem]) -> List[QuotaResult]:
+    """
+    在账号内按配额粒度并发执行 fetch（保持结果顺序）
+    
+    并发数由 QUOTA_FETCH_CONCURRENCY 控制（默认 10），实际请求速率仍受 (account, region) 令牌桶约束
+    
+    Args:
+        fetch: 获取单个配额结果的函数
+        quotas: 配额列表
+    
+    Returns:
+        QuotaResult 列表（与 quotas 顺序一致）
+    """
+    return _map_ordered(fetch, quotas, _QUOTA_FETCH_CONCURRENCY)
+
+
+def _collect_discovery_limits(
+    plan: ServicePlan,
+    sq_client: ServiceQuotasClient,
+    account_id: str,
+    service_region: str,
+    quota_limit_cache: QuotaLimitCache = None
+) -> List[QuotaResult]:
+    """
+    Discovery 模式（如 SageMaker）：先发现匹配的配额，再逐个获取 Limit
+    
+    Discovery 出来的配额不走 Limit 缓存（配额列表本身是动态的）。
+    每次调用只处理一个 (account, region)，跨 Region 的并发由 _collect_account_quotas
+    按 REGION_FETCH_CONCURRENCY 调度，因此这里不再单独开线程池。
+    
+    Returns:
+        QuotaResult 列表
+    """
+    service = plan.service
+    logger.info("[采集] 服务 %s 使用 Discovery 模式，区域: %s", service, service_region)
+    
+    try:
+        discovery = SageMakerDiscovery(sq_client, plan.discovery)
+        
+        # 发现匹配的配额
+        discovered_quotas = discovery.discover_quotas(service_region)
+    except Exception as e:
+        # Discovery 失败不影响其他服务，继续处理下一个服务
+        logger.error("[采集] 服务 %s Discovery 失败: %s", service, e, exc_info=True)
+        return []
+    
+    if not discovered_quotas:
+        logger.warning("[采集] 服务 %s 未发现匹配的配额", service)
+        return []
+    
+    logger.info("[采集] 服务 %s 发现 %s 个匹配的配额", service, len(discovered_quotas))
+    
+    # 对每个发现的配额获取 Limit 值（ListServiceQuotas 已返回 Limit，直接复用）
+    return _map_quotas(
+        lambda q: _fetch_quota_limit(service, q.quota_code, q.quota_name, sq_client, account_id, service_region,
+                                     quota_lookup=discovery.listed_quotas.get),
+        discovered_quotas
+    )
+
+
+def _collect_hardcoded_limits(
+    plan: ServicePlan,
+    sq_client: ServiceQuotasClient,
+    account_id: str,
+    service_region: str,
+    quota_limit_cache: QuotaLimitCache = None
+) -> List[QuotaResult]:
+    """
+    硬编码模式（CloudFront）：配额不在 Service Quotas API 中，使用默认 Limit 值
+    
+    Returns:
+        QuotaResult 列表
+    """
+    logger.info("[采集] 服务 %s 使用硬编码 Limit 值（配额不在 Service Quotas API 中）", plan.service)
+    return _build_cloudfront_limit_results(plan.quotas, account_id, service_region)
+
+
+def _collect_declarative_limits(
+    plan: ServicePlan,
+    sq_client: ServiceQuotasClient,
+    account_id: str,
+    service_region: str,
+    quota_limit_cache: QuotaLimitCache = None
+) -> List[QuotaResult]:
+    """
+    声明型配额：逐个获取配置中声明的配额 Limit（优先读 Limit 缓存）
+    
+    Returns:
+        QuotaResult 列表
+    """
+    service = plan.service
+    logger.debug("[采集] 服务: %s, 配额数量: %s, region: %s", service, len(plan.quotas), service_region)
+    
+    # 一次查询把该服务已缓存的 Limit 预读到内存层，之后逐个配额查缓存不再访问磁盘
+    if quota_limit_cache and not quota_limit_cache.is_force_refresh():
+        quota_limit_cache.get_many(account_id, service_region, service, [q.quota_code for q in plan.quotas])
+    
+    # 缓存未命中时才调用一次 ListServiceQuotas，之后本地查表（多个线程可能同时未命中，加锁只调用一次）
+    quota_map = None
+    quota_map_lock = Lock()
+    
+    def lookup(quota_code: str) -> Optional[Dict]:
+        nonlocal quota_map
+        with quota_map_lock:
+            if quota_map is None:
+                quota_map = _list_quota_map(sq_client, service, account_id, service_region)
+        return quota_map.get(quota_code)
+    
+    return _map_quotas(
+        lambda q: _fetch_quota_limit(service, q.quota_code, q.quota_name, sq_client, account_id, service_region,
+                                     quota_limit_cache, quota_lookup=lookup),
+        plan.quotas
+    )
+
+
+# Limit 采集模式 → handler（模式在 load_quota_config 时确定，见 QuotaConfig.limit_plan）
+_LIMIT_HANDLERS = {
+    LIMIT_MODE_DISCOVERY: _collect_discovery_limits,
+    LIMIT_MODE_HARDCODED: _collect_hardcoded_limits,
+    LIMIT_MODE_DECLARATIVE: _collect_declarative_limits,
+}
+
+
+def _collect_service_limits(
+    quota_config: Any,
+    account_id: str,
+    region: str,
+    credentials: Dict[str, str] = None,
+    quota_limit_cache: QuotaLimitCache = None,
+    services: Optional[frozenset] = None
+) -> List[QuotaResult]:
+    """
+    采集单个账号在单个区域的所有服务 Limit（按服务模式分发）
+    
+    Args:
+        quota_config: 配额配置对象
+        account_id: 账号 ID
+        region: 区域（全局服务固定使用 us-east-1）
+        credentials: 账号凭证
+        quota_limit_cache: 配额 Limit 缓存
+        services: 本次只处理的服务集合（None 表示全部）
+    
+    Returns:
+        QuotaResult 列表
+    """
+    results: List[QuotaResult] = []
+    
+    for plan in quota_config.limit_plan:
+        if services is not None and plan.service not in services:
+            continue
+        
+        # 全局服务固定 us-east-1，区域型服务使用当前 region（已经是 EC2 使用的 Region）
+        service_region = plan.region or region
+        sq_client = _get_sq_client(service_region, credentials, account_id)
+        
+        results.extend(_LIMIT_HANDLERS[plan.mode](plan, sq_client, account_id, service_region, quota_limit_cache))
+    
+    return results
+
+
+def _split_services(quota_config: Any, collect_limit: bool, collect_usage: bool) -> Tuple[frozenset, frozenset]:
+    """
+    计算本次采集需要处理的服务，并拆分为全局服务和区域型服务（每次 collect_quotas 只计算一次）
+    
+    Args:
+        quota_config: 配额配置对象
+        collect_limit: 是否采集 Limit（看配置中的全部服务）
+        collect_usage: 是否采集 Usage（只看有对应 collector 的服务）
+    
+    Returns:
+        (全局服务集合, 区域型服务集合)
+    """
+    relevant_services = set()
+    if collect_limit:
+        relevant_services.update(quota_config.aws)
+    if collect_usage:
+        relevant_services.update(quota_config.effective_usage_services)
+    return frozenset(relevant_services & GLOBAL_SERVICES), frozenset(relevant_services - GLOBAL_SERVICES)
+
+
 def _collect_account_quotas(
     account_id: str,
     quota_config: Any,
@@ -361,10 +916,12 @@ def _collect_account_quotas(
     credential_provider = None,
     collect_limit: bool = True,
     collect_usage: bool = True,
-    quota_limit_cache: QuotaLimitCache = None
+    quota_limit_cache: QuotaLimitCache = None,
+    regions: Optional[List[str]] = None,
+    service_sets: Optional[Tuple[frozenset, frozenset]] = None
 ) -> List[QuotaResult]:
     """
-    采集单个账号的配额数据（辅助函数，用于并发采集）
+    采集单个账号的配额数据
     
     Args:
         account_id: 账号 ID
@@ -374,19 +931,32 @@ def _collect_account_quotas(
         credential_provider: 凭证 Provider
         collect_limit: 是否采集 Limit
         collect_usage: 是否采集 Usage
+        quota_limit_cache: 配额 Limit 缓存
+        regions: 预先获取的 EC2 Region 列表（None 时通过 region_provider 获取）
+        service_sets: 预先拆分好的 (全局服务, 区域型服务)（None 时按 collect_limit / collect_usage 计算）
     
     Returns:
         该账号的采集结果列表
     """
     account_results: List[QuotaResult] = []
     
+    # 全局服务与 region 无关，每个账号只采集一次；区域型服务按 EC2 Region 采集
+    if service_sets is None:
+        service_sets = _split_services(quota_config, collect_limit, collect_usage)
+    global_svcs, regional_svcs = service_sets
+    if not global_svcs and not regional_svcs:
+        logger.debug("[采集] 账号 %s 没有需要采集的服务，跳过", account_id)
+        return account_results
+    
     try:
-        regions = region_provider.get_regions(account_id)
+        if not regional_svcs:
+            regions = []
+        elif regions is None:
+            regions = region_provider.get_regions(account_id)
         
-        # 如果账号没有 EC2 Region，至少添加一个默认 Region 用于全局服务采集
-        if not regions:
-            logger.warning(f"[采集] 账号 {account_id} 没有 EC2 Region，将只采集全局服务（使用 us-east-1）")
-            regions = ['us-east-1']
+        # 如果账号没有 EC2 Region，只采集全局服务
+        if regional_svcs and not regions:
+            logger.warning("[采集] 账号 %s 没有 EC2 Region，将只采集全局服务（使用 us-east-1）", account_id)
         
         # 获取账号凭证
         credentials = None
@@ -394,12 +964,17 @@ def _collect_account_quotas(
             try:
                 credentials = credential_provider.get_credentials(account_id)
             except Exception as e:
-                logger.warning(f"[采集] 获取账号 {account_id} 的凭证失败: {e}，使用默认凭证链")
+                logger.warning("[采集] 获取账号 %s 的凭证失败: %s，使用默认凭证链", account_id, e)
                 credentials = None
         
-        for region in regions:
+        visits = [(region, regional_svcs) for region in regions]
+        if global_svcs:
+            visits.insert(0, ('us-east-1', global_svcs))
+        
+        def collect_visit(visit) -> list:
+            region, services = visit
             try:
-                account_results.extend(_collect_account_region_quotas(
+                return _collect_account_region_quotas(
                     account_id=account_id,
                     region=region,
                     quota_config=quota_config,
@@ -407,14 +982,19 @@ def _collect_account_quotas(
                     credentials=credentials,
                     collect_limit=collect_limit,
                     collect_usage=collect_usage,
-                    quota_limit_cache=quota_limit_cache
-                ))
+                    quota_limit_cache=quota_limit_cache,
+                    services=services
+                )
             except Exception as e:
-                logger.error(f"[采集] 处理账号 {account_id} 区域 {region} 时发生错误: {e}", exc_info=True)
-                continue
+                logger.error("[采集] 处理账号 %s 区域 %s 时发生错误: %s", account_id, region, e, exc_info=True)
+                return []
+        
+        # 各 Region 之间相互独立，按 REGION_FETCH_CONCURRENCY 并发处理
+        for region_results in _map_ordered(collect_visit, visits, _REGION_FETCH_CONCURRENCY):
+            account_results.extend(region_results)
                 
     except Exception as e:
-        logger.error(f"[采集] 处理账号 {account_id} 时发生错误: {e}", exc_info=True)
+        logger.error("[采集] 处理账号 %s 时发生错误: %s", account_id, e, exc_info=True)
     
     return account_results
 
@@ -427,7 +1007,8 @@ def _collect_account_region_quotas(
     credentials: Dict[str, str] = None,
     collect_limit: bool = True,
     collect_usage: bool = True,
-    quota_limit_cache: QuotaLimitCache = None
+    quota_limit_cache: QuotaLimitCache = None,
+    services: Optional[frozenset] = None
 ) -> List[QuotaResult]:
     """
     采集单个账号在单个区域的配额数据（辅助函数）
@@ -440,390 +1021,107 @@ def _collect_account_region_quotas(
         credentials: 账号凭证
         collect_limit: 是否采集 Limit
         collect_usage: 是否采集 Usage
+        services: 本次只处理的服务集合（None 表示全部）
     
     Returns:
         该账号在该区域的采集结果列表
     """
     region_results: List[QuotaResult] = []
     
-    logger.info(f"[采集] 处理账号: {account_id}, 区域: {region}")
-    
-    # 初始化 Service Quotas 客户端
-    sq_client = None
-    if collect_limit:
-        if credentials:
-            sq_client = ServiceQuotasClient(
-                region=region,
-                access_key=credentials.get('access_key'),
-                secret_key=credentials.get('secret_key')
-            )
-        else:
-            sq_client = ServiceQuotasClient(region=region)
+    logger.info("[采集] 处理账号: %s, 区域: %s", account_id, region)
     
     # 收集 usage 数据（service-level）
     if collect_usage:
-        global_services = ['route53', 'cloudfront']
-        regional_services = ['ec2', 'ebs', 'elasticloadbalancing', 'eks', 'elasticache', 'sagemaker']
-        
-        for service in ['ec2', 'ebs', 'elasticloadbalancing', 'eks', 'elasticache', 'route53', 'cloudfront', 'sagemaker']:
-            if service in quota_config.aws and service in usage_collectors:
-                try:
-                    collector = usage_collectors[service]
-                    
-                    if service in global_services:
-                        usage_region = 'us-east-1'
-                        metrics_region = 'us-east-1'
-                    else:
-                        usage_region = region
-                        metrics_region = region
-                    
-                    if credentials:
-                        usage_data = collector.collect_usage(
-                            account_id=account_id,
-                            region=usage_region,
-                            access_key=credentials.get('access_key'),
-                            secret_key=credentials.get('secret_key')
-                        )
-                    else:
-                        usage_data = collector.collect_usage(account_id=account_id, region=usage_region)
-                    
-                    if usage_data:
-                        # 注意：这里不能直接调用 quota_collector，因为这是并发环境
-                        # 需要返回 usage_data，由主函数统一设置
-                        region_results.append({
-                            'type': 'usage_data',
-                            'account_id': account_id,
-                            'region': metrics_region,
-                            'service': service,
-                            'usage_data': usage_data
-                        })
-                except Exception as e:
-                    logger.error(f"[采集] 收集 {service} usage 失败: {e}", exc_info=True)
-    
-    # 采集 Limit 数据
-    if collect_limit and sq_client:
-        # 遍历所有服务的配额
-        for service, service_config in quota_config.aws.items():
-            # 全局服务列表（固定 Region）
-            global_services = ['route53', 'cloudfront']
-            # 区域型服务列表（只在 EC2 使用的 Region 采集）
-            regional_services = ['ec2', 'ebs', 'elasticloadbalancing', 'eks', 'elasticache', 'sagemaker']
-            
-            # 确定该服务使用的 region
-            # 全局服务固定 us-east-1，区域型服务使用当前 region（已经是 EC2 使用的 Region）
-            if service in global_services:
-                service_region = 'us-east-1'
-            else:
-                service_region = region
-            
-            # 如果 region 不匹配，需要重新初始化客户端（全局服务）
-            if service in global_services and region != 'us-east-1':
+        for service in quota_config.effective_usage_services:
+            if services is not None and service not in services:
+                continue
+            try:
+                collector = usage_collectors[service]
+                
+                if service in GLOBAL_SERVICES:
+                    usage_region = 'us-east-1'
+                    metrics_region = 'us-east-1'
+                else:
+                    usage_region = region
+                    metrics_region = region
+                
                 if credentials:
-                    sq_client = ServiceQuotasClient(
-                        region='us-east-1',
+                    usage_data = collector.collect_usage(
+                        account_id=account_id,
+                        region=usage_region,
                         access_key=credentials.get('access_key'),
                         secret_key=credentials.get('secret_key')
                     )
                 else:
-                    sq_client = ServiceQuotasClient(region='us-east-1')
-            
-            # 处理 Discovery 模式（如 SageMaker）
-            if isinstance(service_config, dict) and 'discovery' in service_config:
-                discovery_config = service_config['discovery']
-                if discovery_config.enabled:
-                    logger.info(f"[采集] 服务 {service} 使用 Discovery 模式，区域: {service_region}")
-                    
-                    try:
-                        # 初始化 Discovery（使用当前 region 的客户端）
-                        # 对于区域型服务，需要确保使用正确的 region
-                        if service in regional_services and service_region != sq_client.region:
-                            # 重新初始化客户端到正确的 region
-                            if credentials:
-                                sq_client = ServiceQuotasClient(
-                                    region=service_region,
-                                    access_key=credentials.get('access_key'),
-                                    secret_key=credentials.get('secret_key')
-                                )
-                            else:
-                                sq_client = ServiceQuotasClient(region=service_region)
-                        
-                        discovery = SageMakerDiscovery(sq_client, discovery_config)
-                        
-                        # 发现匹配的配额
-                        discovered_quotas = discovery.discover_quotas(service_region)
-                        
-                        if discovered_quotas:
-                            logger.info(f"[采集] 服务 {service} 发现 {len(discovered_quotas)} 个匹配的配额")
-                            
-                            # 对每个发现的配额获取 Limit 值
-                            for quota_item in discovered_quotas:
-                                quota_code = quota_item.quota_code
-                                quota_name = quota_item.quota_name
-                                
-                                try:
-                                    # 添加延迟，避免 API 限流（增加到0.1秒，减少限流）
-                                    time.sleep(0.1)
-                                    
-                                    # 调用 GetServiceQuota API 获取 Limit（带重试）
-                                    max_retries = 3
-                                    retry_count = 0
-                                    quota_info = None
-                                    
-                                    while retry_count < max_retries:
-                                        try:
-                                            quota_info = sq_client.get_service_quota(
-                                                service_code=service,
-                                                quota_code=quota_code
-                                            )
-                                            break  # 成功，退出重试循环
-                                        except Exception as api_error:
-                                            error_msg = str(api_error)
-                                            if 'TooManyRequestsException' in error_msg and retry_count < max_retries - 1:
-                                                # API 限流，等待后重试（指数退避）
-                                                wait_time = (2 ** retry_count) * 2  # 2, 4, 8 秒
-                                                logger.warning(f"[采集] API 限流，等待 {wait_time} 秒后重试... (配额: {quota_code})")
-                                                time.sleep(wait_time)
-                                                retry_count += 1
-                                            else:
-                                                raise  # 其他错误或达到最大重试次数，抛出异常
-                                    
-                                    if quota_info:
-                                        limit_value = quota_info.get('value', 0.0)
-                                        
-                                        # 创建成功结果（包含 account_id 和 region）
-                                        quota_info_with_context = quota_info.copy()
-                                        quota_info_with_context['account_id'] = account_id
-                                        quota_info_with_context['region'] = service_region
-                                        
-                                        result = QuotaResult(
-                                            service=service,
-                                            quota_code=quota_code,
-                                            quota_name=quota_name,
-                                            status=QuotaStatus.SUCCESS,
-                                            quota_info=quota_info_with_context,
-                                            account_id=account_id,
-                                            region=service_region
-                                        )
-                                        region_results.append(result)
-                                        
-                                        logger.debug(f"[采集] 配额 {quota_code}: Limit = {limit_value}")
-                                    else:
-                                        logger.warning(f"[采集] 配额 {quota_code}: 返回值为空")
-                                        
-                                        # 创建失败结果
-                                        result = QuotaResult(
-                                            service=service,
-                                            quota_code=quota_code,
-                                            quota_name=quota_name,
-                                            status=QuotaStatus.FAILED,
-                                            reason='empty_response',
-                                            error='API returned empty response',
-                                            account_id=account_id,
-                                            region=service_region
-                                        )
-                                        region_results.append(result)
-                                        
-                                except Exception as e:
-                                    error_msg = str(e)
-                                    logger.error(f"[采集] 配额 {quota_code}: {error_msg}")
-                                    
-                                    # 创建失败结果
-                                    reason = 'api_error'
-                                    if 'NoSuchResourceException' in error_msg:
-                                        reason = 'quota_not_found'
-                                    elif 'AccessDeniedException' in error_msg:
-                                        reason = 'permission_denied'
-                                    
-                                    result = QuotaResult(
-                                        service=service,
-                                        quota_code=quota_code,
-                                        quota_name=quota_name,
-                                        status=QuotaStatus.FAILED,
-                                        reason=reason,
-                                        error=error_msg,
-                                        account_id=account_id,
-                                        region=service_region
-                                    )
-                                    region_results.append(result)
-                        else:
-                            logger.warning(f"[采集] 服务 {service} 未发现匹配的配额")
-                            
-                    except Exception as e:
-                        logger.error(f"[采集] 服务 {service} Discovery 失败: {e}", exc_info=True)
-                        # Discovery 失败不影响其他服务，继续处理下一个服务
-                    
-                    # Discovery 模式处理完成，继续下一个服务
-                    continue
-            
-            # CloudFront 特殊处理：配额不在 Service Quotas API 中，使用硬编码的默认值
-            if service == 'cloudfront':
-                logger.info(f"[采集] 服务 {service} 使用硬编码 Limit 值（配额不在 Service Quotas API 中）")
-                
-                # CloudFront 的默认配额限制值（AWS 标准默认值）
-                cloudfront_default_limits = {
-                    'L-24B04930': 200.0,  # Web distributions per AWS account
-                    'L-7D134442': 20.0,   # Cache policies per AWS account
-                    'L-CF0D4FC5': 20.0,   # Response headers policies
-                    'L-08884E5C': 100.0   # Origin access identities per account
-                }
-                
-                # 处理声明型配额
-                quotas = service_config
-                if not isinstance(quotas, list):
-                    continue
-                
-                # 为每个 CloudFront 配额创建带有硬编码 Limit 值的结果
-                for quota in quotas:
-                    quota_code = quota.quota_code
-                    quota_name = quota.quota_name
-                    
-                    # 获取硬编码的默认值
-                    default_limit = cloudfront_default_limits.get(quota_code)
-                    
-                    if default_limit is not None:
-                        # 创建成功结果（使用硬编码的 Limit 值）
-                        quota_info_with_context = {
-                            'quota_code': quota_code,
-                            'quota_name': quota_name,
-                            'value': default_limit,
-                            'account_id': account_id,
-                            'region': service_region
-                        }
-                        
-                        result = QuotaResult(
-                            service=service,
-                            quota_code=quota_code,
-                            quota_name=quota_name,
-                            status=QuotaStatus.SUCCESS,
-                            quota_info=quota_info_with_context,
-                            account_id=account_id,
-                            region=service_region
-                        )
-                        region_results.append(result)
-                        
-                        logger.debug(f"[采集] CloudFront 配额 {quota_code}: Limit = {default_limit} (硬编码默认值)")
-                    else:
-                        logger.warning(f"[采集] CloudFront 配额 {quota_code}: 未找到默认值，跳过")
+                    usage_data = collector.collect_usage(account_id=account_id, region=usage_region)
                 
-                # CloudFront 处理完成，继续下一个服务
-                continue
-            
-            # 处理声明型配额
-            quotas = service_config
-            if not isinstance(quotas, list):
-                continue
-            
-            logger.debug(f"[采集] 服务: {service}, 配额数量: {len(quotas)}, region: {service_region}")
-            
-            for quota in quotas:
-                quota_code = quota.quota_code
-                quota_name = quota.quota_name
-                
-                try:
-                    # 先检查缓存（如果启用）
-                    quota_info = None
-                    cache_hit = False
-                    
-                    if quota_limit_cache and not quota_limit_cache.is_force_refresh():
-                        cached_data = quota_limit_cache.get(account_id, service_region, service, quota_code)
-                        if cached_data:
-                            quota_info = cached_data
-                            cache_hit = True
-                            logger.debug(f"[采集] 使用缓存的配额 Limit: {account_id}:{service_region}:{service}:{quota_code}")
-                    
-                    # 如果缓存未命中，调用 API
-                    if not quota_info:
-                        # 添加延迟，避免 API 限流（增加到0.1秒，减少限流）
-                        time.sleep(0.1)
-                        
-                        # 调用 GetServiceQuota API（带重试）
-                        max_retries = 3
-                        retry_count = 0
-                        
-                        while retry_count < max_retries:
-                            try:
-                                quota_info = sq_client.get_service_quota(
-                                    service_code=service,
-                                    quota_code=quota_code
-                                )
-                                break  # 成功，退出重试循环
-                            except Exception as api_error:
-                                error_msg = str(api_error)
-                                if 'TooManyRequestsException' in error_msg and retry_count < max_retries - 1:
-                                    # API 限流，等待后重试（指数退避）
-                                    wait_time = (2 ** retry_count) * 2  # 2, 4, 8 秒
-                                    logger.warning(f"[采集] API 限流，等待 {wait_time} 秒后重试... (配额: {quota_code})")
-                                    time.sleep(wait_time)
-                                    retry_count += 1
-                                else:
-                                    raise  # 其他错误或达到最大重试次数，抛出异常
-                        
-                        # 如果 API 调用成功，更新缓存
-                        if quota_info and quota_limit_cache:
-                            quota_limit_cache.set(account_id, service_region, service, quota_code, quota_info)
-                    
-                    if quota_info:
-                        limit_value = quota_info.get('value', 0.0)
-                        
-                        # 创建成功结果（包含 account_id 和 region）
-                        quota_info_with_context = quota_info.copy()
-                        quota_info_with_context['account_id'] = account_id
-                        quota_info_with_context['region'] = service_region
-                        
-                        result = QuotaResult(
-                            service=service,
-                            quota_code=quota_code,
-                            quota_name=quota_name,
-                            status=QuotaStatus.SUCCESS,
-                            quota_info=quota_info_with_context,
-                            account_id=account_id,
-                            region=service_region
-                        )
-                        region_results.append(result)
-                        
-                        logger.debug(f"[采集] 配额 {quota_code}: Limit = {limit_value}")
-                    else:
-                        logger.warning(f"[采集] 配额 {quota_code}: 返回值为空")
-                        
-                        # 创建失败结果
-                        result = QuotaResult(
-                            service=service,
-                            quota_code=quota_code,
-                            quota_name=quota_name,
-                            status=QuotaStatus.FAILED,
-                            reason='empty_response',
-                            error='API returned empty response',
-                            account_id=account_id,
-                            region=service_region
-                        )
-                        region_results.append(result)
-                        
-                except Exception as e:
-                    error_msg = str(e)
-                    logger.error(f"[采集] 配额 {quota_code}: {error_msg}")
-                    
-                    # 创建失败结果
-                    reason = 'api_error'
-                    if 'NoSuchResourceException' in error_msg:
-                        reason = 'quota_not_found'
-                    elif 'AccessDeniedException' in error_msg:
-                        reason = 'permission_denied'
-                    
-                    result = QuotaResult(
-                        service=service,
-                        quota_code=quota_code,
-                        quota_name=quota_name,
-                        status=QuotaStatus.FAILED,
-                        reason=reason,
-                        error=error_msg,
-                        account_id=account_id,
-                        region=service_region
-                    )
-                    region_results.append(result)
+                if usage_data:
+                    # 注意：这里不能直接调用 quota_collector，因为这是并发环境
+                    # 需要返回 usage_data，由主函数统一设置
+                    region_results.append({
+                        'type': 'usage_data',
+                        'account_id': account_id,
+                        'region': metrics_region,
+                        'service': service,
+                        'usage_data': usage_data
+                    })
+            except Exception as e:
+                logger.error("[采集] 收集 %s usage 失败: %s", service, e, exc_info=True)
+
+    # 采集 Limit 数据（按配置加载时确定的模式分发到对应 handler）
+    if collect_limit:
+        region_results.extend(_collect_service_limits(
+            quota_config, account_id, region, credentials, quota_limit_cache, services
+        ))
     
     return region_results
 
 
+def _collect_account_wrapper(
+    account_id: str,
+    quota_config: Any,
+    region_provider: RegionProvider,
+    usage_collectors: Dict[str, Any],
+    credential_provider,
+    collect_limit: bool,
+    collect_usage: bool,
+    quota_limit_cache: QuotaLimitCache,
+    service_sets: Tuple[frozenset, frozenset]
+) -> list:
+    """
+    并发采集的线程入口：采集单个账号，异常时记录日志并返回空列表
+    
+    Args:
+        account_id: 账号 ID
+        quota_config: 配额配置对象
+        region_provider: 区域 Provider
+        usage_collectors: Usage Collectors 字典
+        credential_provider: 凭证 Provider
+        collect_limit: 是否采集 Limit
+        collect_usage: 是否采集 Usage
+        quota_limit_cache: 配额 Limit 缓存
+        service_sets: 预先拆分好的 (全局服务, 区域型服务)
+    
+    Returns:
+        采集结果列表（QuotaResult 或 usage_data 字典）
+    """
+    try:
+        return _collect_account_quotas(
+            account_id=account_id,
+            quota_config=quota_config,
+            region_provider=region_provider,
+            usage_collectors=usage_collectors,
+            credential_provider=credential_provider,
+            collect_limit=collect_limit,
+            collect_usage=collect_usage,
+            quota_limit_cache=quota_limit_cache,
+            service_sets=service_sets
+        )
+    except Exception as e:
+        logger.error("[采集] 账号 %s 采集失败: %s", account_id, e, exc_info=True)
+        return []
+
+
 def collect_quotas(
     quota_config: Any,
     account_provider: AccountProvider,
@@ -852,504 +1150,102 @@ def collect_quotas(
         credential_provider: 凭证 Provider
         collect_limit: 是否采集 Limit（默认 True）
         collect_usage: 是否采集 Usage（默认 True）
+    
+    Raises:
+        ValueError: collect_limit 和 collect_usage 同时为 False
     """
+    if not collect_limit and not collect_usage:
+        raise ValueError("collect_limit 和 collect_usage 不能同时为 False")
+    
     # 获取账号和区域列表
     accounts = account_provider.get_accounts()
     
     # 存储所有采集结果
     all_results: List[QuotaResult] = []
+    # 每个账号的结果由采集函数独占构建并返回，最后统一合并（并发模式下无需加锁）
+    per_account_results: List[list] = []
+    
+    # 需要处理的服务只取决于配置和采集类型，所有账号共用同一份拆分结果
+    service_sets = _split_services(quota_config, collect_limit, collect_usage)
     
     # 并发采集配置
-    max_workers = int(os.getenv('COLLECTION_MAX_WORKERS', '3'))  # 默认 3 个并发线程（减少限流）
+    # 限流由令牌桶 + botocore adaptive 重试负责，默认并发数按 I/O 密集型任务设置
+    max_workers = int(os.getenv('COLLECTION_MAX_WORKERS', str(DEFAULT_COLLECTION_MAX_WORKERS)))
     use_concurrent = os.getenv('USE_CONCURRENT_COLLECTION', 'true').lower() == 'true'
     
     if use_concurrent and len(accounts) > 1:
-        logger.info(f"[采集] 使用并发采集模式（{max_workers} 个并发线程）")
-        results_lock = Lock()
-        
-        def collect_account_wrapper(account_id: str):
-            """包装函数，用于并发采集"""
-            try:
-                return _collect_account_quotas(
-                    account_id=account_id,
-                    quota_config=quota_config,
-                    region_provider=region_provider,
-                    usage_collectors=usage_collectors,
-                    credential_provider=credential_provider,
-                    collect_limit=collect_limit,
-                    collect_usage=collect_usage,
-                    quota_limit_cache=quota_limit_cache
-                )
-            except Exception as e:
-                logger.error(f"[采集] 账号 {account_id} 采集失败: {e}", exc_info=True)
-                return []
+        logger.info("[采集] 使用并发采集模式（%s 个并发线程）", max_workers)
         
         # 使用线程池并发采集
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_account = {executor.submit(collect_account_wrapper, account_id): account_id 
-                                for account_id in accounts}
+            future_to_account = {
+                executor.submit(
+                    _collect_account_wrapper, account_id, quota_config, region_provider, usage_collectors,
+                    credential_provider, collect_limit, collect_usage, quota_limit_cache, service_sets
+                ): account_id
+                for account_id in accounts
+            }
             
             completed = 0
-            usage_data_list = []  # 存储所有账号的 Usage 数据
-            
             for future in as_completed(future_to_account):
                 account_id = future_to_account[future]
                 completed += 1
                 try:
-                    account_results = future.result()
-                    
-                    # 分离 Limit 结果和 Usage 数据
-                    limit_results = []
-                    for item in account_results:
-                        if isinstance(item, dict) and item.get('type') == 'usage_data':
-                            # 这是 Usage 数据，需要单独处理
-                            usage_data_list.append(item)
-                        elif isinstance(item, QuotaResult):
-                            # 这是 Limit 结果
-                            limit_results.append(item)
-                    
-                    with results_lock:
-                        all_results.extend(limit_results)
-                    
-                    logger.info(f"[采集] 账号 {account_id} 采集完成 ({completed}/{len(accounts)})")
+                    per_account_results.append(future.result())
+                    logger.info("[采集] 账号 %s 采集完成 (%s/%s)", account_id, completed, len(accounts))
                 except Exception as e:
-                    logger.error(f"[采集] 账号 {account_id} 采集异常: {e}", exc_info=True)
-            
-            # 统一设置所有账号的 Usage 数据
-            if collect_usage and usage_data_list:
-                logger.info(f"[采集] 开始设置 Usage 数据（共 {len(usage_data_list)} 个服务）")
-                for usage_item in usage_data_list:
-                    try:
-                        quota_collector.set_usage_data(
-                            account_id=usage_item['account_id'],
-                            region=usage_item['region'],
-                            service=usage_item['service'],
-                            usage_data=usage_item['usage_data']
-                        )
-                    except Exception as e:
-                        logger.error(f"[采集] 设置 Usage 数据失败: {e}", exc_info=True)
+                    logger.error("[采集] 账号 %s 采集异常: %s", account_id, e, exc_info=True)
     else:
-        # 顺序采集（原有逻辑）
-        logger.info(f"[采集] 使用顺序采集模式")
+        # 顺序采集：一次性批量获取所有账号的 Region，再逐个账号采集
+        logger.info("[采集] 使用顺序采集模式")
+        regions_map = region_provider.get_regions_bulk(accounts)
         for account_id in accounts:
-            regions = region_provider.get_regions(account_id)
-        
-        # 如果账号没有 EC2 Region，至少添加一个默认 Region 用于全局服务采集
-        # 全局服务（Route53, CloudFront）使用 us-east-1
-        if not regions:
-            logger.warning(f"[采集] 账号 {account_id} 没有 EC2 Region，将只采集全局服务（使用 us-east-1）")
-            regions = ['us-east-1']  # 至少有一个 Region 用于全局服务采集
-        
-        # 获取账号凭证（如果 credential_provider 存在）
-        credentials = None
-        if credential_provider:
-            try:
-                credentials = credential_provider.get_credentials(account_id)
-                if credentials:
-                    logger.debug(f"[采集] 账号 {account_id} 使用指定凭证")
-                else:
-                    logger.debug(f"[采集] 账号 {account_id} 使用默认凭证链")
-            except Exception as e:
-                logger.warning(f"[采集] 获取账号 {account_id} 的凭证失败: {e}，使用默认凭证链")
-                credentials = None
-        
-        for region in regions:
-            logger.info(f"\n[采集] 处理账号: {account_id}, 区域: {region}")
-            
-            try:
-                # 初始化 Service Quotas 客户端（Limit 采集需要）
-                # 注意：区域型服务使用当前 region，全局服务使用 us-east-1
-                sq_client = None
-                if collect_limit:
-                    # 对于区域型服务，region 已经是 EC2 使用的 Region
-                    # 对于全局服务，使用 us-east-1
-                    # 这里先初始化，后续根据服务类型选择 region
-                    logger.info(f"[采集] 初始化 AWS Service Quotas 客户端 (region: {region})...")
-                    if credentials:
-                        sq_client = ServiceQuotasClient(
-                            region=region,
-                            access_key=credentials.get('access_key'),
-                            secret_key=credentials.get('secret_key')
-                        )
-                    else:
-                        sq_client = ServiceQuotasClient(region=region)
-                    logger.info("[采集] 客户端初始化成功")
-                
-                # 收集 usage 数据（service-level）
-                if collect_usage:
-                    # 全局服务列表（固定 Region）
-                    global_services = ['route53', 'cloudfront']
-                    # 区域型服务列表（只在 EC2 使用的 Region 采集）
-                    regional_services = ['ec2', 'ebs', 'elasticloadbalancing', 'eks', 'elasticache', 'sagemaker']
-                    
-                    for service in ['ec2', 'ebs', 'elasticloadbalancing', 'eks', 'elasticache', 'route53', 'cloudfront', 'sagemaker']:
-                        if service in quota_config.aws and service in usage_collectors:
-                            try:
-                                logger.info(f"[采集] 收集 {service} usage 数据...")
-                                collector = usage_collectors[service]
-                                
-                                # 全局服务固定 Region（Route53/CloudFront → us-east-1）
-                                if service in global_services:
-                                    usage_region = 'us-east-1'
-                                    metrics_region = 'us-east-1'
-                                # 区域型服务只在 EC2 使用的 Region 采集（region 已经是 EC2 使用的 Region）
-                                else:
-                                    usage_region = region
-                                    metrics_region = region
-                                
-                                # 传递凭证给 collector（如果存在）
-                                if credentials:
-                                    usage_data = collector.collect_usage(
-                                        account_id=account_id, 
-                                        region=usage_region,
-                                        access_key=credentials.get('access_key'),
-                                        secret_key=credentials.get('secret_key')
-                                    )
-                                else:
-                                    usage_data = collector.collect_usage(account_id=account_id, region=usage_region)
-                                
-                                if usage_data:
-                                    
-                                    quota_collector.set_usage_data(
-                                        account_id=account_id,
-                                        region=metrics_region,
-                                        service=service,
-                                        usage_data=usage_data
-                                    )
-                                    logger.info(f"[采集] {service} usage 数据已设置: {len(usage_data)} 个配额")
-                                else:
-                                    logger.warning(f"[采集] {service} usage 数据为空")
-                            except Exception as e:
-                                logger.error(f"[采集] 收集 {service} usage 失败: {e}", exc_info=True)
-                
-                # 采集 Limit 数据
-                if collect_limit and sq_client:
-                    # 遍历所有服务的配额
-                    for service, service_config in quota_config.aws.items():
-                        # 全局服务列表（固定 Region）
-                        global_services = ['route53', 'cloudfront']
-                        # 区域型服务列表（只在 EC2 使用的 Region 采集）
-                        regional_services = ['ec2', 'ebs', 'elasticloadbalancing', 'eks', 'elasticache', 'sagemaker']
-                        
-                        # 确定该服务使用的 region
-                        # 全局服务固定 us-east-1，区域型服务使用当前 region（已经是 EC2 使用的 Region）
-                        if service in global_services:
-                            service_region = 'us-east-1'
-                        else:
-                            service_region = region
-                        
-                        # 如果 region 不匹配，需要重新初始化客户端（全局服务）
-                        if service in global_services and region != 'us-east-1':
-                            if credentials:
-                                sq_client = ServiceQuotasClient(
-                                    region='us-east-1',
-                                    access_key=credentials.get('access_key'),
-                                    secret_key=credentials.get('secret_key')
-                                )
-                            else:
-                                sq_client = ServiceQuotasClient(region='us-east-1')
-                        
-                        # 处理 Discovery 模式（如 SageMaker）
-                        if isinstance(service_config, dict) and 'discovery' in service_config:
-                            discovery_config = service_config['discovery']
-                            if discovery_config.enabled:
-                                logger.info(f"[采集] 服务 {service} 使用 Discovery 模式，区域: {service_region}")
-                                
-                                try:
-                                    # 初始化 Discovery（使用当前 region 的客户端）
-                                    # 对于区域型服务，需要确保使用正确的 region
-                                    if service in regional_services and service_region != sq_client.region:
-                                        # 重新初始化客户端到正确的 region
-                                        if credentials:
-                                            sq_client = ServiceQuotasClient(
-                                                region=service_region,
-                                                access_key=credentials.get('access_key'),
-                                                secret_key=credentials.get('secret_key')
-                                            )
-                                        else:
-                                            sq_client = ServiceQuotasClient(region=service_region)
-                                    
-                                    discovery = SageMakerDiscovery(sq_client, discovery_config)
-                                    
-                                    # 发现匹配的配额
-                                    discovered_quotas = discovery.discover_quotas(service_region)
-                                    
-                                    if discovered_quotas:
-                                        logger.info(f"[采集] 服务 {service} 发现 {len(discovered_quotas)} 个匹配的配额")
-                                        
-                                        # 对每个发现的配额获取 Limit 值
-                                        for quota_item in discovered_quotas:
-                                            quota_code = quota_item.quota_code
-                                            quota_name = quota_item.quota_name
-                                            
-                                            try:
-                                                # 添加延迟，避免 API 限流（增加到0.1秒，减少限流）
-                                                time.sleep(0.1)
-                                                
-                                                # 调用 GetServiceQuota API 获取 Limit（带重试）
-                                                max_retries = 3
-                                                retry_count = 0
-                                                quota_info = None
-                                                
-                                                while retry_count < max_retries:
-                                                    try:
-                                                        quota_info = sq_client.get_service_quota(
-                                                            service_code=service,
-                                                            quota_code=quota_code
-                                                        )
-                                                        break  # 成功，退出重试循环
-                                                    except Exception as api_error:
-                                                        error_msg = str(api_error)
-                                                        if 'TooManyRequestsException' in error_msg and retry_count < max_retries - 1:
-                                                            # API 限流，等待后重试（指数退避）
-                                                            wait_time = (2 ** retry_count) * 2  # 2, 4, 8 秒
-                                                            logger.warning(f"[采集] API 限流，等待 {wait_time} 秒后重试... (配额: {quota_code})")
-                                                            time.sleep(wait_time)
-                                                            retry_count += 1
-                                                        else:
-                                                            raise  # 其他错误或达到最大重试次数，抛出异常
-                                                
-                                                if quota_info:
-                                                    limit_value = quota_info.get('value', 0.0)
-                                                    
-                                                    # 创建成功结果（包含 account_id 和 region）
-                                                    quota_info_with_context = quota_info.copy()
-                                                    quota_info_with_context['account_id'] = account_id
-                                                    quota_info_with_context['region'] = service_region
-                                                    
-                                                    result = QuotaResult(
-                                                        service=service,
-                                                        quota_code=quota_code,
-                                                        quota_name=quota_name,
-                                                        status=QuotaStatus.SUCCESS,
-                                                        quota_info=quota_info_with_context,
-                                                        account_id=account_id,
-                                                        region=service_region
-                                                    )
-                                                    all_results.append(result)
-                                                    
-                                                    logger.debug(f"[采集] 配额 {quota_code}: Limit = {limit_value}")
-                                                else:
-                                                    logger.warning(f"[采集] 配额 {quota_code}: 返回值为空")
-                                                    
-                                                    # 创建失败结果
-                                                    result = QuotaResult(
-                                                        service=service,
-                                                        quota_code=quota_code,
-                                                        quota_name=quota_name,
-                                                        status=QuotaStatus.FAILED,
-                                                        reason='empty_response',
-                                                        error='API returned empty response',
-                                                        account_id=account_id,
-                                                        region=service_region
-                                                    )
-                                                    all_results.append(result)
-                                                    
-                                            except Exception as e:
-                                                error_msg = str(e)
-                                                logger.error(f"[采集] 配额 {quota_code}: {error_msg}")
-                                                
-                                                # 创建失败结果
-                                                reason = 'api_error'
-                                                if 'NoSuchResourceException' in error_msg:
-                                                    reason = 'quota_not_found'
-                                                elif 'AccessDeniedException' in error_msg:
-                                                    reason = 'permission_denied'
-                                                
-                                                result = QuotaResult(
-                                                    service=service,
-                                                    quota_code=quota_code,
-                                                    quota_name=quota_name,
-                                                    status=QuotaStatus.FAILED,
-                                                    reason=reason,
-                                                    error=error_msg,
-                                                    account_id=account_id,
-                                                    region=service_region
-                                                )
-                                                all_results.append(result)
-                                    else:
-                                        logger.warning(f"[采集] 服务 {service} 未发现匹配的配额")
-                                        
-                                except Exception as e:
-                                    logger.error(f"[采集] 服务 {service} Discovery 失败: {e}", exc_info=True)
-                                    # Discovery 失败不影响其他服务，继续处理下一个服务
-                                
-                                # Discovery 模式处理完成，继续下一个服务
-                                continue
-                        
-                        # CloudFront 特殊处理：配额不在 Service Quotas API 中，使用硬编码的默认值
-                        if service == 'cloudfront':
-                            logger.info(f"[采集] 服务 {service} 使用硬编码 Limit 值（配额不在 Service Quotas API 中）")
-                            
-                            # CloudFront 的默认配额限制值（AWS 标准默认值）
-                            cloudfront_default_limits = {
-                                'L-24B04930': 200.0,  # Web distributions per AWS account
-                                'L-7D134442': 20.0,   # Cache policies per AWS account
-                                'L-CF0D4FC5': 20.0,   # Response headers policies
-                                'L-08884E5C': 100.0   # Origin access identities per account
-                            }
-                            
-                            # 处理声明型配额
-                            quotas = service_config
-                            if not isinstance(quotas, list):
-                                continue
-                            
-                            # 为每个 CloudFront 配额创建带有硬编码 Limit 值的结果
-                            for quota in quotas:
-                                quota_code = quota.quota_code
-                                quota_name = quota.quota_name
-                                
-                                # 获取硬编码的默认值
-                                default_limit = cloudfront_default_limits.get(quota_code)
-                                
-                                if default_limit is not None:
-                                    # 创建成功结果（使用硬编码的 Limit 值）
-                                    quota_info_with_context = {
-                                        'quota_code': quota_code,
-                                        'quota_name': quota_name,
-                                        'value': default_limit,
-                                        'account_id': account_id,
-                                        'region': service_region
-                                    }
-                                    
-                                    result = QuotaResult(
-                                        service=service,
-                                        quota_code=quota_code,
-                                        quota_name=quota_name,
-                                        status=QuotaStatus.SUCCESS,
-                                        quota_info=quota_info_with_context,
-                                        account_id=account_id,
-                                        region=service_region
-                                    )
-                                    all_results.append(result)
-                                    
-                                    logger.debug(f"[采集] CloudFront 配额 {quota_code}: Limit = {default_limit} (硬编码默认值)")
-                                else:
-                                    logger.warning(f"[采集] CloudFront 配额 {quota_code}: 未找到默认值，跳过")
-                            
-                            # CloudFront 处理完成，继续下一个服务
-                            continue
-                        
-                        # Route53 特殊处理已移除
-                        # L-4EA4796A (Hosted zones per account) 和 L-F767CB15 (Domain count limit) 都在 Service Quotas API 中
-                        # 应该通过正常的 Service Quotas API 流程获取
-                        
-                        # 处理声明型配额
-                        quotas = service_config
-                        if not isinstance(quotas, list):
-                            continue
-                        
-                        logger.debug(f"[采集] 服务: {service}, 配额数量: {len(quotas)}, region: {service_region}")
-                        
-                        for quota in quotas:
-                            quota_code = quota.quota_code
-                            quota_name = quota.quota_name
-                            
-                            try:
-                                # 添加延迟，避免 API 限流（增加到0.1秒，减少限流）
-                                time.sleep(0.1)
-                                
-                                # 调用 GetServiceQuota API（带重试）
-                                max_retries = 3
-                                retry_count = 0
-                                quota_info = None
-                                
-                                while retry_count < max_retries:
-                                    try:
-                                        quota_info = sq_client.get_service_quota(
-                                            service_code=service,
-                                            quota_code=quota_code
-                                        )
-                                        break  # 成功，退出重试循环
-                                    except Exception as api_error:
-                                        error_msg = str(api_error)
-                                        if 'TooManyRequestsException' in error_msg and retry_count < max_retries - 1:
-                                            # API 限流，等待后重试（指数退避）
-                                            wait_time = (2 ** retry_count) * 2  # 2, 4, 8 秒
-                                            logger.warning(f"[采集] API 限流，等待 {wait_time} 秒后重试... (配额: {quota_code})")
-                                            time.sleep(wait_time)
-                                            retry_count += 1
-                                        else:
-                                            raise  # 其他错误或达到最大重试次数，抛出异常
-                                
-                                if quota_info:
-                                    limit_value = quota_info.get('value', 0.0)
-                                    
-                                    # 创建成功结果（包含 account_id 和 region）
-                                    quota_info_with_context = quota_info.copy()
-                                    quota_info_with_context['account_id'] = account_id
-                                    quota_info_with_context['region'] = service_region  # 使用正确的 region
-                                    
-                                    result = QuotaResult(
-                                        service=service,
-                                        quota_code=quota_code,
-                                        quota_name=quota_name,
-                                        status=QuotaStatus.SUCCESS,
-                                        quota_info=quota_info_with_context,
-                                        account_id=account_id,
-                                        region=service_region  # 使用正确的 region
-                                    )
-                                    all_results.append(result)
-                                    
-                                    logger.debug(f"[采集] 配额 {quota_code}: Limit = {limit_value}")
-                                else:
-                                    logger.warning(f"[采集] 配额 {quota_code}: 返回值为空")
-                                    
-                                    # 创建失败结果
-                                    result = QuotaResult(
-                                        service=service,
-                                        quota_code=quota_code,
-                                        quota_name=quota_name,
-                                        status=QuotaStatus.FAILED,
-                                        reason='empty_response',
-                                        error='API returned empty response',
-                                        account_id=account_id,
-                                        region=region
-                                    )
-                                    all_results.append(result)
-                                    
-                            except Exception as e:
-                                error_msg = str(e)
-                                logger.error(f"[采集] 配额 {quota_code}: {error_msg}")
-                                
-                                # 创建失败结果
-                                reason = 'api_error'
-                                if 'NoSuchResourceException' in error_msg:
-                                    reason = 'quota_not_found'
-                                elif 'AccessDeniedException' in error_msg:
-                                    reason = 'permission_denied'
-                                
-                                result = QuotaResult(
-                                    service=service,
-                                    quota_code=quota_code,
-                                    quota_name=quota_name,
-                                    status=QuotaStatus.FAILED,
-                                    reason=reason,
-                                    error=error_msg,
-                                    account_id=account_id,
-                                    region=region
-                                )
-                                all_results.append(result)
-                
-            except Exception as e:
-                logger.error(f"[采集] 处理账号 {account_id} 区域 {region} 时发生错误: {e}", exc_info=True)
-                continue
+            per_account_results.append(_collect_account_quotas(
+                account_id=account_id,
+                quota_config=quota_config,
+                region_provider=region_provider,
+                usage_collectors=usage_collectors,
+                credential_provider=credential_provider,
+                collect_limit=collect_limit,
+                collect_usage=collect_usage,
+                quota_limit_cache=quota_limit_cache,
+                regions=regions_map.get(account_id),
+                service_sets=service_sets
+            ))
+    
+    # 一次性合并，并分离 Limit 结果和 Usage 数据
+    usage_data_list = []  # 存储所有账号的 Usage 数据
+    # 每个配额一次迭代，预先绑定 append 避免循环内重复查找属性
+    append_result = all_results.append
+    append_usage = usage_data_list.append
+    # 合并时顺便记录本轮实际采集到 CloudFront Usage 的账号，供 Limit 之后的重新设置使用
+    cloudfront_accounts: Set[str] = set()
+    for item in itertools.chain.from_iterable(per_account_results):
+        if isinstance(item, QuotaResult):
+            append_result(item)
+        elif isinstance(item, dict) and item.get('type') == 'usage_data':
+            append_usage(item)
+            if item['service'] == 'cloudfront':
+                cloudfront_accounts.add(item['account_id'])
+    
+    # 统一设置所有账号的 Usage 数据
+    if collect_usage and usage_data_list:
+        logger.info("[采集] 开始设置 Usage 数据（共 %s 个服务）", len(usage_data_list))
+        quota_collector.set_usage_batch(usage_data_list)
     
     # 将所有结果添加到收集器
     if all_results:
-        logger.debug(f"[采集] 添加 {len(all_results)} 个采集结果到收集器")
+        logger.debug("[采集] 添加 %s 个采集结果到收集器", len(all_results))
         quota_collector.collect_all(all_results)
     
     # 在 Limit 采集之后，再次为 CloudFront 设置 Usage 数据
     # 因为 CloudFront 的 skipped 结果是在 Limit 采集阶段创建的，此时才能正确设置 Usage 指标
     # 使用已经采集并存储的 usage_data，而不是重新采集
-    has_cloudfront_config = hasattr(quota_config, 'aws') and 'cloudfront' in quota_config.aws
-    has_cloudfront_collector = 'cloudfront' in usage_collectors
-    logger.debug(f"[采集] CloudFront 重新设置检查: collect_usage={collect_usage}, has_config={has_cloudfront_config}, has_collector={has_cloudfront_collector}")
-    if collect_usage and has_cloudfront_config and has_cloudfront_collector:
-        logger.info(f"[采集] 开始重新设置 CloudFront Usage（使用已采集的数据），账号数量: {len(accounts)}")
+    # 只遍历合并阶段记录到的 CloudFront 账号，不再逐个扫描全部账号
+    if collect_usage and cloudfront_accounts:
+        logger.info("[采集] 开始重新设置 CloudFront Usage（使用已采集的数据），账号数量: %s", len(cloudfront_accounts))
         cloudfront_region = 'us-east-1'
-        for account_id in accounts:
+        for account_id in cloudfront_accounts:
             try:
                 # 从已存储的 usage_data 中获取 CloudFront 数据
                 usage_key = (account_id, cloudfront_region, 'cloudfront')
@@ -1363,16 +1259,43 @@ def collect_quotas(
                         service='cloudfront',
                         usage_data=usage_data
                     )
-                    logger.info(f"[采集] CloudFront usage 数据已重新设置: {len(usage_data)} 个配额（账号: {account_id}，在 Limit 采集之后）")
+                    logger.info("[采集] CloudFront usage 数据已重新设置: %s 个配额（账号: %s，在 Limit 采集之后）", len(usage_data), account_id)
                 else:
-                    logger.warning(f"[采集] 账号 {account_id} 的 CloudFront usage 数据未找到，可能尚未采集")
+                    logger.warning("[采集] 账号 %s 的 CloudFront usage 数据未找到，可能尚未采集", account_id)
             except Exception as e:
-                logger.error(f"[采集] 重新设置 CloudFront usage 失败（账号: {account_id}）: {e}", exc_info=True)
+                logger.error("[采集] 重新设置 CloudFront usage 失败（账号: %s）: %s", account_id, e, exc_info=True)
     
     # 获取汇总信息
     summary = quota_collector.get_summary()
     
-    logger.info(f"[采集] 采集完成: 总计={summary['total']}, 成功={summary['success']}, 跳过={summary['skipped']}, 失败={summary['failed']}")
+    logger.info("[采集] 采集完成: 总计=%s, 成功=%s, 跳过=%s, 失败=%s", summary['total'], summary['success'], summary['skipped'], summary['failed'])
+
+
+def _pick_port(base_port: int, attempts: int = 10) -> int:
+    """
+    从 base_port 开始找到第一个可绑定的端口（直接尝试 bind，不做连接探测）
+    
+    Args:
+        base_port: 首选端口
+        attempts: 最多尝试的端口数
+    
+    Returns:
+        可用端口（全部被占用时返回 base_port，由服务器启动时报错）
+    """
+    for port in range(base_port, base_port + attempts):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                sock.bind(('0.0.0.0', port))
+            except OSError as e:
+                if e.errno != errno.EADDRINUSE:
+                    raise
+                logger.warning(f"端口 {port} 已被占用，尝试端口 {port + 1}")
+                continue
+        return port
+    
+    logger.error(f"端口 {base_port}-{base_port + attempts - 1} 均被占用")
+    return base_port
 
 
 def main():
@@ -1545,6 +1468,11 @@ def main():
         'sagemaker': SageMakerUsageCollector(cache=usage_cache)
     }
     
+    # 预先计算需要采集 usage 的服务（避免每个 account/region 重复做字典查找）
+    usage_services = quota_config.aws.keys() & usage_collectors.keys()
+    quota_config.effective_usage_services = tuple(s for s in _ORDERED_USAGE_SERVICES if s in usage_services)
+    logger.info(f"Usage 采集服务: {list(quota_config.effective_usage_services)}")
+    
     # Phase 4: 执行初始采集
     logger.info("=" * 60)
     logger.info("执行初始采集")
@@ -1567,26 +1495,29 @@ def main():
         # 获取汇总信息
         summary = quota_collector.get_summary()
         
-        # 打印详细汇总
-        print(f"\n{'=' * 60}")
-        print("配额采集汇总")
-        print(f"{'=' * 60}")
-        print(f"总配额数: {summary['total']}")
-        print(f"成功: {summary['success']}")
-        print(f"跳过: {summary['skipped']}")
-        print(f"失败: {summary['failed']}")
+        # 打印详细汇总（先拼好所有行再一次性输出，避免与日志输出交错）
+        lines = [
+            f"\n{'=' * 60}",
+            "配额采集汇总",
+            f"{'=' * 60}",
+            f"总配额数: {summary['total']}",
+            f"成功: {summary['success']}",
+            f"跳过: {summary['skipped']}",
+            f"失败: {summary['failed']}",
+        ]
         
         if summary['by_service']:
-            print(f"\n按服务统计:")
+            lines.append(f"\n按服务统计:")
             for svc, stats in summary['by_service'].items():
-                print(f"  {svc}: 成功={stats['success']}, 跳过={stats['skipped']}, 失败={stats['failed']}")
+                lines.append(f"  {svc}: 成功={stats['success']}, 跳过={stats['skipped']}, 失败={stats['failed']}")
         
         if summary['skip_reasons']:
-            print(f"\n跳过原因统计:")
+            lines.append(f"\n跳过原因统计:")
             for reason, count in summary['skip_reasons'].items():
-                print(f"  {reason}: {count}")
+                lines.append(f"  {reason}: {count}")
         
-        print(f"{'=' * 60}")
+        lines.append(f"{'=' * 60}")
+        print("\n".join(lines))
         
         # 同时记录到日志
         logger.info(f"配额采集完成: 总计={summary['total']}, 成功={summary['success']}, 跳过={summary['skipped']}, 失败={summary['failed']}")
@@ -1630,61 +1561,27 @@ def main():
     # 启动 Flask 服务器
     port = 8000  # 默认端口，可以从配置文件读取
     
-    # 检查端口是否被占用
-    import socket
-    import subprocess
-    
-    def is_port_in_use(port):
-        """检查端口是否被占用"""
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        result = sock.connect_ex(('127.0.0.1', port))
-        sock.close()
-        return result == 0
-    
-    def try_kill_port(port):
-        """尝试清理占用端口的进程"""
-        try:
-            # 查找占用端口的进程
-            pid = subprocess.check_output(
-                ['lsof', '-ti', f':{port}'],
-                stderr=subprocess.DEVNULL
-            ).decode('utf-8').strip()
-            
-            if pid:
-                # 尝试停止进程
-                subprocess.run(['kill', '-9', pid], 
-                             stderr=subprocess.DEVNULL, 
-                             stdout=subprocess.DEVNULL)
-                logger.info(f"已清理占用端口 {port} 的进程 (PID: {pid})")
-                # 等待一下让端口释放
-                import time
-                time.sleep(0.5)
-                return True
-        except:
-            pass
-        return False
-    
-    # 如果默认端口被占用，先尝试清理
-    if is_port_in_use(port):
-        logger.warning(f"端口 {port} 已被占用，尝试清理旧进程...")
-        if try_kill_port(port):
-            # 再次检查端口是否释放
-            if is_port_in_use(port):
-                logger.warning(f"端口 {port} 清理后仍被占用，使用端口 {port + 1}")
-                port = port + 1
-            else:
-                logger.info(f"端口 {port} 已释放，使用默认端口")
-        else:
-            logger.warning(f"无法清理占用端口 {port} 的进程，使用端口 {port + 1}")
-            port = port + 1
+    # 默认端口被占用时（如旧进程未退出）依次尝试后续端口，旧进程由 restart/stop 脚本负责清理
+    port = _pick_port(port)
     
     logger.info(f"\nStarting HTTP server on port {port}")
-    print(f"\n{'=' * 60}")
-    print(f"Exporter 已启动")
-    print(f"访问 http://localhost:{port}/metrics 查看指标")
-    print(f"访问 http://localhost:{port}/health 查看健康状态")
-    print(f"{'=' * 60}\n")
-    app.run(host='0.0.0.0', port=port, debug=False)
+    print("\n".join([
+        f"\n{'=' * 60}",
+        f"Exporter 已启动",
+        f"访问 http://localhost:{port}/metrics 查看指标",
+        f"访问 http://localhost:{port}/health 查看健康状态",
+        f"{'=' * 60}\n",
+    ]))
+    
+    host = os.getenv('FLASK_HOST', '0.0.0.0')
+    threads = int(os.getenv('HTTP_SERVER_THREADS', '16'))  # 默认 16 个工作线程（手动触发采集会长时间占用线程）
+    
+    if WAITRESS_AVAILABLE:
+        # waitress 使用线程池处理请求，并发抓取 /metrics 和手动触发互不阻塞
+        logger.info(f"使用 waitress WSGI 服务器（{threads} 个工作线程）")
+        serve(app, host=host, port=port, threads=threads)
+    else:
+        app.run(host=host, port=port, debug=False, threaded=True)
 
 
 if __name__ == '__main__':
@@ -35,6 +35,8 @@ class SageMakerDiscovery:
         """
         self.client = service_quotas_client
         self.config = discovery_config
+        # 最近一次 ListServiceQuotas 返回的配额（quota_code → 配额详情），供调用方直接读取 Limit
+        self.listed_quotas: Dict[str, Dict] = {}
     
     def discover_quotas(self, region: str) -> List[QuotaItem]:
         """
@@ -46,24 +48,26 @@ class SageMakerDiscovery:
         Returns:
             匹配的 QuotaItem 列表
         """
-        logger.debug(f"[SageMaker Discovery] 开始发现配额，区域: {region}")
-        logger.debug(f"[SageMaker Discovery] 匹配规则: {self.config.match_rules}")
+        logger.debug("[SageMaker Discovery] 开始发现配额，区域: %s", region)
+        logger.debug("[SageMaker Discovery] 匹配规则: %s", self.config.match_rules)
         
         try:
             # 调用 Service Quotas API 获取所有 SageMaker 配额
-            logger.debug(f"[SageMaker Discovery] 调用 ListServiceQuotas(serviceCode='sagemaker', region='{region}')")
+            logger.debug("[SageMaker Discovery] 调用 ListServiceQuotas(serviceCode='sagemaker', region='%s')", region)
             all_quotas = self.client.list_service_quotas(service_code="sagemaker")
+            self.listed_quotas = {q['quota_code']: q for q in all_quotas}
             
-            logger.debug(f"[SageMaker Discovery] API 返回 {len(all_quotas)} 个配额，开始匹配...")
+            logger.debug("[SageMaker Discovery] API 返回 %s 个配额，开始匹配...", len(all_quotas))
             
-            # 应用匹配规则
+            # 应用匹配规则（逐配额的调试日志只在 DEBUG 开启时输出，循环前判断一次）
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
             matched_quotas = []
             for quota in all_quotas:
                 quota_name = quota.get('quota_name', '')
-                logger.debug(f"[SageMaker Discovery] 检查配额: {quota_name}")
                 
                 if self._matches_rules(quota_name):
-                    logger.debug(f"[SageMaker Discovery] ✓ 配额匹配: {quota_name}")
+                    if debug_enabled:
+                        logger.debug("[SageMaker Discovery] ✓ 配额匹配: %s", quota_name)
                     quota_item = QuotaItem(
                         quota_code=quota.get('quota_code', ''),
                         quota_name=quota_name,
@@ -71,23 +75,23 @@ class SageMakerDiscovery:
                         priority=self.config.default_priority
                     )
                     matched_quotas.append(quota_item)
-                    logger.debug(f"[SageMaker Discovery]   配额代码: {quota_item.quota_code}")
-                    logger.debug(f"[SageMaker Discovery]   优先级: {quota_item.priority}")
-                else:
-                    logger.debug(f"[SageMaker Discovery] ✗ 配额不匹配: {quota_name}")
+                    if debug_enabled:
+                        logger.debug("[SageMaker Discovery]   配额代码: %s, 优先级: %s", quota_item.quota_code, quota_item.priority)
+                elif debug_enabled:
+                    logger.debug("[SageMaker Discovery] ✗ 配额不匹配: %s", quota_name)
             
-            logger.info(f"[SageMaker Discovery] 区域 {region}: 发现 {len(matched_quotas)} 个匹配的配额")
+            logger.info("[SageMaker Discovery] 区域 %s: 发现 %s 个匹配的配额", region, len(matched_quotas))
             
             # 详细输出每个匹配的配额
             if matched_quotas:
-                logger.info(f"[SageMaker Discovery] 匹配的配额列表:")
+                logger.info("[SageMaker Discovery] 匹配的配额列表:")
                 for idx, quota in enumerate(matched_quotas, 1):
-                    logger.info(f"  {idx}. {quota.quota_code}: {quota.quota_name}")
+                    logger.info("  %s. %s: %s", idx, quota.quota_code, quota.quota_name)
             
             return matched_quotas
             
         except Exception as e:
-            logger.error(f"[SageMaker Discovery] 发现失败，区域 {region}: {e}", exc_info=True)
+            logger.error("[SageMaker Discovery] 发现失败，区域 %s: %s", region, e, exc_info=True)
             # Discovery 失败不影响其他服务
             return []
     
@@ -103,21 +107,11 @@ class SageMakerDiscovery:
         """
         quota_name_lower = quota_name.lower()
         
-        for rule_idx, rule in enumerate(self.config.match_rules, 1):
-            if 'name_contains' in rule:
-                keywords = rule['name_contains']
-                logger.debug(f"[SageMaker Discovery] 规则 {rule_idx}: 检查关键词 {keywords}")
-                
-                # 检查配额名称是否包含所有关键词
-                matches = all(keyword.lower() in quota_name_lower for keyword in keywords)
-                if matches:
-                    logger.debug(f"[SageMaker Discovery] 规则 {rule_idx}: ✓ 匹配成功")
-                    return True
-                else:
-                    logger.debug(f"[SageMaker Discovery] 规则 {rule_idx}: ✗ 不匹配")
-        
-        return False
-
+        # 关键词已在 DiscoveryConfig 中预先转为小写：任一规则的关键词全部包含即为匹配
+        return any(
+            all(keyword in quota_name_lower for keyword in keywords)
+            for keywords in self.config.name_keywords
+        )
 
 def create_quota_items_from_discovery(discovered_quotas: List[Dict], discovery_config: DiscoveryConfig) -> List[QuotaItem]:
     """
@@ -10,12 +10,33 @@ AWS Service Quotas API 客户端模块
 
 import boto3
 import logging
-import time
+import os
+import threading
+from botocore.config import Config
 from botocore.exceptions import ClientError, BotoCoreError
-from typing import Dict, Optional
+from retry.client_config import AWS_CLIENT_CONFIG
+from typing import Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# 采集为 I/O 密集型（HTTPS 调用），默认账号并发数按 CPU 核数放大，上限 32
+DEFAULT_COLLECTION_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# 连接池大小至少覆盖共享同一 client 的并发线程数，避免 urllib3 连接池被丢弃重建
+_MAX_POOL_CONNECTIONS = max(
+    10,
+    int(os.getenv('COLLECTION_MAX_WORKERS', str(DEFAULT_COLLECTION_MAX_WORKERS))),
+    int(os.getenv('QUOTA_FETCH_CONCURRENCY', '10'))
+)
+
+# 在共用的 adaptive 重试配置基础上，按并发线程数放大连接池
+_CLIENT_CONFIG = AWS_CLIENT_CONFIG.merge(Config(max_pool_connections=_MAX_POOL_CONNECTIONS))
+
+# 按 (access_key, secret_key, region) 复用 boto3 client（同一 access_key 轮换 secret 后会新建 client）
+# 创建好的 client 是线程安全的；每个 client 使用独立的 Session，锁只保护缓存字典
+_client_cache: Dict[Tuple[Optional[str], Optional[str], str], object] = {}
+_client_cache_lock = threading.Lock()
+
 
 class ServiceQuotasClient:
     """
@@ -31,6 +52,9 @@ class ServiceQuotasClient:
         """
         初始化 Service Quotas 客户端
         
+        同一 (access_key, secret_key, region) 复用同一个底层 boto3 client（共享连接池与 keep-alive），
+        避免每次构造都重新解析 endpoint / 凭证。
+        
         Args:
             region: AWS 区域（默认 us-east-1）
             access_key: AWS Access Key（可选，如果提供则使用指定凭证）
@@ -38,18 +62,30 @@ class ServiceQuotasClient:
         """
         self.region = region
         try:
-            # 如果提供了 access_key 和 secret_key，使用指定凭证
             if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key,
-                    aws_secret_access_key=secret_key
-                )
-                self.client = session.client('service-quotas', region_name=region)
-                logger.debug(f"Service Quotas 客户端初始化成功（使用指定凭证），区域: {region}")
+                cache_key = (access_key, secret_key, region)
             else:
-                # 使用默认凭证链（环境变量、配置文件、IAM 角色等）
-                self.client = boto3.client('service-quotas', region_name=region)
-                logger.debug(f"Service Quotas 客户端初始化成功（使用默认凭证链），区域: {region}")
+                cache_key = (None, None, region)
+            with _client_cache_lock:
+                client = _client_cache.get(cache_key)
+            if client is None:
+                # 在锁外创建 client，不同账号的初始化互不阻塞；
+                # 每组凭证使用新建的 Session，凭证只属于这个 client，不会被其他账号的 client 共用
+                if access_key and secret_key:
+                    session = boto3.Session(
+                        aws_access_key_id=access_key,
+                        aws_secret_access_key=secret_key
+                    )
+                    logger.debug(f"Service Quotas 客户端初始化成功（使用指定凭证），区域: {region}")
+                else:
+                    # 使用默认凭证链（环境变量、配置文件、IAM 角色等）
+                    session = boto3.Session()
+                    logger.debug(f"Service Quotas 客户端初始化成功（使用默认凭证链），区域: {region}")
+                client = session.client('service-quotas', region_name=region, config=_CLIENT_CONFIG)
+                with _client_cache_lock:
+                    # 并发创建时以先写入的为准
+                    client = _client_cache.setdefault(cache_key, client)
+            self.client = client
         except Exception as e:
             logger.error(f"初始化 Service Quotas 客户端失败: {e}")
             raise
@@ -102,11 +138,8 @@ class ServiceQuotasClient:
             elif error_code == 'AccessDeniedException':
                 logger.error(f"权限不足: service_code={service_code}, quota_code={quota_code}, region={self.region}")
             elif error_code == 'TooManyRequestsException':
-                # API 限流，需要等待后重试
-                logger.warning(f"API 限流: service_code={service_code}, quota_code={quota_code}, region={self.region}，等待后重试...")
-                # 等待 2 秒后重试（指数退避）
-                time.sleep(2)
-                # 重新抛出异常，让调用者处理重试
+                # botocore adaptive 重试已耗尽，直接抛出让调用者处理
+                logger.warning(f"API 限流（重试已耗尽）: service_code={service_code}, quota_code={quota_code}, region={self.region}")
                 raise
             else:
                 logger.error(f"获取配额失败: service_code={service_code}, quota_code={quota_code}, region={self.region}, error={error_code}: {error_message}")
@@ -127,9 +160,8 @@ class ServiceQuotasClient:
             service_code: 服务代码（如 'ec2'）
         
         Returns:
-            配额列表，每个配额包含 quota_code, quota_name, value 等字段
-        
-        TODO: 当前阶段未使用，保留接口供后续使用
+            配额列表，每个配额包含与 get_service_quota 相同的字段
+            （quota_code, quota_name, value, unit, adjustable, global_quota）
         """
         quotas = []
         try:
@@ -141,7 +173,9 @@ class ServiceQuotasClient:
                         'quota_code': quota.get('QuotaCode', ''),
                         'quota_name': quota.get('QuotaName', ''),
                         'value': quota.get('Value', 0.0),
-                        'unit': quota.get('Unit', '')
+                        'unit': quota.get('Unit', ''),
+                        'adjustable': quota.get('Adjustable', False),
+                        'global_quota': quota.get('GlobalQuota', False)
                     })
             
             logger.debug(f"列出配额成功: service_code={service_code}, 共 {len(quotas)} 个配额")
@@ -150,4 +184,18 @@ class ServiceQuotasClient:
         except Exception as e:
             logger.error(f"列出配额失败: service_code={service_code}, region={self.region}, error={e}")
             raise
-
+    
+    def list_service_quotas_map(self, service_code: str) -> Dict[str, Dict]:
+        """
+        列出指定服务的所有配额，并按 quota_code 建立索引
+        
+        一次分页调用即可覆盖该服务下所有声明的配额，调用方按 quota_code 查表，
+        只有表中不存在的配额（部分配额只能单独查询）才需要回退到 GetServiceQuota。
+        
+        Args:
+            service_code: 服务代码（如 'ec2'）
+        
+        Returns:
+            quota_code → 配额详情的字典（字段同 list_service_quotas）
+        """
+        return {quota['quota_code']: quota for quota in self.list_service_quotas(service_code)}
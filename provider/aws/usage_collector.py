@@ -8,12 +8,15 @@ Usage Collector 接口和实现
 - 使用缓存避免重复 API 调用
 """
 
+import os
 import logging
-import math
-import boto3
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
-from cache.cache import MemoryCache
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from botocore.exceptions import ClientError, BotoCoreError
+from cache.cache import MemoryCache, cached
+from api.aws.client_cache import get_client
 from api.aws.ec2 import EC2Client
 from api.aws.elb import ELBClient
 from api.aws.eks import EKSClient
@@ -26,6 +29,74 @@ from cloudwatch.client import CloudWatchClient
 logger = logging.getLogger(__name__)
 
 
+def _usage_cache_key(prefix: str, fixed_region: Optional[str] = None) -> Callable[..., str]:
+    """
+    生成 collect_usage 的缓存键函数：{prefix}_usage:{account_id}:{region}
+    
+    Args:
+        prefix: 缓存键前缀（服务名）
+        fixed_region: 全局服务固定使用的 region（忽略调用时传入的 region）
+    
+    Returns:
+        与 collect_usage 签名一致的缓存键函数
+    """
+    return lambda self, account_id, region, *args, **kwargs: f"{prefix}_usage:{account_id}:{fixed_region or region}"
+
+
+def _usage_cache_ttl(prefix: str, default: int = 3600) -> int:
+    """
+    读取 collect_usage 结果的缓存时间：{PREFIX}_USAGE_CACHE_TTL（秒）
+    
+    资源变化频率不同的服务使用不同的默认值（如 CloudFront / Route53 资源很少变化）
+    
+    Args:
+        prefix: 缓存键前缀（服务名）
+        default: 默认缓存时间（秒）
+    
+    Returns:
+        缓存时间（秒）
+    """
+    return int(os.getenv(f"{prefix.upper()}_USAGE_CACHE_TTL", str(default)))
+
+
+def _ec2_cloudwatch_miss_key(account_id: str, region: str, quota_code: str) -> str:
+    """EC2 配额 CloudWatch 近期无数据标记的缓存键：ec2_cw_miss:{account_id}:{region}:{quota_code}"""
+    return f"ec2_cw_miss:{account_id}:{region}:{quota_code}"
+
+
+def _ec2_vcpu_usage_query(usage_class: str) -> Dict[str, object]:
+    """
+    构建 EC2 vCPU 配额的 CloudWatch AWS/Usage 查询定义
+    
+    Args:
+        usage_class: AWS/Usage 指标的 Class 维度（如 'Standard/OnDemand'）
+    
+    Returns:
+        get_metric_data_batch 使用的查询定义
+    """
+    return {
+        'namespace': 'AWS/Usage',
+        'metric_name': 'ResourceCount',
+        'dimensions': {
+            'Type': 'Resource',
+            'Resource': 'vCPU',
+            'Service': 'EC2',
+            'Class': usage_class
+        }
+    }
+
+
+# EC2 vCPU 配额 → CloudWatch 查询定义（模块级常量，避免每次采集重新构建）
+_EC2_CLOUDWATCH_QUERIES = {
+    'L-1216C47A': _ec2_vcpu_usage_query('Standard/OnDemand'),  # Running On-Demand Standard instances
+    'L-DB2E81BA': _ec2_vcpu_usage_query('G/OnDemand'),  # Running On-Demand G and VT instances
+    'L-417A185B': _ec2_vcpu_usage_query('P/OnDemand'),  # Running On-Demand P instances
+    'L-34B43A08': _ec2_vcpu_usage_query('Standard/Spot'),  # All Standard Spot Instance Requests
+    'L-3819A6DF': _ec2_vcpu_usage_query('G/Spot'),  # All G and VT Spot Instance Requests
+    'L-C4BD4855': _ec2_vcpu_usage_query('P5/Spot'),  # All P5 Spot Instance Requests
+}
+
+
 class UsageCollector(ABC):
     """
     Usage Collector 接口（service-level）
@@ -49,6 +120,26 @@ class UsageCollector(ABC):
             如果某个配额无法获取 usage，不包含该 key
         """
         pass
+    
+    def invalidate_usage(self, account_id: str, region: str) -> bool:
+        """
+        删除指定账号 / 区域的 usage 缓存，下次 collect_usage 重新调用 API
+        
+        用于资源变更事件（如 CloudTrail → EventBridge）触发的定向失效，
+        避免等待 TTL 过期才反映变更。
+        
+        Args:
+            account_id: 账号 ID
+            region: 区域（全局服务会被忽略）
+        
+        Returns:
+            True 表示已失效；collect_usage 未使用 cached 装饰器时返回 False
+        """
+        cache_key = getattr(self.collect_usage, 'cache_key', None)
+        if cache_key is None:
+            return False
+        self.cache.delete(cache_key(self, account_id, region))
+        return True
 
 
 class EC2UsageCollector(UsageCollector):
@@ -69,8 +160,31 @@ class EC2UsageCollector(UsageCollector):
             cache: 内存缓存实例
         """
         self.cache = cache
-        self.cache_ttl = 3600  # 1 小时缓存
+        self.cache_ttl = _usage_cache_ttl('ec2', 3600)  # 默认 1 小时
+        # CloudWatch 无数据的维度（如该 Region 没有 P5 容量）短期内不再查询，直接走 fallback
+        # 需长于 usage 缓存的 1 小时，否则下次采集时已过期
+        self.cloudwatch_miss_ttl = int(os.getenv('EC2_CLOUDWATCH_MISS_TTL', '10800'))  # 默认 3 小时
+        # AWS/Usage ResourceCount 指标约有 5 分钟发布延迟，查询窗口整体前移，避免空结果触发 fallback
+        self.cloudwatch_latency = int(os.getenv('EC2_CLOUDWATCH_LATENCY_SECONDS', '300'))
+    
+    def invalidate_usage(self, account_id: str, region: str) -> bool:
+        """
+        删除指定账号 / 区域的 usage 缓存，同时清除 CloudWatch 近期无数据标记
+        
+        资源变更后（如新启动实例）下次采集重新查询 CloudWatch，而不是继续直接走 fallback
+        
+        Args:
+            account_id: 账号 ID
+            region: 区域
+        
+        Returns:
+            True 表示已失效
+        """
+        for quota_code in _EC2_CLOUDWATCH_QUERIES:
+            self.cache.delete(_ec2_cloudwatch_miss_key(account_id, region, quota_code))
+        return super().invalidate_usage(account_id, region)
     
+    @cached(_usage_cache_key('ec2'))
     def collect_usage(self, account_id: str, region: str, access_key: str = None, secret_key: str = None) -> Dict[str, float]:
         """
         收集 EC2 的使用量数据
@@ -84,14 +198,6 @@ class EC2UsageCollector(UsageCollector):
         Returns:
             {quota_code: usage_value} 字典
         """
-        cache_key = f"ec2_usage:{account_id}:{region}"
-        
-        # 检查缓存
-        cached_value, exists = self.cache.get(cache_key)
-        if exists:
-            logger.debug(f"EC2 usage 缓存命中: {cache_key}")
-            return cached_value
-        
         logger.info(f"开始收集 EC2 usage (account: {account_id}, region: {region})")
         
         usage_data = {}
@@ -101,61 +207,8 @@ class EC2UsageCollector(UsageCollector):
             ec2_client = EC2Client(region=region, access_key=access_key, secret_key=secret_key)
             cloudwatch_client = CloudWatchClient(region=region, access_key=access_key, secret_key=secret_key)
             
-            # 1. CloudWatch AWS/Usage 指标（On-Demand 和 Spot 实例）
-            # 这些配额通过 CloudWatch 获取
+            # 1. CloudWatch AWS/Usage 指标（On-Demand 和 Spot 实例），查询定义见 _EC2_CLOUDWATCH_QUERIES
             # 注意：CloudWatch 指标可能有延迟，如果获取失败不影响其他配额
-            cloudwatch_quotas = {
-                'L-1216C47A': {  # Running On-Demand Standard instances
-                    'dimensions': {
-                        'Type': 'Resource',
-                        'Resource': 'vCPU',
-                        'Service': 'EC2',
-                        'Class': 'Standard/OnDemand'
-                    }
-                },
-                'L-DB2E81BA': {  # Running On-Demand G and VT instances
-                    'dimensions': {
-                        'Type': 'Resource',
-                        'Resource': 'vCPU',
-                        'Service': 'EC2',
-                        'Class': 'G/OnDemand'  # 注意：配置文件中的实际值
-                    }
-                },
-                'L-417A185B': {  # Running On-Demand P instances
-                    'dimensions': {
-                        'Type': 'Resource',
-                        'Resource': 'vCPU',
-                        'Service': 'EC2',
-                        'Class': 'P/OnDemand'
-                    }
-                },
-                'L-34B43A08': {  # All Standard Spot Instance Requests
-                    'dimensions': {
-                        'Type': 'Resource',
-                        'Resource': 'vCPU',
-                        'Service': 'EC2',
-                        'Class': 'Standard/Spot'
-                    }
-                },
-                'L-3819A6DF': {  # All G and VT Spot Instance Requests
-                    'dimensions': {
-                        'Type': 'Resource',
-                        'Resource': 'vCPU',
-                        'Service': 'EC2',
-                        'Class': 'G/Spot'  # 注意：配置文件中的实际值
-                    }
-                },
-                'L-C4BD4855': {  # All P5 Spot Instance Requests
-                    'dimensions': {
-                        'Type': 'Resource',
-                        'Resource': 'vCPU',
-                        'Service': 'EC2',
-                        'Class': 'P5/Spot'
-                    }
-                }
-            }
-            
-            # 从 CloudWatch 获取 usage
             # 注意：CloudWatch AWS/Usage 是 EC2 vCPU quota 的唯一权威 usage 来源
             # 当 CloudWatch 无数据时，使用 EC2 API fallback 确认是否有运行中实例
             # - 如果实例数为 0，则 usage = 0
@@ -166,25 +219,32 @@ class EC2UsageCollector(UsageCollector):
             cloudwatch_results = {}
             fallback_quotas = []
             
-            for quota_code, config in cloudwatch_quotas.items():
+            # 近期已确认无数据的配额直接走 fallback，不再查询 CloudWatch
+            query_quotas = {}
+            for quota_code, query in _EC2_CLOUDWATCH_QUERIES.items():
+                _, missed = self.cache.get(_ec2_cloudwatch_miss_key(account_id, region, quota_code))
+                if missed:
+                    fallback_quotas.append(quota_code)
+                    logger.debug(f"[CloudWatch 近期无数据] {quota_code}，跳过查询，直接使用 EC2 API fallback")
+                else:
+                    query_quotas[quota_code] = query
+            
+            # 其余配额合并为一次 GetMetricData 请求（替代逐个 GetMetricStatistics）
+            if query_quotas:
                 try:
-                    logger.debug(f"尝试从 CloudWatch 获取 {quota_code} usage...")
-                    value = cloudwatch_client.get_metric_statistics(
-                        namespace='AWS/Usage',
-                        metric_name='ResourceCount',
-                        dimensions=config['dimensions']
-                    )
-                    if value is not None:
-                        cloudwatch_results[quota_code] = float(value)
-                        logger.info(f"CloudWatch 获取成功 {quota_code}: {value}")
-                    else:
-                        # CloudWatch 无数据，需要 fallback
-                        fallback_quotas.append(quota_code)
-                        logger.debug(f"[CloudWatch 无数据] {quota_code}，将使用 EC2 API fallback")
+                    logger.debug(f"尝试从 CloudWatch 批量获取 {len(query_quotas)} 个配额 usage...")
+                    values = cloudwatch_client.get_metric_data_batch(query_quotas, latency_seconds=self.cloudwatch_latency)
+                    for quota_code, value in values.items():
+                        if value is not None:
+                            cloudwatch_results[quota_code] = float(value)
+                            logger.info(f"CloudWatch 获取成功 {quota_code}: {value}")
+                        else:
+                            # CloudWatch 无数据，需要 fallback（fallback 确认无运行中实例时才标记为近期无数据）
+                            fallback_quotas.append(quota_code)
+                            logger.debug(f"[CloudWatch 无数据] {quota_code}，将使用 EC2 API fallback")
                 except Exception as e:
-                    # CloudWatch API 调用异常：记录错误但不影响其他配额
-                    logger.error(f"[CloudWatch API 异常] {quota_code}: {e} - 返回 NaN（API 调用失败，请检查权限和网络）", exc_info=True)
-                    # 继续处理其他配额
+                    # CloudWatch API 调用异常：这些配额返回 NaN，不影响后续 API 方式的配额
+                    logger.error(f"[CloudWatch API 异常] {list(query_quotas)}: {e} - 返回 NaN（API 调用失败，请检查权限和网络）", exc_info=True)
             
             # 将 CloudWatch 成功的结果添加到 usage_data
             usage_data.update(cloudwatch_results)
@@ -200,6 +260,15 @@ class EC2UsageCollector(UsageCollector):
                     instance_count = len(running_instances)
                     logger.debug(f"获取到 {instance_count} 个运行中实例")
                     
+                    # 只有确认无运行中实例时，CloudWatch 无数据才可信：cloudwatch_miss_ttl 内不再查询；
+                    # 存在实例时清除标记，下次采集重新查询 CloudWatch
+                    for quota_code in fallback_quotas:
+                        miss_key = _ec2_cloudwatch_miss_key(account_id, region, quota_code)
+                        if instance_count == 0:
+                            self.cache.set(miss_key, True, self.cloudwatch_miss_ttl)
+                        else:
+                            self.cache.delete(miss_key)
+                    
                     # 对每个需要 fallback 的配额应用 fallback 逻辑
                     for quota_code in fallback_quotas:
                         if instance_count == 0:
@@ -218,24 +287,20 @@ class EC2UsageCollector(UsageCollector):
             # 2. API 方式获取（弹性 IP 和 VPN 连接）
             # L-0263D0A3: EC2-VPC Elastic IPs
             try:
-                addresses = ec2_client.describe_addresses()
-                usage_data['L-0263D0A3'] = float(len(addresses))
-                logger.debug(f"EC2 Elastic IPs: {len(addresses)}")
+                address_count = ec2_client.count_addresses()
+                usage_data['L-0263D0A3'] = float(address_count)
+                logger.debug(f"EC2 Elastic IPs: {address_count}")
             except Exception as e:
                 logger.warning(f"获取 Elastic IPs 失败: {e}")
             
             # L-3E6EC3A3: VPN connections per region
             try:
-                vpn_connections = ec2_client.describe_vpn_connections()
-                usage_data['L-3E6EC3A3'] = float(len(vpn_connections))
-                logger.debug(f"EC2 VPN connections: {len(vpn_connections)}")
+                vpn_count = ec2_client.count_vpn_connections()
+                usage_data['L-3E6EC3A3'] = float(vpn_count)
+                logger.debug(f"EC2 VPN connections: {vpn_count}")
             except Exception as e:
                 logger.warning(f"获取 VPN connections 失败: {e}")
             
-            # 缓存结果
-            if usage_data:
-                self.cache.set(cache_key, usage_data, self.cache_ttl)
-            
             logger.info(f"EC2 usage 收集完成: {len(usage_data)} 个配额")
             if usage_data:
                 logger.debug(f"EC2 usage 数据: {usage_data}")
@@ -271,8 +336,9 @@ class EBSUsageCollector(UsageCollector):
             cache: 内存缓存实例
         """
         self.cache = cache
-        self.cache_ttl = 3600  # 1 小时缓存
+        self.cache_ttl = _usage_cache_ttl('ebs', 3600)  # 默认 1 小时
     
+    @cached(_usage_cache_key('ebs'))
     def collect_usage(self, account_id: str, region: str, access_key: str = None, secret_key: str = None) -> Dict[str, float]:
         """
         收集 EBS 的使用量数据
@@ -280,14 +346,6 @@ class EBSUsageCollector(UsageCollector):
         Returns:
             {quota_code: usage_value} 字典
         """
-        cache_key = f"ebs_usage:{account_id}:{region}"
-        
-        # 检查缓存
-        cached_value, exists = self.cache.get(cache_key)
-        if exists:
-            logger.debug(f"EBS usage 缓存命中: {cache_key}")
-            return cached_value
-        
         logger.info(f"开始收集 EBS usage (account: {account_id}, region: {region})")
         
         usage_data = {}
@@ -306,32 +364,39 @@ class EBSUsageCollector(UsageCollector):
                 'L-17AF77E8': 'sc1',   # Storage for sc1 volumes
             }
             
+            # 一次不带过滤条件的 describe_volumes 扫描所有卷，在本地按 VolumeType 汇总
+            # （存储容量和 io1 / io2 IOPS 配额共用），与快照查询并发发起
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                snapshots_future = executor.submit(ec2_client.count_snapshots)
+                all_volumes = ec2_client.describe_volumes()
+                snapshot_count = snapshots_future.result()
+            
+            # 一次遍历累加各卷类型的总容量和总 IOPS，不再按类型建列表后逐个求和
+            size_by_type = defaultdict(int)
+            iops_by_type = defaultdict(int)
+            for vol in all_volumes:
+                volume_type = vol.get('VolumeType')
+                size_by_type[volume_type] += vol.get('Size', 0)
+                iops_by_type[volume_type] += vol.get('Iops', 0)
+            
             for quota_code, volume_type in volume_type_mapping.items():
-                volumes = ec2_client.describe_volumes(volume_type=volume_type)
                 # 计算总容量（GiB 转 TiB）
-                total_size_gib = sum(vol.get('Size', 0) for vol in volumes)
+                total_size_gib = size_by_type[volume_type]
                 total_size_tib = total_size_gib / 1024.0
                 usage_data[quota_code] = total_size_tib
             
             # 2. IOPS 配额
             # L-8D977E7E: IOPS for io2 volumes
-            io2_volumes = ec2_client.describe_volumes(volume_type='io2')
-            total_io2_iops = sum(vol.get('Iops', 0) for vol in io2_volumes)
+            total_io2_iops = iops_by_type['io2']
             usage_data['L-8D977E7E'] = float(total_io2_iops)
             
             # L-B3A130E6: IOPS for io1 volumes
-            io1_volumes = ec2_client.describe_volumes(volume_type='io1')
-            total_io1_iops = sum(vol.get('Iops', 0) for vol in io1_volumes)
+            total_io1_iops = iops_by_type['io1']
             usage_data['L-B3A130E6'] = float(total_io1_iops)
             
             # 3. 快照配额
             # L-309BACF6: Snapshots per Region
-            snapshots = ec2_client.describe_snapshots()
-            usage_data['L-309BACF6'] = float(len(snapshots))
-            
-            # 缓存结果
-            if usage_data:
-                self.cache.set(cache_key, usage_data, self.cache_ttl)
+            usage_data['L-309BACF6'] = float(snapshot_count)
             
             logger.info(f"EBS usage 收集完成: {len(usage_data)} 个配额")
             if usage_data:
@@ -368,8 +433,9 @@ class ELBUsageCollector(UsageCollector):
             cache: 内存缓存实例
         """
         self.cache = cache
-        self.cache_ttl = 3600  # 1 小时缓存
+        self.cache_ttl = _usage_cache_ttl('elb', 3600)  # 默认 1 小时
     
+    @cached(_usage_cache_key('elb'))
     def collect_usage(self, account_id: str, region: str, access_key: str = None, secret_key: str = None) -> Dict[str, float]:
         """
         收集 ELB 的使用量数据
@@ -377,14 +443,6 @@ class ELBUsageCollector(UsageCollector):
         Returns:
             {quota_code: usage_value} 字典
         """
-        cache_key = f"elb_usage:{account_id}:{region}"
-        
-        # 检查缓存
-        cached_value, exists = self.cache.get(cache_key)
-        if exists:
-            logger.debug(f"ELB usage 缓存命中: {cache_key}")
-            return cached_value
-        
         logger.info(f"开始收集 ELB usage (account: {account_id}, region: {region})")
         
         usage_data = {}
@@ -420,10 +478,6 @@ class ELBUsageCollector(UsageCollector):
                 logger.warning(f"获取 Target Groups 数量失败: {e}")
                 # 继续处理其他配额
             
-            # 缓存结果
-            if usage_data:
-                self.cache.set(cache_key, usage_data, self.cache_ttl)
-            
             logger.info(f"ELB usage 收集完成: {len(usage_data)} 个配额")
             if usage_data:
                 logger.debug(f"ELB usage 数据: {usage_data}")
@@ -458,8 +512,9 @@ class EKSUsageCollector(UsageCollector):
             cache: 内存缓存实例
         """
         self.cache = cache
-        self.cache_ttl = 3600  # 1 小时缓存
+        self.cache_ttl = _usage_cache_ttl('eks', 3600)  # 默认 1 小时
     
+    @cached(_usage_cache_key('eks'))
     def collect_usage(self, account_id: str, region: str, access_key: str = None, secret_key: str = None) -> Dict[str, float]:
         """
         收集 EKS 的使用量数据
@@ -468,14 +523,6 @@ class EKSUsageCollector(UsageCollector):
             {quota_code: usage_value} 字典
             无法明确映射的配额不包含在字典中（会返回 NaN）
         """
-        cache_key = f"eks_usage:{account_id}:{region}"
-        
-        # 检查缓存
-        cached_value, exists = self.cache.get(cache_key)
-        if exists:
-            logger.debug(f"EKS usage 缓存命中: {cache_key}")
-            return cached_value
-        
         logger.info(f"开始收集 EKS usage (account: {account_id}, region: {region})")
         
         usage_data = {}
@@ -497,25 +544,24 @@ class EKSUsageCollector(UsageCollector):
             # 这是对象数量，明确映射
             usage_data['L-1194D53C'] = float(len(clusters))
             
+            # 每个集群只 list_nodegroups 一次，两个节点组配额共用
+            # 单个 cluster API 失败则跳过（不出现在字典中），继续处理其他 cluster
+            nodegroups_by_cluster = {}
+            for cluster_name in clusters:
+                try:
+                    nodegroups_by_cluster[cluster_name] = eks_client.list_nodegroups(cluster_name)
+                    logger.debug(f"集群 {cluster_name} 有 {len(nodegroups_by_cluster[cluster_name])} 个节点组")
+                except Exception as e:
+                    logger.warning(f"获取集群 {cluster_name} 的节点组列表失败: {e}")
+            
             # 2. L-6D54EA21: Managed node groups per cluster
             # 【派生型 usage (max-per-entity)】
             # Limit: 每个集群的托管节点组数量限制
             # Usage: max(nodegroups_per_cluster) - 所有集群中节点组数的最大值
             # 语义: 当前所有集群中，单个集群拥有的最大节点组数
             if clusters:
-                nodegroups_per_cluster = []
-                for cluster_name in clusters:
-                    try:
-                        nodegroups = eks_client.list_nodegroups(cluster_name)
-                        nodegroups_per_cluster.append(len(nodegroups))
-                        logger.debug(f"集群 {cluster_name} 有 {len(nodegroups)} 个节点组")
-                    except Exception as e:
-                        logger.warning(f"获取集群 {cluster_name} 的节点组列表失败: {e}")
-                        # 单个 cluster API 失败则跳过，继续处理其他 cluster
-                        continue
-                
-                if nodegroups_per_cluster:
-                    max_nodegroups = max(nodegroups_per_cluster)
+                if nodegroups_by_cluster:
+                    max_nodegroups = max(len(nodegroups) for nodegroups in nodegroups_by_cluster.values())
                     usage_data['L-6D54EA21'] = float(max_nodegroups)
                     logger.debug(f"L-6D54EA21: max(nodegroups_per_cluster) = {max_nodegroups}")
                 else:
@@ -533,29 +579,34 @@ class EKSUsageCollector(UsageCollector):
             # 语义: 当前所有节点组中，单个节点组拥有的最大节点数
             # 节点数从 scalingConfig.desiredSize 获取
             if clusters:
-                nodes_per_nodegroup = []
-                for cluster_name in clusters:
-                    try:
-                        nodegroups = eks_client.list_nodegroups(cluster_name)
-                        for nodegroup_name in nodegroups:
-                            try:
-                                nodegroup_info = eks_client.describe_nodegroup(cluster_name, nodegroup_name)
-                                scaling_config = nodegroup_info.get('scalingConfig', {})
-                                desired_size = scaling_config.get('desiredSize', 0)
-                                if desired_size is not None:
-                                    nodes_per_nodegroup.append(desired_size)
-                                    logger.debug(f"节点组 {cluster_name}/{nodegroup_name} 有 {desired_size} 个节点")
-                            except Exception as e:
-                                logger.warning(f"获取节点组 {cluster_name}/{nodegroup_name} 详情失败: {e}")
-                                # 单个 nodegroup API 失败则跳过，继续处理其他 nodegroup
-                                continue
-                    except Exception as e:
-                        logger.warning(f"获取集群 {cluster_name} 的节点组列表失败: {e}")
-                        # 单个 cluster API 失败则跳过，继续处理其他 cluster
-                        continue
+                # 流式取最大值，不保存每个节点组的节点数（None 表示尚无成功获取的节点组）
+                max_nodes = None
+                tasks = [
+                    (cluster_name, nodegroup_name)
+                    for cluster_name, nodegroups in nodegroups_by_cluster.items()
+                    for nodegroup_name in nodegroups
+                ]
+                if tasks:
+                    # describe_nodegroup 之间互不依赖，并发发起
+                    with ThreadPoolExecutor(max_workers=min(16, len(tasks))) as executor:
+                        futures = [
+                            executor.submit(eks_client.describe_nodegroup, cluster_name, nodegroup_name)
+                            for cluster_name, nodegroup_name in tasks
+                        ]
+                    for (cluster_name, nodegroup_name), future in zip(tasks, futures):
+                        try:
+                            nodegroup_info = future.result()
+                        except Exception as e:
+                            logger.warning(f"获取节点组 {cluster_name}/{nodegroup_name} 详情失败: {e}")
+                            # 单个 nodegroup API 失败则跳过，继续处理其他 nodegroup
+                            continue
+                        scaling_config = nodegroup_info.get('scalingConfig', {})
+                        desired_size = scaling_config.get('desiredSize', 0)
+                        if desired_size is not None:
+                            max_nodes = desired_size if max_nodes is None else max(max_nodes, desired_size)
+                            logger.debug(f"节点组 {cluster_name}/{nodegroup_name} 有 {desired_size} 个节点")
                 
-                if nodes_per_nodegroup:
-                    max_nodes = max(nodes_per_nodegroup)
+                if max_nodes is not None:
                     usage_data['L-BD136A63'] = float(max_nodes)
                     logger.debug(f"L-BD136A63: max(nodes_per_nodegroup) = {max_nodes}")
                 else:
@@ -566,10 +617,6 @@ class EKSUsageCollector(UsageCollector):
                 usage_data['L-BD136A63'] = 0.0
                 logger.debug("L-BD136A63: 没有集群，usage = 0")
             
-            # 缓存结果（即使只有部分数据）
-            if usage_data:
-                self.cache.set(cache_key, usage_data, self.cache_ttl)
-            
             logger.info(f"EKS usage 收集完成: {len(usage_data)} 个配额有值")
             if usage_data:
                 logger.debug(f"EKS usage 数据: {usage_data}")
@@ -604,8 +651,9 @@ class ElastiCacheUsageCollector(UsageCollector):
             cache: 内存缓存实例
         """
         self.cache = cache
-        self.cache_ttl = 3600  # 1 小时缓存
+        self.cache_ttl = _usage_cache_ttl('elasticache', 3600)  # 默认 1 小时
     
+    @cached(_usage_cache_key('elasticache'))
     def collect_usage(self, account_id: str, region: str, access_key: str = None, secret_key: str = None) -> Dict[str, float]:
         """
         收集 ElastiCache 的使用量数据
@@ -614,14 +662,6 @@ class ElastiCacheUsageCollector(UsageCollector):
             {quota_code: usage_value} 字典
             不支持或无法准确映射的配额不包含在字典中（会返回 NaN）
         """
-        cache_key = f"elasticache_usage:{account_id}:{region}"
-        
-        # 检查缓存
-        cached_value, exists = self.cache.get(cache_key)
-        if exists:
-            logger.debug(f"ElastiCache usage 缓存命中: {cache_key}")
-            return cached_value
-        
         logger.info(f"开始收集 ElastiCache usage (account: {account_id}, region: {region})")
         
         usage_data = {}
@@ -630,13 +670,25 @@ class ElastiCacheUsageCollector(UsageCollector):
             # 初始化客户端
             elasticache_client = ElastiCacheClient(region=region, access_key=access_key, secret_key=secret_key)
             
+            # 缓存集群和复制组列表被多个配额共用，每种只查询一次（失败时为 None，依赖它的配额返回 NaN）
+            try:
+                cache_clusters = elasticache_client.describe_cache_clusters()
+            except Exception as e:
+                logger.warning(f"获取 ElastiCache 缓存集群列表失败: {e}")
+                cache_clusters = None
+            
+            try:
+                replication_groups = elasticache_client.describe_replication_groups()
+            except Exception as e:
+                logger.warning(f"获取 ElastiCache 复制组列表失败: {e}")
+                replication_groups = None
+            
             # 1. L-DFE45DF3: Nodes per Region
             # 所有节点总数（包括 Memcached、Redis 非集群模式、Redis 集群模式）
-            try:
+            if cache_clusters is not None and replication_groups is not None:
                 total_nodes = 0
                 
                 # 1.1 Memcached 和 Redis 非集群模式的节点数
-                cache_clusters = elasticache_client.describe_cache_clusters()
                 for cluster in cache_clusters:
                     # 只统计不属于复制组的集群（非集群模式的 Redis 或 Memcached）
                     if not cluster.get('ReplicationGroupId'):
@@ -645,22 +697,18 @@ class ElastiCacheUsageCollector(UsageCollector):
                         logger.debug(f"集群 {cluster.get('CacheClusterId')} 有 {num_nodes} 个节点")
                 
                 # 1.2 Redis 集群模式的节点数
-                replication_groups = elasticache_client.describe_replication_groups()
                 for rg in replication_groups:
                     total_nodes += rg.get('TotalNodes', 0)
                     logger.debug(f"复制组 {rg.get('ReplicationGroupId')} 有 {rg.get('TotalNodes')} 个节点")
                 
                 usage_data['L-DFE45DF3'] = float(total_nodes)
                 logger.debug(f"L-DFE45DF3: 总节点数 = {total_nodes}")
-            except Exception as e:
-                logger.warning(f"获取 L-DFE45DF3 usage 失败: {e}")
-                # API 失败返回 NaN（不包含在字典中）
+            # 否则 API 失败返回 NaN（不包含在字典中）
             
             # 2. L-AF354865: Nodes per cluster (cluster mode enabled)
             # Redis 集群模式中单个集群的最大节点数
             # 注意：这是每个 NodeGroup 的节点数，不是整个复制组的节点数
-            try:
-                replication_groups = elasticache_client.describe_replication_groups()
+            if replication_groups is not None:
                 if replication_groups:
                     max_nodes_per_nodegroup = 0
                     for rg in replication_groups:
@@ -680,14 +728,11 @@ class ElastiCacheUsageCollector(UsageCollector):
                     # 没有复制组，usage = 0
                     usage_data['L-AF354865'] = 0.0
                     logger.debug("L-AF354865: 没有复制组，usage = 0")
-            except Exception as e:
-                logger.warning(f"获取 L-AF354865 usage 失败: {e}")
-                # API 失败返回 NaN（不包含在字典中）
+            # 否则 API 失败返回 NaN（不包含在字典中）
             
             # 3. L-8C334AD1: Nodes per cluster (Memcached)
             # Memcached 集群中单个集群的最大节点数
-            try:
-                cache_clusters = elasticache_client.describe_cache_clusters()
+            if cache_clusters is not None:
                 memcached_clusters = [c for c in cache_clusters if c.get('Engine', '').lower() == 'memcached']
                 
                 if memcached_clusters:
@@ -702,9 +747,7 @@ class ElastiCacheUsageCollector(UsageCollector):
                     # 没有 Memcached 集群，usage = 0
                     usage_data['L-8C334AD1'] = 0.0
                     logger.debug("L-8C334AD1: 没有 Memcached 集群，usage = 0")
-            except Exception as e:
-                logger.warning(f"获取 L-8C334AD1 usage 失败: {e}")
-                # API 失败返回 NaN（不包含在字典中）
+            # 否则 API 失败返回 NaN（不包含在字典中）
             
             # 4. L-BBCDAECC: Serverless Caches per Region
             # Serverless Cache 实例数
@@ -716,10 +759,6 @@ class ElastiCacheUsageCollector(UsageCollector):
                 logger.warning(f"获取 L-BBCDAECC usage 失败: {e}")
                 # API 失败返回 NaN（不包含在字典中）
             
-            # 缓存结果（即使只有部分数据）
-            if usage_data:
-                self.cache.set(cache_key, usage_data, self.cache_ttl)
-            
             logger.info(f"ElastiCache usage 收集完成: {len(usage_data)} 个配额有值")
             if usage_data:
                 logger.debug(f"ElastiCache usage 数据: {usage_data}")
@@ -742,7 +781,7 @@ class Route53UsageCollector(UsageCollector):
     
     功能：
     - 收集 Route53 服务的所有配额使用量
-    - 使用缓存（1小时 TTL）
+    - 使用缓存（默认 6 小时 TTL，ROUTE53_USAGE_CACHE_TTL 可调）
     - 通过 Route53 API 获取 Hosted Zones 信息
     - Route53 是全局服务，region 固定为 us-east-1
     """
@@ -755,8 +794,9 @@ class Route53UsageCollector(UsageCollector):
             cache: 内存缓存实例
         """
         self.cache = cache
-        self.cache_ttl = 3600  # 1 小时缓存
+        self.cache_ttl = _usage_cache_ttl('route53', 21600)  # 默认 6 小时（资源很少变化）
     
+    @cached(_usage_cache_key('route53', 'us-east-1'))
     def collect_usage(self, account_id: str, region: str, access_key: str = None, secret_key: str = None) -> Dict[str, float]:
         """
         收集 Route53 的使用量数据
@@ -770,13 +810,6 @@ class Route53UsageCollector(UsageCollector):
         """
         # Route53 是全局服务，使用 us-east-1
         route53_region = 'us-east-1'
-        cache_key = f"route53_usage:{account_id}:{route53_region}"
-        
-        # 检查缓存
-        cached_value, exists = self.cache.get(cache_key)
-        if exists:
-            logger.debug(f"Route53 usage 缓存命中: {cache_key}")
-            return cached_value
         
         logger.info(f"开始收集 Route53 usage (account: {account_id}, region: {route53_region})")
         
@@ -786,59 +819,13 @@ class Route53UsageCollector(UsageCollector):
             # 初始化客户端（Route53 是全局服务，使用 us-east-1）
             route53_client = Route53Client(region=route53_region, access_key=access_key, secret_key=secret_key)
             
-            # L-F767CB15: Domain count limit -> 注册的域名数量（不是Hosted Zones）
-            # 注意：Domain count limit 指的是通过Route53注册的域名数量，不是Hosted Zones数量
-            # Route53 API 无法直接获取注册域名数量，但AWS控制台显示usage为0
-            # 尝试使用Route53domains API获取注册域名数量
-            try:
-                # 创建 route53domains client（支持凭证）
-                if access_key and secret_key:
-                    session = boto3.Session(
-                        aws_access_key_id=access_key,
-                        aws_secret_access_key=secret_key
-                    )
-                    route53domains_client = session.client('route53domains', region_name=route53_region)
-                else:
-                    route53domains_client = boto3.client('route53domains', region_name=route53_region)
-                # Route53domains API支持分页，需要遍历所有页面
-                domain_count = 0
-                paginator = route53domains_client.get_paginator('list_domains')
-                for page in paginator.paginate():
-                    domain_count += len(page.get('Domains', []))
-                
-                usage_data['L-F767CB15'] = float(domain_count)
-                logger.info(f"Route53 Domain count usage (from Route53domains API): {domain_count}")
-            except Exception as domains_error:
-                # Route53domains API可能不可用或没有权限，使用0作为默认值（与AWS控制台一致）
-                logger.debug(f"Route53domains API不可用，使用默认值0: {domains_error}")
-                usage_data['L-F767CB15'] = 0.0
-                logger.info(f"Route53 Domain count usage: 0 (无法获取注册域名数量，使用默认值)")
-            
-            # L-4EA4796A: Hosted zones per account -> Hosted Zones 数量
-            # Usage = GetHostedZoneCount API 返回的 HostedZoneCount（推荐方法）
-            # 备选：也可以使用 get_account_limit 返回的 Count 字段
-            try:
-                hosted_zone_count = route53_client.get_hosted_zone_count()
-                if hosted_zone_count is not None:
-                    usage_data['L-4EA4796A'] = float(hosted_zone_count)
-                    logger.info(f"Route53 Hosted Zones usage (from GetHostedZoneCount API): {hosted_zone_count}")
-                else:
-                    # 如果 GetHostedZoneCount 失败，尝试使用 get_account_limit 的 Count 字段作为备选
-                    logger.debug("GetHostedZoneCount 返回 None，尝试使用 get_account_limit 的 Count 字段")
-                    limit_info = route53_client.get_account_limit('MAX_HOSTED_ZONES_BY_OWNER')
-                    if limit_info and 'count' in limit_info:
-                        hosted_zone_count = limit_info['count']
-                        usage_data['L-4EA4796A'] = float(hosted_zone_count)
-                        logger.info(f"Route53 Hosted Zones usage (from get_account_limit Count, fallback): {hosted_zone_count}")
-                    else:
-                        logger.warning(f"Route53 无法获取 Hosted Zones usage: get_account_limit 也返回无效数据")
-            except Exception as e:
-                logger.warning(f"获取 Route53 Hosted Zones usage 失败: {e}")
-                # 失败时不添加到 usage_data，会返回 NaN
-            
-            # 缓存结果
-            if usage_data:
-                self.cache.set(cache_key, usage_data, self.cache_ttl)
+            # L-F767CB15（route53domains）与 L-4EA4796A（route53）互不依赖，并发发起
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                domain_future = executor.submit(self._count_domains, route53_region, access_key, secret_key)
+                hosted_zone_usage = self._get_hosted_zone_usage(route53_client)
+                usage_data['L-F767CB15'] = domain_future.result()
+            if hosted_zone_usage is not None:
+                usage_data['L-4EA4796A'] = hosted_zone_usage
             
             logger.info(f"Route53 usage 收集完成: {len(usage_data)} 个配额有值")
             if usage_data:
@@ -852,6 +839,65 @@ class Route53UsageCollector(UsageCollector):
             logger.error(f"Route53 usage 收集失败: {e}", exc_info=True)
             return {}
     
+    @staticmethod
+    def _count_domains(route53_region: str, access_key: str = None, secret_key: str = None) -> float:
+        """
+        L-F767CB15: Domain count limit -> 注册的域名数量（不是Hosted Zones）
+        
+        注意：Domain count limit 指的是通过Route53注册的域名数量，不是Hosted Zones数量
+        Route53 API 无法直接获取注册域名数量，但AWS控制台显示usage为0
+        尝试使用Route53domains API获取注册域名数量
+        
+        Returns:
+            注册域名数量；Route53domains API 不可用时返回 0（与AWS控制台一致）
+        """
+        try:
+            # 获取（复用）route53domains client（支持凭证）
+            route53domains_client = get_client('route53domains', route53_region, access_key, secret_key)
+            # Route53domains API支持分页，需要遍历所有页面
+            domain_count = 0
+            paginator = route53domains_client.get_paginator('list_domains')
+            # ListDomains 默认每页 20 条，使用 API 允许的最大值 100
+            for page in paginator.paginate(PaginationConfig={'PageSize': 100}):
+                domain_count += len(page.get('Domains', []))
+            
+            logger.info(f"Route53 Domain count usage (from Route53domains API): {domain_count}")
+            return float(domain_count)
+        except Exception as domains_error:
+            # Route53domains API可能不可用或没有权限，使用0作为默认值（与AWS控制台一致）
+            logger.debug(f"Route53domains API不可用，使用默认值0: {domains_error}")
+            logger.info(f"Route53 Domain count usage: 0 (无法获取注册域名数量，使用默认值)")
+            return 0.0
+    
+    @staticmethod
+    def _get_hosted_zone_usage(route53_client: Route53Client) -> Optional[float]:
+        """
+        L-4EA4796A: Hosted zones per account -> Hosted Zones 数量
+        
+        Usage = GetHostedZoneCount API 返回的 HostedZoneCount（推荐方法）
+        备选：也可以使用 get_account_limit 返回的 Count 字段
+        
+        Returns:
+            Hosted Zones 数量；获取失败时返回 None（usage 显示为 NaN）
+        """
+        try:
+            hosted_zone_count = route53_client.get_hosted_zone_count()
+            if hosted_zone_count is not None:
+                logger.info(f"Route53 Hosted Zones usage (from GetHostedZoneCount API): {hosted_zone_count}")
+                return float(hosted_zone_count)
+            
+            # 如果 GetHostedZoneCount 失败，尝试使用 get_account_limit 的 Count 字段作为备选
+            logger.debug("GetHostedZoneCount 返回 None，尝试使用 get_account_limit 的 Count 字段")
+            limit_info = route53_client.get_account_limit('MAX_HOSTED_ZONES_BY_OWNER')
+            if limit_info and 'count' in limit_info:
+                hosted_zone_count = limit_info['count']
+                logger.info(f"Route53 Hosted Zones usage (from get_account_limit Count, fallback): {hosted_zone_count}")
+                return float(hosted_zone_count)
+            logger.warning(f"Route53 无法获取 Hosted Zones usage: get_account_limit 也返回无效数据")
+        except Exception as e:
+            logger.warning(f"获取 Route53 Hosted Zones usage 失败: {e}")
+        return None
+    
     def get_provider_type(self) -> str:
         """获取 Provider 类型"""
         return "route53"
@@ -863,7 +909,7 @@ class CloudFrontUsageCollector(UsageCollector):
     
     功能：
     - 收集 CloudFront 服务的配额使用量（service-level）
-    - 使用缓存（1小时 TTL）
+    - 使用缓存（默认 6 小时 TTL，CLOUDFRONT_USAGE_CACHE_TTL 可调）
     - 通过 boto3 cloudfront.list_distributions 获取 Distribution 数量
     - CloudFront 是全局服务，固定使用 us-east-1
     - 不走 EC2 Region 发现逻辑
@@ -877,8 +923,9 @@ class CloudFrontUsageCollector(UsageCollector):
             cache: 内存缓存实例
         """
         self.cache = cache
-        self.cache_ttl = 3600  # 1 小时缓存
+        self.cache_ttl = _usage_cache_ttl('cloudfront', 21600)  # 默认 6 小时（资源很少变化）
     
+    @cached(_usage_cache_key('cloudfront', 'us-east-1'))
     def collect_usage(self, account_id: str, region: str, access_key: str = None, secret_key: str = None) -> Dict[str, float]:
         """
         收集 CloudFront 的使用量数据（service-level）
@@ -907,151 +954,41 @@ class CloudFrontUsageCollector(UsageCollector):
         """
         # CloudFront 是全局服务，固定使用 us-east-1
         cloudfront_region = 'us-east-1'
-        cache_key = f"cloudfront_usage:{account_id}:{cloudfront_region}"
-        
-        # 检查缓存
-        cached_value, exists = self.cache.get(cache_key)
-        if exists:
-            logger.debug(f"CloudFront usage 缓存命中: {cache_key}")
-            return cached_value
         
         logger.info(f"开始收集 CloudFront usage (account: {account_id}, region: {cloudfront_region})")
         
         usage_data = {}
         
         try:
-            # 使用 boto3 直接创建 CloudFront 客户端（固定 us-east-1）
-            import boto3
-            from botocore.exceptions import ClientError, BotoCoreError
-            
-            if access_key and secret_key:
-                session = boto3.Session(
-                    aws_access_key_id=access_key,
-                    aws_secret_access_key=secret_key
-                )
-                cloudfront_client = session.client('cloudfront', region_name=cloudfront_region)
-            else:
-                cloudfront_client = boto3.client('cloudfront', region_name=cloudfront_region)
-            
-            # 1. L-24B04930: Web distributions per AWS account
-            # 使用 list_distributions().DistributionList.Quantity
-            try:
-                response = cloudfront_client.list_distributions()
-                distribution_list = response.get('DistributionList', {})
-                distribution_count = distribution_list.get('Quantity', 0)
-                usage_data['L-24B04930'] = float(distribution_count)
-                logger.info(f"CloudFront Distribution 数量: {distribution_count}")
-                
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code")
-                error_message = e.response.get("Error", {}).get("Message")
-                logger.warning(f"获取 CloudFront Distribution 数量失败: {error_code} - {error_message}")
-            except BotoCoreError as e:
-                logger.warning(f"获取 CloudFront Distribution 数量失败（BotoCoreError）: {e}")
-            except Exception as e:
-                logger.warning(f"获取 CloudFront Distribution 数量失败: {e}")
-            
-            # 2. L-7D134442: Cache policies per AWS account
-            # 使用 list_cache_policies(Type="custom") 的 Items 数量（只统计 custom）
-            try:
-                all_cache_policies = []
-                marker = None
-                
-                while True:
-                    request_params = {'Type': 'custom'}  # 只统计 custom 类型
-                    if marker:
-                        request_params['Marker'] = marker
-                    
-                    response = cloudfront_client.list_cache_policies(**request_params)
-                    cache_policy_list = response.get('CachePolicyList', {})
-                    items = cache_policy_list.get('Items', [])
-                    all_cache_policies.extend(items)
-                    
-                    logger.debug(f"获取到 {len(items)} 个 Custom Cache Policies (累计: {len(all_cache_policies)})")
-                    
-                    # 检查是否有下一页
-                    if cache_policy_list.get('IsTruncated', False):
-                        marker = cache_policy_list.get('NextMarker')
-                        if not marker:
-                            logger.warning("CloudFront ListCachePolicies 返回 IsTruncated=True 但 NextMarker 为空")
-                            break
-                    else:
-                        break
-                
-                cache_policy_count = len(all_cache_policies)
-                usage_data['L-7D134442'] = float(cache_policy_count)
-                logger.info(f"CloudFront Custom Cache Policy 数量: {cache_policy_count}")
-                
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code")
-                error_message = e.response.get("Error", {}).get("Message")
-                logger.warning(f"获取 CloudFront Cache Policy 数量失败: {error_code} - {error_message}")
-            except BotoCoreError as e:
-                logger.warning(f"获取 CloudFront Cache Policy 数量失败（BotoCoreError）: {e}")
-            except Exception as e:
-                logger.warning(f"获取 CloudFront Cache Policy 数量失败: {e}")
-            
-            # 3. L-CF0D4FC5: Response headers policies per AWS account
-            # 使用 list_response_headers_policies(Type="custom") 的 Items 数量（只统计 custom）
-            try:
-                all_response_headers_policies = []
-                marker = None
-                
-                while True:
-                    request_params = {'Type': 'custom'}  # 只统计 custom 类型
-                    if marker:
-                        request_params['Marker'] = marker
-                    
-                    response = cloudfront_client.list_response_headers_policies(**request_params)
-                    response_headers_policy_list = response.get('ResponseHeadersPolicyList', {})
-                    items = response_headers_policy_list.get('Items', [])
-                    all_response_headers_policies.extend(items)
-                    
-                    logger.debug(f"获取到 {len(items)} 个 Custom Response Headers Policies (累计: {len(all_response_headers_policies)})")
-                    
-                    # 检查是否有下一页
-                    if response_headers_policy_list.get('IsTruncated', False):
-                        marker = response_headers_policy_list.get('NextMarker')
-                        if not marker:
-                            logger.warning("CloudFront ListResponseHeadersPolicies 返回 IsTruncated=True 但 NextMarker 为空")
-                            break
-                    else:
-                        break
-                
-                response_headers_policy_count = len(all_response_headers_policies)
-                usage_data['L-CF0D4FC5'] = float(response_headers_policy_count)
-                logger.info(f"CloudFront Custom Response Headers Policy 数量: {response_headers_policy_count}")
-                
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code")
-                error_message = e.response.get("Error", {}).get("Message")
-                logger.warning(f"获取 CloudFront Response Headers Policy 数量失败: {error_code} - {error_message}")
-            except BotoCoreError as e:
-                logger.warning(f"获取 CloudFront Response Headers Policy 数量失败（BotoCoreError）: {e}")
-            except Exception as e:
-                logger.warning(f"获取 CloudFront Response Headers Policy 数量失败: {e}")
-            
-            # 4. L-08884E5C: Origin access identities per account
-            # 使用 list_cloud_front_origin_access_identities().CloudFrontOriginAccessIdentityList.Quantity
-            try:
-                response = cloudfront_client.list_cloud_front_origin_access_identities()
-                origin_access_identity_list = response.get('CloudFrontOriginAccessIdentityList', {})
-                origin_access_identity_count = origin_access_identity_list.get('Quantity', 0)
-                usage_data['L-08884E5C'] = float(origin_access_identity_count)
-                logger.info(f"CloudFront Origin Access Identity 数量: {origin_access_identity_count}")
-                
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code")
-                error_message = e.response.get("Error", {}).get("Message")
-                logger.warning(f"获取 CloudFront Origin Access Identity 数量失败: {error_code} - {error_message}")
-            except BotoCoreError as e:
-                logger.warning(f"获取 CloudFront Origin Access Identity 数量失败（BotoCoreError）: {e}")
-            except Exception as e:
-                logger.warning(f"获取 CloudFront Origin Access Identity 数量失败: {e}")
-            
-            # 缓存结果
-            if usage_data:
-                self.cache.set(cache_key, usage_data, self.cache_ttl)
+            # 直接使用 boto3 CloudFront 客户端（固定 us-east-1，按凭证复用）
+            cloudfront_client = get_client('cloudfront', cloudfront_region, access_key, secret_key)
+            
+            # 四个配额对应的 List API 互不依赖，并发发起（boto3 client 线程安全，共用同一个）
+            # (quota_code, 资源名称, 计数函数)
+            counters = (
+                ('L-24B04930', 'Distribution', self._count_distributions),
+                ('L-7D134442', 'Cache Policy', self._count_cache_policies),
+                ('L-CF0D4FC5', 'Response Headers Policy', self._count_response_headers_policies),
+                ('L-08884E5C', 'Origin Access Identity', self._count_origin_access_identities),
+            )
+            with ThreadPoolExecutor(max_workers=len(counters)) as executor:
+                futures = [
+                    (quota_code, resource_name, executor.submit(counter, cloudfront_client))
+                    for quota_code, resource_name, counter in counters
+                ]
+                for quota_code, resource_name, future in futures:
+                    try:
+                        resource_count = future.result()
+                        usage_data[quota_code] = float(resource_count)
+                        logger.info(f"CloudFront {resource_name} 数量: {resource_count}")
+                    except ClientError as e:
+                        error_code = e.response.get("Error", {}).get("Code")
+                        error_message = e.response.get("Error", {}).get("Message")
+                        logger.warning(f"获取 CloudFront {resource_name} 数量失败: {error_code} - {error_message}")
+                    except BotoCoreError as e:
+                        logger.warning(f"获取 CloudFront {resource_name} 数量失败（BotoCoreError）: {e}")
+                    except Exception as e:
+                        logger.warning(f"获取 CloudFront {resource_name} 数量失败: {e}")
             
             logger.info(f"CloudFront usage 收集完成: {len(usage_data)} 个配额")
             if usage_data:
@@ -1064,6 +1001,81 @@ class CloudFrontUsageCollector(UsageCollector):
             logger.error(f"CloudFront usage 收集失败: {e}", exc_info=True)
             return {}
     
+    @staticmethod
+    def _count_distributions(cloudfront_client) -> int:
+        """
+        L-24B04930: Web distributions per AWS account
+        
+        使用 list_distributions().DistributionList.Quantity
+        """
+        response = cloudfront_client.list_distributions()
+        return response.get('DistributionList', {}).get('Quantity', 0)
+    
+    @staticmethod
+    def _count_custom_policies(list_policies: Callable[..., dict], list_key: str) -> int:
+        """
+        分页统计 custom 类型的 CloudFront 策略数量
+        
+        Args:
+            list_policies: list_cache_policies / list_response_headers_policies
+            list_key: 响应中的列表字段（CachePolicyList / ResponseHeadersPolicyList）
+        
+        Returns:
+            custom 策略数量
+        """
+        policy_count = 0
+        marker = None
+        
+        while True:
+            # 只统计 custom 类型；显式使用最大页大小，减少分页往返（这两个 API 没有 boto3 paginator）
+            request_params = {'Type': 'custom', 'MaxItems': '100'}
+            if marker:
+                request_params['Marker'] = marker
+            
+            response = list_policies(**request_params)
+            policy_list = response.get(list_key, {})
+            items = policy_list.get('Items', [])
+            policy_count += len(items)
+            
+            logger.debug(f"{list_key} 获取到 {len(items)} 个 custom 策略 (累计: {policy_count})")
+            
+            # 检查是否有下一页
+            if policy_list.get('IsTruncated', False):
+                marker = policy_list.get('NextMarker')
+                if not marker:
+                    logger.warning(f"CloudFront {list_key} 返回 IsTruncated=True 但 NextMarker 为空")
+                    break
+            else:
+                break
+        
+        return policy_count
+    
+    def _count_cache_policies(self, cloudfront_client) -> int:
+        """
+        L-7D134442: Cache policies per AWS account
+        
+        使用 list_cache_policies(Type="custom") 的 Items 数量（只统计 custom）
+        """
+        return self._count_custom_policies(cloudfront_client.list_cache_policies, 'CachePolicyList')
+    
+    def _count_response_headers_policies(self, cloudfront_client) -> int:
+        """
+        L-CF0D4FC5: Response headers policies per AWS account
+        
+        使用 list_response_headers_policies(Type="custom") 的 Items 数量（只统计 custom）
+        """
+        return self._count_custom_policies(cloudfront_client.list_response_headers_policies, 'ResponseHeadersPolicyList')
+    
+    @staticmethod
+    def _count_origin_access_identities(cloudfront_client) -> int:
+        """
+        L-08884E5C: Origin access identities per account
+        
+        使用 list_cloud_front_origin_access_identities().CloudFrontOriginAccessIdentityList.Quantity
+        """
+        response = cloudfront_client.list_cloud_front_origin_access_identities()
+        return response.get('CloudFrontOriginAccessIdentityList', {}).get('Quantity', 0)
+    
     def get_provider_type(self) -> str:
         """获取 Provider 类型"""
         return "cloudfront"
@@ -1093,8 +1105,9 @@ class SageMakerUsageCollector(UsageCollector):
             cache: 内存缓存实例
         """
         self.cache = cache
-        self.cache_ttl = 3600  # 1 小时缓存
+        self.cache_ttl = _usage_cache_ttl('sagemaker', 3600)  # 默认 1 小时
     
+    @cached(_usage_cache_key('sagemaker'))
     def collect_usage(self, account_id: str, region: str, access_key: str = None, secret_key: str = None) -> Dict[str, float]:
         """
         收集 SageMaker 的使用量数据（service-level）
@@ -1121,14 +1134,6 @@ class SageMakerUsageCollector(UsageCollector):
             API 失败时返回空字典，usage 会显示为 NaN
             无资源时 usage 返回 0
         """
-        cache_key = f"sagemaker_usage:{account_id}:{region}"
-        
-        # 检查缓存
-        cached_value, exists = self.cache.get(cache_key)
-        if exists:
-            logger.debug(f"SageMaker usage 缓存命中: {cache_key}")
-            return cached_value
-        
         logger.info(f"开始收集 SageMaker usage (account: {account_id}, region: {region})")
         
         usage_data = {}
@@ -1168,66 +1173,17 @@ class SageMakerUsageCollector(UsageCollector):
             # 2. 初始化 SageMaker 客户端
             sagemaker_client = SageMakerClient(region=region, access_key=access_key, secret_key=secret_key)
             
-            # 3. 获取资源数量（一次性获取所有类型，减少 API 调用）
-            notebook_instance_count = 0
-            training_job_count = 0
-            endpoint_count = 0
-            
+            # 3. 获取资源数量（三类资源的 List API 互不依赖，并发获取）
             logger.info("开始获取 SageMaker 资源数量...")
             logger.info("优化策略：只统计运行中的资源（配额通常针对正在使用的资源）")
             
-            try:
-                # Notebook Instance: 只统计 InService 状态的（运行中）
-                notebook_instance_count = sagemaker_client.get_notebook_instance_count(status_filter='InService')
-                logger.info(f"Notebook Instance 数量（运行中）: {notebook_instance_count}")
-            except Exception as e:
-                logger.warning(f"获取 Notebook Instance 数量失败: {e}")
-                # 如果失败，尝试获取所有状态的数量
-                try:
-                    notebook_instance_count = sagemaker_client.get_notebook_instance_count()
-                    logger.info(f"Notebook Instance 数量（所有状态）: {notebook_instance_count}")
-                except Exception as e2:
-                    logger.warning(f"获取 Notebook Instance 数量（所有状态）也失败: {e2}")
-                    notebook_instance_count = 0
-            
-            try:
-                # Training Job: 只统计 InProgress 状态的（运行中）
-                # 注意：Training Job 配额通常是指并发运行的训练任务
-                # 添加超时和最大页数限制，避免无限等待
-                training_job_count = sagemaker_client.get_training_job_count(
-                    status_filter='InProgress',
-                    max_pages=100,  # 最多处理 100 页（约 10000 个任务）
-                    timeout_seconds=30  # 30 秒超时
-                )
-                logger.info(f"Training Job 数量（运行中）: {training_job_count}")
-            except Exception as e:
-                logger.warning(f"获取 Training Job 数量（运行中）失败: {e}")
-                # 如果失败，尝试不使用状态过滤，但使用更严格的限制
-                logger.info("尝试获取所有状态的 Training Job 数量（使用严格限制）...")
-                try:
-                    training_job_count = sagemaker_client.get_training_job_count(
-                        status_filter=None,
-                        max_pages=50,  # 只处理前 50 页作为估算
-                        timeout_seconds=20  # 20 秒超时
-                    )
-                    logger.info(f"Training Job 数量（估算，前 50 页）: {training_job_count}")
-                except Exception as e2:
-                    logger.warning(f"获取 Training Job 数量也失败: {e2}")
-                    training_job_count = 0
-            
-            try:
-                # Endpoint: 只统计 InService 状态的（运行中）
-                endpoint_count = sagemaker_client.get_endpoint_count(status_filter='InService')
-                logger.info(f"Endpoint 数量（运行中）: {endpoint_count}")
-            except Exception as e:
-                logger.warning(f"获取 Endpoint 数量失败: {e}")
-                # 如果失败，尝试获取所有状态的数量
-                try:
-                    endpoint_count = sagemaker_client.get_endpoint_count()
-                    logger.info(f"Endpoint 数量（所有状态）: {endpoint_count}")
-                except Exception as e2:
-                    logger.warning(f"获取 Endpoint 数量（所有状态）也失败: {e2}")
-                    endpoint_count = 0
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                notebook_future = executor.submit(self._count_notebook_instances, sagemaker_client)
+                training_future = executor.submit(self._count_training_jobs, sagemaker_client)
+                endpoint_future = executor.submit(self._count_endpoints, sagemaker_client)
+                notebook_instance_count = notebook_future.result()
+                training_job_count = training_future.result()
+                endpoint_count = endpoint_future.result()
             
             # 4. 根据配额名称匹配资源类型并设置 usage
             logger.info("开始匹配配额并设置 Usage 值...")
@@ -1261,10 +1217,6 @@ class SageMakerUsageCollector(UsageCollector):
                 # 如果后续需要，可以从配置中读取 match_rules
                 pass
             
-            # 5. 缓存结果（即使只有部分数据）
-            if usage_data:
-                self.cache.set(cache_key, usage_data, self.cache_ttl)
-            
             logger.info(f"SageMaker usage 收集完成: {len(usage_data)} 个配额有值")
             if usage_data:
                 logger.debug(f"SageMaker usage 数据: {usage_data}")
@@ -1276,6 +1228,80 @@ class SageMakerUsageCollector(UsageCollector):
             logger.error(f"SageMaker usage 收集失败: {e}", exc_info=True)
             return {}
     
+    @staticmethod
+    def _count_notebook_instances(sagemaker_client: SageMakerClient) -> int:
+        """
+        获取运行中的 Notebook Instance 数量（失败时退回统计所有状态，仍失败返回 0）
+        """
+        try:
+            # Notebook Instance: 只统计 InService 状态的（运行中）
+            notebook_instance_count = sagemaker_client.get_notebook_instance_count(status_filter='InService')
+            logger.info(f"Notebook Instance 数量（运行中）: {notebook_instance_count}")
+            return notebook_instance_count
+        except Exception as e:
+            logger.warning(f"获取 Notebook Instance 数量失败: {e}")
+        # 如果失败，尝试获取所有状态的数量
+        try:
+            notebook_instance_count = sagemaker_client.get_notebook_instance_count()
+            logger.info(f"Notebook Instance 数量（所有状态）: {notebook_instance_count}")
+            return notebook_instance_count
+        except Exception as e2:
+            logger.warning(f"获取 Notebook Instance 数量（所有状态）也失败: {e2}")
+            return 0
+    
+    @staticmethod
+    def _count_training_jobs(sagemaker_client: SageMakerClient) -> int:
+        """
+        获取运行中的 Training Job 数量（失败时退回带严格限制的全状态估算，仍失败返回 0）
+        """
+        try:
+            # Training Job: 只统计 InProgress 状态的（运行中）
+            # 注意：Training Job 配额通常是指并发运行的训练任务
+            # 添加超时和最大页数限制，避免无限等待
+            training_job_count = sagemaker_client.get_training_job_count(
+                status_filter='InProgress',
+                max_pages=100,  # 最多处理 100 页（约 10000 个任务）
+                timeout_seconds=30  # 30 秒超时
+            )
+            logger.info(f"Training Job 数量（运行中）: {training_job_count}")
+            return training_job_count
+        except Exception as e:
+            logger.warning(f"获取 Training Job 数量（运行中）失败: {e}")
+        # 如果失败，尝试不使用状态过滤，但使用更严格的限制
+        logger.info("尝试获取所有状态的 Training Job 数量（使用严格限制）...")
+        try:
+            training_job_count = sagemaker_client.get_training_job_count(
+                status_filter=None,
+                max_pages=50,  # 只处理前 50 页作为估算
+                timeout_seconds=20  # 20 秒超时
+            )
+            logger.info(f"Training Job 数量（估算，前 50 页）: {training_job_count}")
+            return training_job_count
+        except Exception as e2:
+            logger.warning(f"获取 Training Job 数量也失败: {e2}")
+            return 0
+    
+    @staticmethod
+    def _count_endpoints(sagemaker_client: SageMakerClient) -> int:
+        """
+        获取运行中的 Endpoint 数量（失败时退回统计所有状态，仍失败返回 0）
+        """
+        try:
+            # Endpoint: 只统计 InService 状态的（运行中）
+            endpoint_count = sagemaker_client.get_endpoint_count(status_filter='InService')
+            logger.info(f"Endpoint 数量（运行中）: {endpoint_count}")
+            return endpoint_count
+        except Exception as e:
+            logger.warning(f"获取 Endpoint 数量失败: {e}")
+        # 如果失败，尝试获取所有状态的数量
+        try:
+            endpoint_count = sagemaker_client.get_endpoint_count()
+            logger.info(f"Endpoint 数量（所有状态）: {endpoint_count}")
+            return endpoint_count
+        except Exception as e2:
+            logger.warning(f"获取 Endpoint 数量（所有状态）也失败: {e2}")
+            return 0
+    
     def get_provider_type(self) -> str:
         """获取 Provider 类型"""
         return "sagemaker"
@@ -11,13 +11,33 @@ Active Region Discoverer 模块
 import logging
 import os
 import json
+import random
 import time
-import boto3
-from typing import Dict, List, Optional, Set
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from botocore.exceptions import ClientError, BotoCoreError
+from api.aws.client_cache import get_client
+from cache.inflight import InflightRegistry
 
 logger = logging.getLogger(__name__)
 
+# Region 本身不可用（未启用的 opt-in Region 等）的错误码：与凭证无关，下一次缓存刷新时不再探测
+_UNREACHABLE_REGION_CODES = ('OptInRequired', 'InvalidEndpoint')
+
+# Region 探测结果：有实例 / 确认无实例 / Region 不可用 / 探测失败（限流、网络错误等，结果未知）
+PROBE_USED = 'used'
+PROBE_EMPTY = 'empty'
+PROBE_UNREACHABLE = 'unreachable'
+PROBE_ERROR = 'error'
+# AuthFailure 既可能是 Region 未启用，也可能是凭证错误 / 已轮换 / 已吊销：
+# 只有同一凭证在其他 Region 探测成功时才视为 Region 不可用，否则视为探测失败
+PROBE_AUTH_FAILURE = 'auth_failure'
+
+# Region 探测在途请求合并：(access_key, region) → 正在进行的探测
+# 启动时的全量发现与采集阶段按账号补充发现可能同时探测同一账号同一 Region，只发起一次 API 调用
+_inflight_probes = InflightRegistry()
+
 try:
     import pymysql
     PYMySQL_AVAILABLE = True
@@ -25,6 +45,40 @@ except ImportError:
     PYMySQL_AVAILABLE = False
     logger.warning("pymysql 未安装，Active Region Discoverer 将无法使用。请运行: pip install pymysql")
 
+# 缓存文件读写：orjson 直接读写 bytes，速度明显快于标准库 json；未安装时回退到 json
+# （两者都输出缩进格式，缓存文件仍可直接查看）
+try:
+    import orjson
+    
+    def _dumps(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(data) -> bytes:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    _loads = json.loads
+
+
+def _write_cache_file(cache_file: str, data) -> None:
+    """
+    写入缓存文件：先写临时文件再原子替换（os.replace），进程中断时不会留下半个 JSON 文件
+    
+    临时文件名带进程号和线程号，并发写同一缓存文件时互不覆盖，最后一次替换生效
+    """
+    tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(_dumps(data))
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
+
 
 class ActiveRegionDiscoverer:
     """
@@ -36,6 +90,10 @@ class ActiveRegionDiscoverer:
     - 发现每个账号的活跃 Region
     """
     
+    # 缓存文件名：所有账号的 EC2 Region 结果合并在一个文件中，Region 候选集单独一个文件
+    ACCOUNT_REGIONS_CACHE_FILE = 'account_regions.json'
+    REGION_CANDIDATES_CACHE_FILE = 'region_candidates.json'
+    
     def __init__(self,
                  db_host: str = None,
                  db_port: int = None,
@@ -68,6 +126,29 @@ class ActiveRegionDiscoverer:
         # 缓存配置（按 account_id 缓存 24h）
         self.cache_dir = os.getenv('EC2_REGIONS_CACHE_DIR', '.ec2_regions_cache')
         self.cache_ttl = int(os.getenv('EC2_REGIONS_CACHE_TTL', '86400'))  # 默认 24 小时（86400秒）
+        # 全量探测周期：缓存过期后、全量周期内只重新探测上次有实例的 Region、新增候选 Region，
+        # 以及从上次无实例的 Region 中随机抽样的 EC2_REGIONS_NEGATIVE_SAMPLE 个（用于发现新启用的 Region）
+        self.full_scan_ttl = int(os.getenv('EC2_REGIONS_FULL_SCAN_TTL', '604800'))  # 默认 7 天
+        self.negative_sample_size = int(os.getenv('EC2_REGIONS_NEGATIVE_SAMPLE', '3'))
+        
+        # 单个账号内并发探测 Region 的线程数（每个 Region 一次 DescribeInstances，I/O 密集）
+        self.probe_max_workers = int(os.getenv('EC2_PROBE_MAX_WORKERS', '16'))
+        # 并发探测的账号数（不同账号凭证独立、限流独立，总线程数约为两者乘积）
+        self.account_probe_workers = int(os.getenv('ACCOUNT_PROBE_WORKERS', '8'))
+        
+        # 账号 EC2 Region 结果：account_id -> {'timestamp': ..., 'regions': [...],
+        #                                     'negative_regions': [...], 'dead_regions': [...],
+        #                                     'full_scan_timestamp': ...}
+        # 进程内首次发现时整体读入一次（之后内存字典即为权威副本），每次发现结束时整体写回一次
+        # （并发探测线程只修改内存中的字典）
+        self._account_cache: Dict[str, Dict[str, Any]] = {}
+        self._account_cache_loaded = False
+        self._account_cache_dirty = False
+        self._account_cache_lock = threading.Lock()
+        
+        # Region 候选集的进程内缓存（每月更新的静态输入，与账号缓存使用相同 TTL）
+        self._region_candidates: Optional[List[str]] = None
+        self._region_candidates_ts = 0.0
         
         # 创建缓存目录
         if not os.path.exists(self.cache_dir):
@@ -95,7 +176,77 @@ class ActiveRegionDiscoverer:
             logger.error(f"连接 CMDB 数据库失败: {e}")
             raise
     
-    def get_region_candidates(self) -> List[str]:
+    def get_region_candidates(self, use_cache: bool = True, force_refresh: bool = False) -> List[str]:
+        """
+        获取 AWS Region 候选集（CMDB 中的静态输入，按 cache_ttl 缓存在内存和缓存文件中）
+        
+        Args:
+            use_cache: 是否使用缓存（默认 True）
+            force_refresh: 是否强制刷新（忽略缓存，默认 False）
+        
+        Returns:
+            Region 列表，例如: ['us-east-1', 'us-west-2', 'eu-west-1', ...]
+        """
+        if use_cache and not force_refresh:
+            # 进程内缓存：同一进程内多次发现不再读文件
+            if self._region_candidates and time.time() - self._region_candidates_ts <= self.cache_ttl:
+                return self._region_candidates
+            
+            cached = self._load_region_candidates_cache()
+            if cached:
+                self._region_candidates, self._region_candidates_ts = cached
+                return self._region_candidates
+        
+        regions = self._query_region_candidates()
+        
+        # 查询失败（空列表）不写入缓存，下次重新查询
+        if regions and use_cache:
+            self._region_candidates, self._region_candidates_ts = regions, time.time()
+            self._save_region_candidates_cache(regions)
+        return regions
+    
+    def _load_region_candidates_cache(self) -> Optional[Tuple[List[str], float]]:
+        """从缓存文件加载 Region 候选集，返回 (regions, timestamp)，不存在或已过期时返回 None"""
+        cache_file = os.path.join(self.cache_dir, self.REGION_CANDIDATES_CACHE_FILE)
+        
+        if not os.path.exists(cache_file):
+            return None
+        
+        try:
+            with open(cache_file, 'rb') as f:
+                cache_data = _loads(f.read())
+            
+            cache_time = cache_data.get('timestamp', 0)
+            if time.time() - cache_time > self.cache_ttl:
+                logger.debug("Region 候选集缓存已过期，需要重新查询 CMDB")
+                return None
+            
+            regions = cache_data.get('regions', [])
+            logger.debug(f"从缓存加载 Region 候选集: {len(regions)} 个")
+            return regions, cache_time
+            
+        except Exception as e:
+            logger.warning(f"加载 Region 候选集缓存失败: {e}")
+            return None
+    
+    def _save_region_candidates_cache(self, regions: List[str]):
+        """保存 Region 候选集到缓存文件"""
+        cache_file = os.path.join(self.cache_dir, self.REGION_CANDIDATES_CACHE_FILE)
+        
+        try:
+            cache_data = {
+                'timestamp': time.time(),
+                'regions': regions
+            }
+            
+            _write_cache_file(cache_file, cache_data)
+            
+            logger.debug(f"Region 候选集已保存到缓存: {cache_file}")
+            
+        except Exception as e:
+            logger.warning(f"保存 Region 候选集缓存失败: {e}")
+    
+    def _query_region_candidates(self) -> List[str]:
         """
         从 CMDB 数据库读取 AWS Region 候选集
         
@@ -116,19 +267,19 @@ class ActiveRegionDiscoverer:
             
             with connection.cursor() as cursor:
                 # 使用 region 字段（匹配实际数据库表结构）
+                # 候选集只有几十行，去重和排序放在应用侧，不让数据库建临时表和 filesort
                 sql = """
-                    SELECT DISTINCT region
+                    SELECT region
                     FROM cmdb_back_on.cloud_region
                     WHERE cloud IN ('aws')
                       AND region != 'global'
                       AND region IS NOT NULL
                       AND region != ''
-                    ORDER BY region
                 """
                 cursor.execute(sql)
                 results = cursor.fetchall()
                 
-                regions = [row['region'] for row in results if row.get('region')]
+                regions = sorted({row['region'] for row in results if row.get('region')})
                 logger.info(f"从 CMDB 数据库读取到 {len(regions)} 个 AWS Region 候选: {regions}")
                 return regions
                 
@@ -142,11 +293,12 @@ class ActiveRegionDiscoverer:
     def probe_ec2_usage(self, 
                         region: str, 
                         access_key: str, 
-                        secret_key: str) -> bool:
+                        secret_key: str) -> str:
         """
         探测指定账号在指定 Region 是否使用过 EC2（是否有实例）
         
-        使用 EC2 DescribeInstances 检查是否有至少 1 个实例
+        使用 EC2 DescribeInstanceStatus（IncludeAllInstances）检查是否有至少 1 个实例，
+        无该权限时回退到 DescribeInstances
         
         Args:
             region: AWS Region
@@ -154,37 +306,36 @@ class ActiveRegionDiscoverer:
             secret_key: AWS Secret Key
         
         Returns:
-            True: Region 有 EC2 实例（使用过该 Region）
-            False: Region 无 EC2 实例或无法访问
+            PROBE_USED: Region 有 EC2 实例（使用过该 Region）
+            PROBE_EMPTY: 确认 Region 无 EC2 实例
+            PROBE_UNREACHABLE: Region 对该账号不可用（未启用的 opt-in Region 等，见 _UNREACHABLE_REGION_CODES）
+            PROBE_ERROR: 探测失败（限流、网络错误、凭证无效等），无法判断是否有实例
+            PROBE_AUTH_FAILURE: 返回 AuthFailure（由调用方结合其他 Region 的结果判断）
         """
         try:
-            # 使用 boto3 Session 创建客户端
-            session = boto3.Session(
-                aws_access_key_id=access_key,
-                aws_secret_access_key=secret_key
-            )
-            ec2_client = session.client('ec2', region_name=region)
+            # 获取（复用）EC2 客户端：探测用的 client 与后续采集阶段的 EC2Client 共用
+            ec2_client = get_client('ec2', region, access_key, secret_key)
             
             # 检查是否有实例（MaxResults=5 用于轻量探测，只需要知道是否有实例）
-            # 注意：MaxResults 限制返回的实例数量，但如果有多个 Reservation，可能只返回第一个
-            # 所以我们遍历所有 Reservation 来统计实例数量
-            response = ec2_client.describe_instances(MaxResults=5)
-            
-            # 统计实例数量（遍历所有 Reservation）
-            instance_count = 0
-            for reservation in response.get('Reservations', []):
-                instances = reservation.get('Instances', [])
-                instance_count += len(instances)
-                # 如果找到至少一个实例，就可以返回了（不需要继续统计）
-                if instance_count > 0:
-                    break
+            # DescribeInstanceStatus 每个实例只返回状态摘要，响应远小于 DescribeInstances；
+            # IncludeAllInstances=True 时包含已停止的实例，与 DescribeInstances 的判断范围一致
+            try:
+                response = ec2_client.describe_instance_status(MaxResults=5, IncludeAllInstances=True)
+                instance_count = len(response.get('InstanceStatuses', []))
+            except ClientError as e:
+                # 凭证只授权了 ec2:DescribeInstances 时回退，避免 Region 被误判为未使用
+                if e.response.get("Error", {}).get("Code") not in ('UnauthorizedOperation', 'AccessDenied'):
+                    raise
+                logger.debug(f"Region {region} 无 DescribeInstanceStatus 权限，回退到 DescribeInstances")
+                response = ec2_client.describe_instances(MaxResults=5)
+                instance_count = sum(len(reservation.get('Instances', [])) for reservation in response.get('Reservations', []))
             
             if instance_count > 0:
                 logger.info(f"Region {region} 有 {instance_count} 个 EC2 实例（账号: {access_key[:8]}...）")
-                return True
+                return PROBE_USED
             else:
                 logger.debug(f"Region {region} 无 EC2 实例（账号: {access_key[:8]}...）")
-                return False
+                return PROBE_EMPTY
             
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code")
@@ -196,21 +347,91 @@ class ActiveRegionDiscoverer:
             
             if error_code in skip_codes:
                 logger.debug(f"Region {region} 不可访问（{error_code}）: {error_message}")
-                return False
+                if error_code == 'AuthFailure':
+                    return PROBE_AUTH_FAILURE
+                return PROBE_UNREACHABLE if error_code in _UNREACHABLE_REGION_CODES else PROBE_ERROR
             else:
                 # 其他错误（如网络错误、限流等），记录警告但不影响其他 Region
                 logger.warning(f"Region {region} 探测失败（{error_code}）: {error_message}")
-                return False
+                return PROBE_ERROR
                 
         except BotoCoreError as e:
             # boto3 核心错误（如网络错误）
             logger.warning(f"Region {region} 探测失败（BotoCoreError）: {e}")
-            return False
+            return PROBE_ERROR
             
         except Exception as e:
             # 其他未知错误
             logger.warning(f"Region {region} 探测失败（未知错误）: {e}")
-            return False
+            return PROBE_ERROR
+    
+    def _map_accounts(self, fn: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """
+        并发处理各账号（保持结果顺序），并发数由 ACCOUNT_PROBE_WORKERS 控制（默认 8）
+        
+        Args:
+            fn: 处理单个账号的函数
+            items: 账号列表
+        
+        Returns:
+            结果列表（与 items 顺序一致）
+        """
+        concurrency = min(self.account_probe_workers, len(items))
+        if concurrency <= 1:
+            return [fn(item) for item in items]
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(fn, items))
+    
+    def _probe_account_regions(self,
+                               account_id: str,
+                               region_candidates: List[str],
+                               access_key: str,
+                               secret_key: str) -> Tuple[List[str], List[str], List[str]]:
+        """
+        并发探测单个账号在各候选 Region 是否有 EC2 实例
+        
+        并发数由 EC2_PROBE_MAX_WORKERS 控制（默认 16），结果保持候选 Region 的顺序
+        
+        Args:
+            account_id: 账号 ID
+            region_candidates: 候选 Region 列表（仅在 CMDB 提供的候选 Region 内）
+            access_key: AWS Access Key
+            secret_key: AWS Secret Key
+        
+        Returns:
+            (有 EC2 实例的 Region 列表, 确认无 EC2 实例的 Region 列表, 对该账号不可用的 Region 列表)
+            （探测失败的 Region 不在任何列表中；AuthFailure 的 Region 仅在同一凭证有其他 Region
+            探测成功时计为不可用）
+        """
+        def probe(region: str) -> str:
+            try:
+                return _inflight_probes.do(
+                    (access_key, region),
+                    lambda: self.probe_ec2_usage(region, access_key, secret_key)
+                )
+            except Exception as e:
+                # 单个 Region 失败不影响其他 Region
+                logger.warning(f"账号 {account_id} 在 Region {region} 探测异常: {e}")
+                return PROBE_ERROR
+        
+        concurrency = min(self.probe_max_workers, len(region_candidates))
+        if concurrency <= 1:
+            probed = [probe(region) for region in region_candidates]
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                probed = list(executor.map(probe, region_candidates))
+        
+        used_regions = [region for region, outcome in zip(region_candidates, probed) if outcome == PROBE_USED]
+        empty_regions = [region for region, outcome in zip(region_candidates, probed) if outcome == PROBE_EMPTY]
+        unreachable_outcomes = (PROBE_UNREACHABLE,)
+        if any(outcome in (PROBE_USED, PROBE_EMPTY) for outcome in probed):
+            unreachable_outcomes = (PROBE_UNREACHABLE, PROBE_AUTH_FAILURE)
+        unreachable_regions = [region for region, outcome in zip(region_candidates, probed) if outcome in unreachable_outcomes]
+        if logger.isEnabledFor(logging.DEBUG):
+            for region in used_regions:
+                logger.debug(f"账号 {account_id} 在 Region {region} 有 EC2 实例")
+        return used_regions, empty_regions, unreachable_regions
     
     def discover_ec2_used_regions(self, 
                                   account_credentials: Dict[str, Dict[str, str]]) -> Dict[str, List[str]]:
@@ -232,80 +453,167 @@ class ActiveRegionDiscoverer:
         
         logger.info(f"开始发现 EC2 使用过的 Region（{len(account_credentials)} 个账号，{len(region_candidates)} 个候选 Region）")
         
-        result: Dict[str, List[str]] = {}
-        
-        # 遍历每个账号
-        for account_id, credentials in account_credentials.items():
+        def discover_account(item: Tuple[str, Dict[str, str]]) -> Optional[List[str]]:
+            account_id, credentials = item
             access_key = credentials.get('access_key')
             secret_key = credentials.get('secret_key')
             
             if not access_key or not secret_key:
                 logger.warning(f"账号 {account_id} 凭证不完整，跳过")
-                continue
+                return None
             
             logger.info(f"探测账号 {account_id} 使用过的 EC2 Region...")
-            used_regions = []
-            
-            # 遍历每个候选 Region（仅在 CMDB 提供的候选 Region 内）
-            for region in region_candidates:
-                try:
-                    if self.probe_ec2_usage(region, access_key, secret_key):
-                        used_regions.append(region)
-                        logger.debug(f"账号 {account_id} 在 Region {region} 有 EC2 实例")
-                except Exception as e:
-                    # 单个 Region 失败不影响其他 Region
-                    logger.warning(f"账号 {account_id} 在 Region {region} 探测异常: {e}")
-                    continue
-            
-            result[account_id] = used_regions
+            used_regions, _, _ = self._probe_account_regions(account_id, region_candidates, access_key, secret_key)
             logger.info(f"账号 {account_id} 在 {len(used_regions)} 个 Region 使用过 EC2: {used_regions}")
+            return used_regions
+        
+        # 并发处理各账号（结果保持账号顺序）
+        items = list(account_credentials.items())
+        result: Dict[str, List[str]] = {
+            account_id: used_regions
+            for (account_id, _), used_regions in zip(items, self._map_accounts(discover_account, items))
+            if used_regions is not None
+        }
         
         logger.info(f"EC2 Region 发现完成，共 {len(result)} 个账号有 EC2 实例")
         return result
     
-    def _load_account_cache(self, account_id: str) -> Optional[List[str]]:
-        """从缓存文件加载单个账号的 EC2 Region 使用结果（按 account_id 缓存 24h）"""
+    def _read_account_cache_file(self) -> Dict[str, Dict[str, Any]]:
+        """读取合并的账号缓存文件（不存在或损坏时返回空字典）"""
+        cache_file = os.path.join(self.cache_dir, self.ACCOUNT_REGIONS_CACHE_FILE)
+        
+        if not os.path.exists(cache_file):
+            return {}
+        
+        try:
+            with open(cache_file, 'rb') as f:
+                accounts = _loads(f.read())
+            logger.debug(f"从缓存文件加载 {len(accounts)} 个账号的 EC2 Region 结果")
+            return accounts
+        except Exception as e:
+            logger.warning(f"加载账号 EC2 Region 缓存文件失败: {e}")
+            return {}
+    
+    def _read_legacy_account_cache(self, account_id: str) -> Optional[Dict[str, Any]]:
+        """读取旧版按 account_id 单独存放的缓存文件（升级后首次发现时沿用，避免全量重新探测）"""
         cache_file = os.path.join(self.cache_dir, f"{account_id}.json")
         
         if not os.path.exists(cache_file):
             return None
         
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            
-            # 检查缓存是否过期（24h）
-            cache_time = cache_data.get('timestamp', 0)
-            if time.time() - cache_time > self.cache_ttl:
-                logger.debug(f"账号 {account_id} 的缓存已过期，需要重新探测")
-                return None
-            
-            regions = cache_data.get('regions', [])
-            logger.debug(f"从缓存加载账号 {account_id} 的 EC2 Region: {len(regions)} 个")
-            return regions
-            
+            with open(cache_file, 'rb') as f:
+                return _loads(f.read())
         except Exception as e:
             logger.warning(f"加载账号 {account_id} 的缓存失败: {e}")
             return None
     
-    def _save_account_cache(self, account_id: str, regions: List[str]):
-        """保存单个账号的 EC2 Region 使用结果到缓存文件（按 account_id 缓存 24h）"""
-        cache_file = os.path.join(self.cache_dir, f"{account_id}.json")
+    def _load_account_cache(self, account_id: str) -> Optional[List[str]]:
+        """从缓存加载单个账号的 EC2 Region 使用结果（按 account_id 缓存 24h）"""
+        cache_data = self._account_cache.get(account_id)
+        if cache_data is None:
+            cache_data = self._read_legacy_account_cache(account_id)
+            if cache_data is None:
+                return None
+            # 迁移到合并的缓存文件，之后不再读取旧文件
+            with self._account_cache_lock:
+                self._account_cache[account_id] = cache_data
+                self._account_cache_dirty = True
         
-        try:
-            cache_data = {
-                'timestamp': time.time(),
-                'account_id': account_id,
-                'regions': regions
+        # 检查缓存是否过期（24h）
+        cache_time = cache_data.get('timestamp', 0)
+        if time.time() - cache_time > self.cache_ttl:
+            logger.debug(f"账号 {account_id} 的缓存已过期，需要重新探测")
+            return None
+        
+        regions = cache_data.get('regions', [])
+        logger.debug(f"从缓存加载账号 {account_id} 的 EC2 Region: {len(regions)} 个")
+        return regions
+    
+    def _select_probe_regions(self, account_id: str, region_candidates: List[str]) -> Tuple[List[str], bool]:
+        """
+        选择缓存过期后需要重新探测的 Region
+        
+        距上次全量探测不超过 full_scan_ttl 时，跳过上次刷新时不可用的 Region 和确认无实例的 Region
+        （后者随机抽样 negative_sample_size 个仍然探测），否则探测全部候选 Region
+        
+        Args:
+            account_id: 账号 ID
+            region_candidates: 候选 Region 列表
+        
+        Returns:
+            (需要探测的 Region 列表（保持候选顺序）, 是否为全量探测)
+        """
+        cache_data = self._account_cache.get(account_id)
+        if not cache_data or time.time() - cache_data.get('full_scan_timestamp', 0) > self.full_scan_ttl:
+            return list(region_candidates), True
+        
+        dead_regions = set(cache_data.get('dead_regions', []))
+        negative_regions = [
+            region for region in cache_data.get('negative_regions', [])
+            if region in region_candidates and region not in dead_regions
+        ]
+        sampled = set(random.sample(negative_regions, min(self.negative_sample_size, len(negative_regions))))
+        skipped = (set(negative_regions) - sampled) | dead_regions
+        
+        probe_regions = [region for region in region_candidates if region not in skipped]
+        logger.debug(f"账号 {account_id} 增量探测 {len(probe_regions)} 个 Region（跳过 {len(skipped)} 个上次无实例或不可用的 Region）")
+        return probe_regions, False
+    
+    def _save_account_cache(self,
+                            account_id: str,
+                            regions: List[str],
+                            empty_regions: List[str],
+                            dead_regions: List[str],
+                            region_candidates: List[str],
+                            full_scan: bool = True):
+        """
+        更新单个账号的 EC2 Region 使用结果（只写内存，由 _flush_account_cache 统一落盘）
+        
+        Args:
+            account_id: 账号 ID
+            regions: 有 EC2 实例的 Region 列表
+            empty_regions: 本次探测确认无 EC2 实例的 Region 列表
+            dead_regions: 本次探测到不可用的 Region 列表（只在下一次缓存刷新时跳过，之后重新探测）
+            region_candidates: 候选 Region 列表（本次未探测或探测失败的 Region 沿用上次的无实例状态，
+                               只有确认过无实例的 Region 才会在后续增量探测中被跳过）
+            full_scan: 本次是否为全量探测（增量探测时沿用上次全量探测的时间）
+        """
+        now = time.time()
+        probed = set(regions) | set(dead_regions)
+        empty = set(empty_regions)
+        with self._account_cache_lock:
+            previous = self._account_cache.get(account_id) or {}
+            previous_negative = set(previous.get('negative_regions', []))
+            self._account_cache[account_id] = {
+                'timestamp': now,
+                'regions': regions,
+                'negative_regions': [
+                    region for region in region_candidates
+                    if region in empty or (region not in probed and region in previous_negative)
+                ],
+                'dead_regions': dead_regions,
+                'full_scan_timestamp': now if full_scan else previous.get('full_scan_timestamp', 0)
             }
+            self._account_cache_dirty = True
+    
+    def _flush_account_cache(self):
+        """将账号缓存整体写回缓存文件"""
+        with self._account_cache_lock:
+            if not self._account_cache_dirty:
+                return
+            snapshot = dict(self._account_cache)
+            self._account_cache_dirty = False
+        
+        cache_file = os.path.join(self.cache_dir, self.ACCOUNT_REGIONS_CACHE_FILE)
+        
+        try:
+            _write_cache_file(cache_file, snapshot)
             
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
-            
-            logger.debug(f"账号 {account_id} 的 EC2 Region 结果已保存到缓存: {cache_file}")
+            logger.debug(f"{len(snapshot)} 个账号的 EC2 Region 结果已保存到缓存: {cache_file}")
             
         except Exception as e:
-            logger.warning(f"保存账号 {account_id} 的缓存失败: {e}")
+            logger.warning(f"保存账号 EC2 Region 缓存失败: {e}")
     
     def discover_ec2_used_regions_from_provider(self, 
                                                 account_provider,
@@ -317,8 +625,10 @@ class ActiveRegionDiscoverer:
         策略：
         - Region 候选集只从 CMDB 读取（视为静态输入）
         - 仅在 CMDB 提供的候选 Region 内探测
-        - 使用 ec2:DescribeInstances 检查是否有实例
+        - 使用 ec2:DescribeInstanceStatus 检查是否有实例（无权限时回退到 DescribeInstances）
         - 结果按 account_id 缓存 24h
+        - 缓存过期后的 7 天全量探测周期内，跳过上次无实例的 Region（随机抽样少量仍然探测）
+          和上次刷新时不可用的 Region（OptInRequired / InvalidEndpoint 等，不参与抽样，下一次刷新重新探测）
         
         Args:
             account_provider: CMDBAccountProvider 实例
@@ -329,7 +639,7 @@ class ActiveRegionDiscoverer:
             {account_id: [region1, region2, ...]} 的映射结果（只包含有 EC2 实例的 Region）
         """
         # 获取 Region 候选集（从 CMDB 读取，视为静态输入）
-        region_candidates = self.get_region_candidates()
+        region_candidates = self.get_region_candidates(use_cache=use_cache, force_refresh=force_refresh)
         
         if not region_candidates:
             logger.warning("Region 候选集为空，无法进行探测")
@@ -342,47 +652,52 @@ class ActiveRegionDiscoverer:
             logger.warning("账号列表为空，无法进行探测")
             return {}
         
-        result: Dict[str, List[str]] = {}
+        # 一次读入所有账号的缓存结果（同一进程内后续发现直接使用内存字典，不再读盘）
+        if use_cache and not self._account_cache_loaded:
+            self._account_cache = self._read_account_cache_file()
+            self._account_cache_loaded = True
         
-        # 遍历每个账号（按 account_id 缓存）
-        for account_id, credentials in account_credentials.items():
+        def discover_account(item: Tuple[str, Dict[str, str]]) -> Optional[List[str]]:
+            account_id, credentials = item
             access_key = credentials.get('access_key')
             secret_key = credentials.get('secret_key')
             
             if not access_key or not secret_key:
                 logger.warning(f"账号 {account_id} 凭证不完整，跳过")
-                continue
+                return None
             
             # 检查缓存（按 account_id）
             if use_cache and not force_refresh:
                 cached_regions = self._load_account_cache(account_id)
                 if cached_regions is not None:
-                    result[account_id] = cached_regions
                     logger.debug(f"账号 {account_id} 使用缓存的 EC2 Region: {len(cached_regions)} 个")
-                    continue
-            
-            # 缓存未命中或过期，执行探测
-            logger.info(f"探测账号 {account_id} 使用过的 EC2 Region（在 {len(region_candidates)} 个候选 Region 内）...")
-            used_regions = []
-            
-            # 遍历每个候选 Region（仅在 CMDB 提供的候选 Region 内）
-            for region in region_candidates:
-                try:
-                    if self.probe_ec2_usage(region, access_key, secret_key):
-                        used_regions.append(region)
-                        logger.debug(f"账号 {account_id} 在 Region {region} 有 EC2 实例")
-                except Exception as e:
-                    # 单个 Region 失败不影响其他 Region
-                    logger.warning(f"账号 {account_id} 在 Region {region} 探测异常: {e}")
-                    continue
+                    return cached_regions
             
-            result[account_id] = used_regions
+            # 缓存未命中或过期，执行探测（全量探测周期内跳过上次无实例的 Region）
+            if use_cache and not force_refresh:
+                probe_regions, full_scan = self._select_probe_regions(account_id, region_candidates)
+            else:
+                probe_regions, full_scan = region_candidates, True
+            logger.info(f"探测账号 {account_id} 使用过的 EC2 Region（在 {len(region_candidates)} 个候选 Region 中探测 {len(probe_regions)} 个）...")
+            used_regions, empty_regions, dead_regions = self._probe_account_regions(account_id, probe_regions, access_key, secret_key)
             
-            # 保存到缓存（按 account_id）
+            # 保存到缓存（只更新内存，全部账号处理完后统一写回）
             if use_cache:
-                self._save_account_cache(account_id, used_regions)
+                self._save_account_cache(account_id, used_regions, empty_regions, dead_regions, region_candidates, full_scan)
             
             logger.info(f"账号 {account_id} 在 {len(used_regions)} 个 Region 使用过 EC2: {used_regions}")
+            return used_regions
+        
+        # 并发处理各账号（结果保持账号顺序）
+        items = list(account_credentials.items())
+        result: Dict[str, List[str]] = {
+            account_id: used_regions
+            for (account_id, _), used_regions in zip(items, self._map_accounts(discover_account, items))
+            if used_regions is not None
+        }
+        
+        if use_cache:
+            self._flush_account_cache()
         
         logger.info(f"EC2 Region 发现完成，共 {len(result)} 个账号")
         return result
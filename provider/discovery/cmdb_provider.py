@@ -11,6 +11,7 @@ import logging
 import os
 import json
 import time
+import threading
 from typing import List, Dict, Optional, Tuple
 from .interfaces import AccountProvider, RegionProvider
 
@@ -23,6 +24,40 @@ except ImportError:
     PYMySQL_AVAILABLE = False
     logger.warning("pymysql 未安装，CMDB Provider 将无法使用。请运行: pip install pymysql")
 
+# 缓存文件读写：orjson 直接读写 bytes，速度明显快于标准库 json；未安装时回退到 json
+# （两者都输出缩进格式，缓存文件仍可直接查看）
+try:
+    import orjson
+    
+    def _dumps(data) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(data) -> bytes:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    _loads = json.loads
+
+
+def _write_cache_file(cache_file: str, data) -> None:
+    """
+    写入缓存文件：先写临时文件再原子替换（os.replace），进程中断时不会留下半个 JSON 文件
+    
+    临时文件名带进程号和线程号，并发写同一缓存文件时互不覆盖，最后一次替换生效
+    """
+    tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(_dumps(data))
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
+
 
 class CMDBAccountProvider(AccountProvider):
     """
@@ -33,6 +68,7 @@ class CMDBAccountProvider(AccountProvider):
     缓存机制：
     - 账号列表缓存 24 小时（86400 秒）
     - 缓存文件：.cmdb_accounts_cache/accounts.json
+    - 账号凭证只缓存在进程内存中，不写入缓存文件
     - 可通过环境变量 ACCOUNTS_CACHE_TTL 调整缓存时间
     - 可通过环境变量 FORCE_REFRESH_ACCOUNTS=true 强制刷新
     """
@@ -70,10 +106,25 @@ class CMDBAccountProvider(AccountProvider):
         self.cache_dir = os.getenv('CMDB_ACCOUNTS_CACHE_DIR', '.cmdb_accounts_cache')
         self.cache_ttl = int(os.getenv('ACCOUNTS_CACHE_TTL', '86400'))  # 默认 24 小时（86400秒）
         
+        # 进程内缓存：(写入时间, 结果)，与缓存文件共用时间戳和 TTL，命中时不再读盘
+        # 凭证只保存在这里（不落盘）；会被各账号的采集线程并发读取，因此用锁保护
+        self._accounts_memo: Optional[Tuple[float, List[str]]] = None
+        self._credentials_memo: Optional[Tuple[float, Dict[str, Dict[str, str]]]] = None
+        self._memo_lock = threading.Lock()
+        
         # 创建缓存目录
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir, exist_ok=True)
         
+        # 旧版本会把明文凭证写入 credentials.json，凭证改为只缓存在内存后删除该文件
+        legacy_credentials_file = os.path.join(self.cache_dir, 'credentials.json')
+        if os.path.exists(legacy_credentials_file):
+            try:
+                os.remove(legacy_credentials_file)
+                logger.info(f"已删除旧版账号凭证缓存文件: {legacy_credentials_file}")
+            except OSError as e:
+                logger.warning(f"删除旧版账号凭证缓存文件失败: {e}")
+        
         logger.info(f"初始化 CMDB Account Provider (host: {self.db_host}, db: {self.db_name})")
         logger.info(f"缓存目录: {self.cache_dir}, 缓存时间: {self.cache_ttl} 秒 ({self.cache_ttl // 3600} 小时)")
     
@@ -96,6 +147,17 @@ class CMDBAccountProvider(AccountProvider):
             logger.error(f"连接 CMDB 数据库失败: {e}")
             raise
     
+    def _get_memo(self, attr: str):
+        """返回未过期的进程内缓存结果（不存在或已过期时返回 None）"""
+        with self._memo_lock:
+            memo = getattr(self, attr)
+            if memo is None:
+                return None
+            cache_time, value = memo
+        if time.time() - cache_time > self.cache_ttl:
+            return None
+        return value
+    
     def _load_accounts_cache(self) -> Optional[List[str]]:
         """从缓存文件加载账号列表（缓存 24h）"""
         cache_file = os.path.join(self.cache_dir, 'accounts.json')
@@ -104,8 +166,8 @@ class CMDBAccountProvider(AccountProvider):
             return None
         
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            with open(cache_file, 'rb') as f:
+                cache_data = _loads(f.read())
             
             # 检查缓存是否过期（24h）
             cache_time = cache_data.get('timestamp', 0)
@@ -114,6 +176,8 @@ class CMDBAccountProvider(AccountProvider):
                 return None
             
             accounts = cache_data.get('accounts', [])
+            with self._memo_lock:
+                self._accounts_memo = (cache_time, accounts)
             logger.debug(f"从缓存加载账号列表: {len(accounts)} 个账号")
             return accounts
             
@@ -130,20 +194,29 @@ class CMDBAccountProvider(AccountProvider):
                 'timestamp': time.time(),
                 'accounts': accounts
             }
+            with self._memo_lock:
+                self._accounts_memo = (cache_data['timestamp'], accounts)
             
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
+            _write_cache_file(cache_file, cache_data)
             
             logger.debug(f"账号列表已保存到缓存: {cache_file}")
             
         except Exception as e:
             logger.warning(f"保存账号列表缓存失败: {e}")
     
-    def _query_accounts_from_db(self) -> List[str]:
-        """从数据库查询账号列表（内部方法）"""
+    def _query_all_from_db(self) -> Tuple[List[str], Dict[str, Dict[str, str]]]:
+        """
+        从数据库一次查询账号列表和账号凭证（内部方法）
+        
+        账号列表与凭证来自同一张表的同一批行，一次查询同时得到两者，
+        get_accounts / get_account_credentials 冷缓存时只需访问一次数据库
+        
+        Returns:
+            (账号 ID 列表, {account_id: {'access_key': ..., 'secret_key': ...}})，失败时返回 ([], {})
+        """
         if not PYMySQL_AVAILABLE:
             logger.error("pymysql 未安装，无法查询数据库")
-            return []
+            return [], {}
         
         connection = None
         try:
@@ -159,22 +232,47 @@ class CMDBAccountProvider(AccountProvider):
                 results = cursor.fetchall()
                 
                 accounts = []
+                credentials = {}
                 for row in results:
                     account_id = row.get('accountId')
-                    if account_id:
-                        accounts.append(str(account_id))
+                    if not account_id:
+                        continue
+                    account_id = str(account_id)
+                    accounts.append(account_id)
+                    
+                    access_key = row.get('access_key', '')
+                    secret_key = row.get('secret_key', '')
+                    if access_key and secret_key:
+                        credentials[account_id] = {
+                            'access_key': access_key,
+                            'secret_key': secret_key
+                        }
                 
-                logger.info(f"从 CMDB 数据库读取到 {len(accounts)} 个 AWS 账号")
+                logger.info(f"从 CMDB 数据库读取到 {len(accounts)} 个 AWS 账号（{len(credentials)} 个账号有凭证）")
                 logger.debug(f"账号列表: {accounts}")
-                return accounts
+                return accounts, credentials
                 
         except Exception as e:
-            logger.error(f"从 CMDB 数据库读取账号列表失败: {e}", exc_info=True)
-            return []
+            logger.error(f"从 CMDB 数据库读取账号及凭证失败: {e}", exc_info=True)
+            return [], {}
         finally:
             if connection:
                 connection.close()
     
+    def _refresh_from_db(self, use_cache: bool) -> Tuple[List[str], Dict[str, Dict[str, str]]]:
+        """查询数据库并同时刷新账号列表缓存和账号凭证（内存）缓存"""
+        accounts, credentials = self._query_all_from_db()
+        
+        if use_cache:
+            if accounts:
+                self._save_accounts_cache(accounts)
+            if credentials:
+                # 凭证只保存在进程内存中，不写缓存文件
+                with self._memo_lock:
+                    self._credentials_memo = (time.time(), credentials)
+        
+        return accounts, credentials
+    
     def get_accounts(self, use_cache: bool = True, force_refresh: bool = False) -> List[str]:
         """
         获取账号列表（带缓存机制，默认缓存 24 小时）
@@ -192,112 +290,26 @@ class CMDBAccountProvider(AccountProvider):
         if os.getenv('FORCE_REFRESH_ACCOUNTS', 'false').lower() == 'true':
             force_refresh = True
         
-        # 检查缓存
+        # 检查缓存（先查进程内缓存，未命中再读缓存文件）
         if use_cache and not force_refresh:
+            cached_accounts = self._get_memo('_accounts_memo')
+            if cached_accounts is not None:
+                return list(cached_accounts)
             cached_accounts = self._load_accounts_cache()
             if cached_accounts is not None:
                 logger.debug(f"使用缓存的账号列表: {len(cached_accounts)} 个账号")
                 return cached_accounts
         
-        # 缓存未命中或过期，从数据库查询
+        # 缓存未命中或过期，从数据库查询（同时刷新账号凭证缓存，随后的 get_account_credentials 无需再次查询）
         logger.info("从 CMDB 数据库查询账号列表...")
-        accounts = self._query_accounts_from_db()
-        
-        # 保存到缓存
-        if use_cache and accounts:
-            self._save_accounts_cache(accounts)
-        
+        accounts, _ = self._refresh_from_db(use_cache)
         return accounts
     
-    def _load_credentials_cache(self) -> Optional[Dict[str, Dict[str, str]]]:
-        """从缓存文件加载账号凭证（缓存 24h）"""
-        cache_file = os.path.join(self.cache_dir, 'credentials.json')
-        
-        if not os.path.exists(cache_file):
-            return None
-        
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            
-            # 检查缓存是否过期（24h）
-            cache_time = cache_data.get('timestamp', 0)
-            if time.time() - cache_time > self.cache_ttl:
-                logger.debug(f"账号凭证缓存已过期，需要重新查询")
-                return None
-            
-            credentials = cache_data.get('credentials', {})
-            logger.debug(f"从缓存加载账号凭证: {len(credentials)} 个账号")
-            return credentials
-            
-        except Exception as e:
-            logger.warning(f"加载账号凭证缓存失败: {e}")
-            return None
-    
-    def _save_credentials_cache(self, credentials: Dict[str, Dict[str, str]]):
-        """保存账号凭证到缓存文件（缓存 24h）"""
-        cache_file = os.path.join(self.cache_dir, 'credentials.json')
-        
-        try:
-            cache_data = {
-                'timestamp': time.time(),
-                'credentials': credentials
-            }
-            
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
-            
-            logger.debug(f"账号凭证已保存到缓存: {cache_file}")
-            
-        except Exception as e:
-            logger.warning(f"保存账号凭证缓存失败: {e}")
-    
-    def _query_credentials_from_db(self) -> Dict[str, Dict[str, str]]:
-        """从数据库查询账号凭证（内部方法）"""
-        if not PYMySQL_AVAILABLE:
-            logger.error("pymysql 未安装，无法查询数据库")
-            return {}
-        
-        connection = None
-        try:
-            connection = self._get_db_connection()
-            
-            with connection.cursor() as cursor:
-                sql = """
-                    SELECT accountId, access_key, secret_key
-                    FROM cmdb_back_on.audit_account
-                    WHERE origin = 'aws' AND is_freeze = '0'
-                """
-                cursor.execute(sql)
-                results = cursor.fetchall()
-                
-                credentials = {}
-                for row in results:
-                    account_id = str(row.get('accountId', ''))
-                    access_key = row.get('access_key', '')
-                    secret_key = row.get('secret_key', '')
-                    
-                    if account_id and access_key and secret_key:
-                        credentials[account_id] = {
-                            'access_key': access_key,
-                            'secret_key': secret_key
-                        }
-                
-                logger.info(f"从 CMDB 数据库读取到 {len(credentials)} 个账号的凭证")
-                return credentials
-                
-        except Exception as e:
-            logger.error(f"从 CMDB 数据库读取账号凭证失败: {e}", exc_info=True)
-            return {}
-        finally:
-            if connection:
-                connection.close()
-    
     def get_account_credentials(self, use_cache: bool = True, force_refresh: bool = False) -> Dict[str, Dict[str, str]]:
         """
         获取账号及其凭证（带缓存机制，默认缓存 24 小时）
         
-        从 audit_account 表查询 AWS 账号凭证，结果缓存 24 小时
+        从 audit_account 表查询 AWS 账号凭证，结果只在进程内存中缓存 24 小时（明文 AK/SK 不写入缓存文件）
         
         Args:
             use_cache: 是否使用缓存（默认 True）
@@ -310,21 +322,16 @@ class CMDBAccountProvider(AccountProvider):
         if os.getenv('FORCE_REFRESH_ACCOUNTS', 'false').lower() == 'true':
             force_refresh = True
         
-        # 检查缓存
+        # 检查进程内缓存（凭证不落盘，进程重启后首次调用查询数据库）
         if use_cache and not force_refresh:
-            cached_credentials = self._load_credentials_cache()
+            cached_credentials = self._get_memo('_credentials_memo')
             if cached_credentials is not None:
                 logger.debug(f"使用缓存的账号凭证: {len(cached_credentials)} 个账号")
-                return cached_credentials
+                return dict(cached_credentials)
         
-        # 缓存未命中或过期，从数据库查询
+        # 缓存未命中或过期，从数据库查询（同时刷新账号列表缓存，随后的 get_accounts 无需再次查询）
         logger.info("从 CMDB 数据库查询账号凭证...")
-        credentials = self._query_credentials_from_db()
-        
-        # 保存到缓存
-        if use_cache and credentials:
-            self._save_credentials_cache(credentials)
-        
+        _, credentials = self._refresh_from_db(use_cache)
         return credentials
     
     def get_provider_type(self) -> str:
@@ -416,6 +423,34 @@ class CMDBRegionProvider(RegionProvider):
         logger.debug(f"账号 {account_id} 的 EC2 Region: {len(regions)} 个 - {regions}")
         return regions
     
+    def get_regions_bulk(self, account_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        批量获取多个账号的 EC2 Region
+        
+        未缓存的账号通过一次 discover_ec2_used_regions_from_provider 调用统一发现，
+        而不是每个账号各自触发一次发现
+        
+        Args:
+            account_ids: 账号 ID 列表
+        
+        Returns:
+            {account_id: Region 列表}
+        """
+        missing = [a for a in account_ids if a not in self._ec2_regions_cache]
+        if missing and self.region_discoverer and self.account_provider:
+            try:
+                ec2_regions_map = self.region_discoverer.discover_ec2_used_regions_from_provider(
+                    self.account_provider,
+                    use_cache=True,
+                    force_refresh=False
+                )
+                for account_id in missing:
+                    self._ec2_regions_cache[account_id] = ec2_regions_map.get(account_id, [])
+            except Exception as e:
+                logger.error(f"批量获取 EC2 Region 失败: {e}")
+        
+        return {account_id: self.get_regions(account_id) for account_id in account_ids}
+    
     def get_provider_type(self) -> str:
         """获取 Provider 类型"""
         return "cmdb"
@@ -10,8 +10,10 @@ Credential Provider 实现
 
 import logging
 import os
+import threading
 import time
-from typing import Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 from abc import ABC, abstractmethod
 
 logger = logging.getLogger(__name__)
@@ -68,11 +70,31 @@ class CMDBCredentialProvider(CredentialProvider):
             cmdb_account_provider: CMDBAccountProvider 实例
         """
         self.cmdb_account_provider = cmdb_account_provider
-        self._cache: Dict[str, Tuple[Dict[str, str], float]] = {}  # account_id -> (credentials, expiration_time)
+        # 所有账号的凭证整体加载、整体过期：任一账号缓存过期时一次性刷新全部账号，
+        # 避免各账号过期时间错开后每个账号各触发一次全量读取
+        # 凭证在加载时冻结为只读视图，命中时直接返回，不再每次复制
+        self._cache: Dict[str, Mapping[str, str]] = {}  # account_id -> credentials（只读）
+        self._cache_expires_at = 0.0
+        self._cache_lock = threading.Lock()
         self.cache_ttl = 3600  # 1 小时缓存
         logger.info("初始化 CMDB Credential Provider（带缓存）")
     
-    def get_credentials(self, account_id: str) -> Optional[Dict[str, str]]:
+    def _refresh_cache(self):
+        """从 CMDB 一次性加载所有账号的凭证（并发采集线程同时过期时只加载一次）"""
+        with self._cache_lock:
+            if time.time() < self._cache_expires_at:
+                return
+            
+            all_credentials = self.cmdb_account_provider.get_account_credentials()
+            self._cache = {
+                account_id: MappingProxyType(dict(credentials))
+                for account_id, credentials in all_credentials.items()
+            }
+            # 读取失败或结果为空时不设置过期时间，下次调用重新读取
+            self._cache_expires_at = time.time() + self.cache_ttl if all_credentials else 0.0
+            logger.debug(f"从 CMDB 数据库读取 {len(all_credentials)} 个账号的凭证并缓存")
+    
+    def get_credentials(self, account_id: str) -> Optional[Mapping[str, str]]:
         """
         获取账号的凭证（带缓存）
         
@@ -80,29 +102,17 @@ class CMDBCredentialProvider(CredentialProvider):
             account_id: 账号 ID
         
         Returns:
-            凭证字典，包含 'access_key' 和 'secret_key'，如果不存在返回 None
+            凭证（只读映射，各调用方共享同一对象），包含 'access_key' 和 'secret_key'，如果不存在返回 None
         """
-        # 检查缓存
-        if account_id in self._cache:
-            credentials, expiration_time = self._cache[account_id]
-            if time.time() < expiration_time:
-                logger.debug(f"凭证缓存命中: account_id={account_id}")
-                return credentials.copy()
-            else:
-                # 缓存过期，删除
-                del self._cache[account_id]
-        
-        # 缓存未命中或过期，从数据库读取
         try:
-            all_credentials = self.cmdb_account_provider.get_account_credentials()
-            credentials = all_credentials.get(account_id)
+            # 缓存过期时整体刷新
+            if time.time() >= self._cache_expires_at:
+                self._refresh_cache()
             
+            credentials = self._cache.get(account_id)
             if credentials:
-                # 缓存凭证
-                expiration_time = time.time() + self.cache_ttl
-                self._cache[account_id] = (credentials.copy(), expiration_time)
-                logger.debug(f"从 CMDB 数据库读取凭证并缓存: account_id={account_id}")
-                return credentials.copy()
+                logger.debug(f"凭证缓存命中: account_id={account_id}")
+                return credentials
             else:
                 logger.warning(f"账号 {account_id} 的凭证在 CMDB 数据库中不存在")
                 return None
@@ -123,11 +133,13 @@ class CMDBCredentialProvider(CredentialProvider):
         Args:
             account_id: 账号 ID，如果为 None 则清除所有缓存
         """
-        if account_id:
-            if account_id in self._cache:
-                del self._cache[account_id]
+        # 凭证整体加载，清除任一账号都会让下次调用重新加载全部账号
+        with self._cache_lock:
+            if account_id:
+                self._cache.pop(account_id, None)
                 logger.debug(f"清除账号 {account_id} 的凭证缓存")
-        else:
-            self._cache.clear()
-            logger.debug("清除所有凭证缓存")
+            else:
+                self._cache.clear()
+                logger.debug("清除所有凭证缓存")
+            self._cache_expires_at = 0.0
 
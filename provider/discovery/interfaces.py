@@ -8,7 +8,8 @@ Provider Discovery 接口定义
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
 
 
 class AccountProvider(ABC):
@@ -63,6 +64,21 @@ class RegionProvider(ABC):
         """
         pass
     
+    def get_regions_bulk(self, account_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        批量获取多个账号的区域列表
+        
+        默认实现并发调用 get_regions，子类可以覆盖为一次性批量查询
+        
+        Args:
+            account_ids: 账号 ID 列表
+        
+        Returns:
+            {account_id: 区域列表}
+        """
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            return dict(zip(account_ids, executor.map(self.get_regions, account_ids)))
+    
     @abstractmethod
     def get_provider_type(self) -> str:
         """
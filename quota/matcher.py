@@ -8,28 +8,42 @@ SageMaker 配额模糊匹配模块
 - 返回最佳匹配的配额代码
 """
 
-# TODO: 实现 SageMaker 模糊匹配逻辑
+from rapidfuzz import fuzz, process, utils
+
+# 最低相似度（0.0-1.0），低于该值视为匹配失败
+MATCH_THRESHOLD = 0.7
+
+
 def match_sagemaker_quota(target_quota_name, available_quota_names):
     """
     对 SageMaker 配额进行模糊匹配
     
+    使用 rapidfuzz 的 WRatio 打分（综合整体编辑距离、部分子串和分词排序匹配），
+    在 C++ 中批量计算所有候选的相似度
+    
     Args:
         target_quota_name: 目标配额名称（来自 quotas.yaml）
         available_quota_names: 可用配额名称列表（来自 Service Quotas API）
     
     Returns:
-        (matched_quota_name, similarity_score) 元组，如果匹配成功
+        (matched_quota_name, similarity_score) 元组，如果匹配成功（相似度 >= 0.7 的最佳匹配）
         如果匹配失败，返回 (None, 0.0)
-    
-    TODO:
-        1. 实现多种匹配策略：
-           - 精确匹配
-           - 包含匹配（子串）
-           - 单词匹配（按空格分词）
-           - 编辑距离（Levenshtein distance）
-           - 前缀/后缀匹配
-        2. 计算相似度分数（0.0-1.0）
-        3. 返回最佳匹配（相似度 >= 0.7）
     """
-    pass
-
+    if not target_quota_name or not available_quota_names:
+        return None, 0.0
+    
+    # 名称完全一致时直接返回，不计算相似度
+    if target_quota_name in available_quota_names:
+        return target_quota_name, 1.0
+    
+    # score_cutoff 让 rapidfuzz 在相似度不可能达到阈值时提前结束单个候选的计算
+    result = process.extractOne(
+        target_quota_name,
+        available_quota_names,
+        scorer=fuzz.WRatio,
+        processor=utils.default_process,
+        score_cutoff=MATCH_THRESHOLD * 100
+    )
+    if result is None:
+        return None, 0.0
+    return result[0], result[1] / 100.0
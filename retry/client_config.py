@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+AWS 客户端重试配置模块
+
+功能：
+- 所有 boto3 client 共用的 botocore 配置
+- adaptive 重试模式：客户端令牌桶 + 指数退避，限流时由 SDK 自动重试，无需手写 sleep
+- 连接 / 读取超时：网络异常时快速失败并交给重试，不让采集线程长时间挂起
+"""
+
+import os
+from botocore.config import Config
+
+# 限流 / 临时错误的最大重试次数（不含首次请求），可通过 AWS_CLIENT_MAX_ATTEMPTS 调整
+AWS_CLIENT_MAX_ATTEMPTS = int(os.getenv('AWS_CLIENT_MAX_ATTEMPTS', '4'))
+
+# 连接 / 读取超时（秒），botocore 默认均为 60 秒
+AWS_CLIENT_CONNECT_TIMEOUT = int(os.getenv('AWS_CLIENT_CONNECT_TIMEOUT', '5'))
+AWS_CLIENT_READ_TIMEOUT = int(os.getenv('AWS_CLIENT_READ_TIMEOUT', '20'))
+
+AWS_CLIENT_CONFIG = Config(
+    retries={'max_attempts': AWS_CLIENT_MAX_ATTEMPTS, 'mode': 'adaptive'},
+    connect_timeout=AWS_CLIENT_CONNECT_TIMEOUT,
+    read_timeout=AWS_CLIENT_READ_TIMEOUT
+)
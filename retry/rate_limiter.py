@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+令牌桶限流模块
+
+功能：
+- 主动限流：只有令牌耗尽时才阻塞，替代每次调用前的固定 sleep
+- 被限流（TooManyRequestsException）时收紧令牌，自适应降速
+- 按 (account_id, region) 维护独立的令牌桶，并发线程之间互不抢占
+"""
+
+import os
+import time
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+
+# Service Quotas API 每个账号每个 Region 的限流预算
+DEFAULT_CAPACITY = float(os.getenv('SQ_RATE_LIMIT_BURST', '20'))
+DEFAULT_REFILL_RATE = float(os.getenv('SQ_RATE_LIMIT_RPS', '15'))
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶
+
+    功能：
+    - acquire(): 获取令牌，令牌不足时阻塞到补充足够为止
+    - penalize(): 被限流时令牌减半
+    """
+
+    def __init__(self, capacity: float = DEFAULT_CAPACITY, refill_rate: float = DEFAULT_REFILL_RATE):
+        """
+        初始化令牌桶
+
+        Args:
+            capacity: 桶容量（允许的突发请求数）
+            refill_rate: 每秒补充的令牌数
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """按流逝时间补充令牌（调用方需持有锁）"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+
+    def acquire(self, tokens: float = 1):
+        """
+        获取令牌，不足时阻塞等待
+
+        Args:
+            tokens: 需要的令牌数
+        """
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait_time = (tokens - self.tokens) / self.refill_rate
+            # 在锁外等待，不阻塞其他线程补充/获取
+            time.sleep(wait_time)
+
+    def penalize(self):
+        """被限流时令牌减半，降低后续请求速率"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens /= 2
+
+
+_buckets: Dict[Tuple[str, str], TokenBucket] = defaultdict(TokenBucket)
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(account_id: str, region: str) -> TokenBucket:
+    """
+    获取 (account_id, region) 对应的令牌桶（不存在时创建）
+
+    Args:
+        account_id: 账号 ID
+        region: 区域
+
+    Returns:
+        TokenBucket 对象
+    """
+    with _buckets_lock:
+        return _buckets[(account_id, region)]
@@ -5,28 +5,44 @@
 功能：
 - 指数退避重试
 - 可配置重试次数和间隔
+- Full Jitter：每次在 [0, 当前间隔) 内随机等待，避免多个账号在同一故障后同步重试
 """
 
-# TODO: 实现重试逻辑
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+
 def retry_with_backoff(func, max_retries=3, initial_interval=1.0, max_interval=30.0, multiplier=2.0):
     """
     使用指数退避执行重试
-    
+
+    第 n 次重试前等待 random.uniform(0, min(max_interval, initial_interval * multiplier ** n)) 秒
+
     Args:
-        func: 要执行的函数
-        max_retries: 最大重试次数
+        func: 要执行的函数（无参数）
+        max_retries: 最大重试次数（不含首次执行）
         initial_interval: 初始重试间隔（秒）
         max_interval: 最大重试间隔（秒）
         multiplier: 退避倍数
-    
+
     Returns:
         函数执行结果
-    
-    TODO:
-        1. 执行函数
-        2. 如果失败且可重试，等待后重试
-        3. 使用指数退避计算等待时间
-        4. 达到最大重试次数后抛出异常
+
+    Raises:
+        达到最大重试次数后抛出最后一次的异常
     """
-    pass
+    interval = initial_interval
+    for attempt in range(max_retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= max_retries:
+                raise
 
+            delay = random.uniform(0, min(max_interval, interval))
+            logger.debug(f"第 {attempt + 1} 次执行失败: {e}，{delay:.2f} 秒后重试（剩余 {max_retries - attempt} 次）")
+            time.sleep(delay)
+            interval *= multiplier
@@ -10,9 +10,8 @@
 """
 
 import threading
-import time
 import logging
-from typing import Callable
+from typing import Callable, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -49,8 +48,9 @@ class QuotaScheduler:
         self.limit_interval = limit_interval
         self.usage_interval = usage_interval
         
-        # 控制标志
+        # 控制标志（stop() 设置 _stop_event，等待中的刷新循环立即醒来退出）
         self._running = False
+        self._stop_event = threading.Event()
         self._limit_thread: Optional[threading.Thread] = None
         self._usage_thread: Optional[threading.Thread] = None
         
@@ -69,6 +69,7 @@ class QuotaScheduler:
             return
         
         self._running = True
+        self._stop_event.clear()
         
         # 启动 Limit 刷新线程
         self._limit_thread = threading.Thread(
@@ -98,9 +99,10 @@ class QuotaScheduler:
             return
         
         self._running = False
+        self._stop_event.set()
         logger.info("停止定时任务调度器...")
         
-        # 等待线程结束（最多等待 5 秒）
+        # 等待线程结束（最多等待 5 秒；等待中的线程会立即醒来，正在采集的线程在本轮采集结束后退出）
         if self._limit_thread and self._limit_thread.is_alive():
             self._limit_thread.join(timeout=5)
         
@@ -119,10 +121,8 @@ class QuotaScheduler:
         
         while self._running:
             try:
-                # 等待指定间隔
-                time.sleep(self.limit_interval)
-                
-                if not self._running:
+                # 等待指定间隔（stop() 时立即返回 True）
+                if self._stop_event.wait(self.limit_interval):
                     break
                 
                 # 执行 Limit 采集
@@ -147,10 +147,8 @@ class QuotaScheduler:
         
         while self._running:
             try:
-                # 等待指定间隔
-                time.sleep(self.usage_interval)
-                
-                if not self._running:
+                # 等待指定间隔（stop() 时立即返回 True）
+                if self._stop_event.wait(self.usage_interval):
                     break
                 
                 # 执行 Usage 采集
@@ -9,61 +9,80 @@
 3. 显示特定账号的指标
 """
 
+import gzip
 import urllib.request
 import sys
 import re
 from collections import defaultdict
 
+# 需要解析的指标（按字节前缀过滤，其余行不解码）
+_METRIC_PREFIXES = (b'cloud_service_quota_limit', b'cloud_service_quota_usage', b'cloud_quota_usage_percent')
+
+# 指标名 -> parse_metrics 中的分类
+_METRIC_TYPES = {
+    'cloud_service_quota_limit': 'limit',
+    'cloud_service_quota_usage': 'usage',
+    'cloud_quota_usage_percent': 'usage_percent',
+}
+
+# 一次匹配同时取出标签块和值（值支持科学计数法，如 1e+06）
+_METRIC_RE = re.compile(r'\{([^}]+)\}(?:\s+([\d.eE+-]+))?')
+# 标签值支持转义字符（如 \"）
+_LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)+)"')
+
 def fetch_metrics():
-    """从 metrics 端点获取指标"""
+    """从 metrics 端点逐行读取指标（只保留配额相关的指标行，不缓存整个响应）"""
     try:
-        response = urllib.request.urlopen('http://localhost:8000/metrics', timeout=10)
-        return response.read().decode('utf-8')
+        # exporter 支持 gzip 压缩响应，传输量通常只有明文的几分之一
+        request = urllib.request.Request('http://localhost:8000/metrics', headers={'Accept-Encoding': 'gzip'})
+        with urllib.request.urlopen(request, timeout=10) as response:
+            if response.headers.get('Content-Encoding') == 'gzip':
+                response = gzip.GzipFile(fileobj=response)
+            return [
+                raw.decode('utf-8', 'replace').rstrip('\r\n')
+                for raw in response
+                if raw.startswith(_METRIC_PREFIXES)
+            ]
     except Exception as e:
         print(f"❌ 无法连接到 exporter: {e}")
         print("   请确保 exporter 正在运行: python3 main.py")
         return None
 
-def parse_metrics(metrics_text):
-    """解析 metrics 文本"""
+def parse_metrics(metric_lines):
+    """解析 metrics 行"""
     metrics = {
         'limit': [],
         'usage': [],
         'usage_percent': []
     }
     
-    for line in metrics_text.split('\n'):
+    for line in metric_lines:
         if line.startswith('#') or not line.strip():
             continue
         
-        if 'cloud_service_quota_limit' in line:
-            metrics['limit'].append(line)
-        elif 'cloud_service_quota_usage' in line:
-            metrics['usage'].append(line)
-        elif 'cloud_quota_usage_percent' in line:
-            metrics['usage_percent'].append(line)
+        # 指标名位于行首（到 '{' 或空格为止），按名称一次查表分类
+        metric_type = _METRIC_TYPES.get(line.partition('{')[0].partition(' ')[0])
+        if metric_type:
+            metrics[metric_type].append(line)
     
     return metrics
 
 def extract_labels(metric_line):
     """从 metric 行中提取标签"""
     # 格式: metric_name{label1="value1",label2="value2"} value
-    match = re.search(r'\{([^}]+)\}', metric_line)
+    match = _METRIC_RE.search(metric_line)
     if not match:
         return {}
     
-    labels_str = match.group(1)
-    labels = {}
-    
-    # 解析标签
-    for label_match in re.finditer(r'(\w+)="([^"]+)"', labels_str):
-        key, value = label_match.groups()
-        labels[key] = value
+    labels_str, value = match.groups()
+    labels = dict(_LABEL_RE.findall(labels_str))
     
     # 提取值
-    value_match = re.search(r'\}\s+([\d.]+)', metric_line)
-    if value_match:
-        labels['value'] = float(value_match.group(1))
+    if value:
+        try:
+            labels['value'] = float(value)
+        except ValueError:
+            pass
     
     return labels
 
@@ -73,11 +92,11 @@ def view_summary():
     print("Quota 指标汇总")
     print("=" * 60)
     
-    metrics_text = fetch_metrics()
-    if not metrics_text:
+    metric_lines = fetch_metrics()
+    if not metric_lines:
         return
     
-    metrics = parse_metrics(metrics_text)
+    metrics = parse_metrics(metric_lines)
     
     # 统计
     stats = {
@@ -126,48 +145,50 @@ def view_by_account(account_id=None):
         print("按账号查看 Quota 指标")
     print("=" * 60)
     
-    metrics_text = fetch_metrics()
-    if not metrics_text:
+    metric_lines = fetch_metrics()
+    if not metric_lines:
         return
     
-    metrics = parse_metrics(metrics_text)
+    metrics = parse_metrics(metric_lines)
     
-    # 按账号分组
+    # 按账号分组（一次遍历直接累计条数和 Region / 服务分布，不保存每条指标的标签）
     by_account = defaultdict(lambda: {
-        'limit': [],
-        'usage': [],
-        'usage_percent': []
+        'limit': 0,
+        'usage': 0,
+        'usage_percent': 0,
+        'regions': set(),
+        'services': set()
     })
     
     for metric_type, lines in metrics.items():
         for line in lines:
             labels = extract_labels(line)
-            if 'account_id' in labels:
-                acc_id = labels['account_id']
-                if not account_id or acc_id == account_id:
-                    by_account[acc_id][metric_type].append(labels)
+            acc_id = labels.get('account_id')
+            if acc_id is None or (account_id and acc_id != account_id):
+                continue
+            
+            data = by_account[acc_id]
+            data[metric_type] += 1
+            # Region / 服务分布只统计 Limit 和 Usage
+            if metric_type != 'usage_percent':
+                if 'region' in labels:
+                    data['regions'].add(labels['region'])
+                if 'service' in labels:
+                    data['services'].add(labels['service'])
     
     for acc_id, data in sorted(by_account.items()):
         print(f"\n账号: {acc_id}")
-        print(f"  - Limit: {len(data['limit'])} 条")
-        print(f"  - Usage: {len(data['usage'])} 条")
-        print(f"  - Usage Percent: {len(data['usage_percent'])} 条")
+        print(f"  - Limit: {data['limit']} 条")
+        print(f"  - Usage: {data['usage']} 条")
+        print(f"  - Usage Percent: {data['usage_percent']} 条")
         
         # 显示 Region 分布
-        regions = set()
-        for item in data['limit'] + data['usage']:
-            if 'region' in item:
-                regions.add(item['region'])
-        if regions:
-            print(f"  - Region: {sorted(regions)}")
+        if data['regions']:
+            print(f"  - Region: {sorted(data['regions'])}")
         
         # 显示服务分布
-        services = set()
-        for item in data['limit'] + data['usage']:
-            if 'service' in item:
-                services.add(item['service'])
-        if services:
-            print(f"  - 服务: {sorted(services)}")
+        if data['services']:
+            print(f"  - 服务: {sorted(data['services'])}")
 
 def view_by_service(service=None):
     """按服务查看指标"""
@@ -178,40 +199,42 @@ def view_by_service(service=None):
         print("按服务查看 Quota 指标")
     print("=" * 60)
     
-    metrics_text = fetch_metrics()
-    if not metrics_text:
+    metric_lines = fetch_metrics()
+    if not metric_lines:
         return
     
-    metrics = parse_metrics(metrics_text)
+    metrics = parse_metrics(metric_lines)
     
-    # 按服务分组
+    # 按服务分组（一次遍历直接累计条数和账号分布，不保存每条指标的标签）
     by_service = defaultdict(lambda: {
-        'limit': [],
-        'usage': [],
-        'usage_percent': []
+        'limit': 0,
+        'usage': 0,
+        'usage_percent': 0,
+        'accounts': set()
     })
     
     for metric_type, lines in metrics.items():
         for line in lines:
             labels = extract_labels(line)
-            if 'service' in labels:
-                svc = labels['service']
-                if not service or svc == service:
-                    by_service[svc][metric_type].append(labels)
+            svc = labels.get('service')
+            if svc is None or (service and svc != service):
+                continue
+            
+            data = by_service[svc]
+            data[metric_type] += 1
+            # 账号分布只统计 Limit 和 Usage
+            if metric_type != 'usage_percent' and 'account_id' in labels:
+                data['accounts'].add(labels['account_id'])
     
     for svc, data in sorted(by_service.items()):
         print(f"\n服务: {svc}")
-        print(f"  - Limit: {len(data['limit'])} 条")
-        print(f"  - Usage: {len(data['usage'])} 条")
-        print(f"  - Usage Percent: {len(data['usage_percent'])} 条")
+        print(f"  - Limit: {data['limit']} 条")
+        print(f"  - Usage: {data['usage']} 条")
+        print(f"  - Usage Percent: {data['usage_percent']} 条")
         
         # 显示账号分布
-        accounts = set()
-        for item in data['limit'] + data['usage']:
-            if 'account_id' in item:
-                accounts.add(item['account_id'])
-        if accounts:
-            print(f"  - 账号数: {len(accounts)}")
+        if data['accounts']:
+            print(f"  - 账号数: {len(data['accounts'])}")
 
 def view_details(account_id=None, service=None, region=None):
     """查看详细指标"""
@@ -225,11 +248,11 @@ def view_details(account_id=None, service=None, region=None):
         print(f"Region: {region}")
     print("=" * 60)
     
-    metrics_text = fetch_metrics()
-    if not metrics_text:
+    metric_lines = fetch_metrics()
+    if not metric_lines:
         return
     
-    metrics = parse_metrics(metrics_text)
+    metrics = parse_metrics(metric_lines)
     
     # 过滤和显示
     count = 0
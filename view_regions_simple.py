@@ -14,6 +14,13 @@ import time
 import urllib.request
 import re
 
+# orjson 解析速度明显快于标准库 json；未安装时回退到 json
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 def view_from_cache():
     """从缓存查看各账号的 EC2 Region"""
     print("=" * 60)
@@ -27,45 +34,56 @@ def view_from_cache():
         print("   说明：还没有执行过 EC2 Region 发现")
         return {}
     
-    cache_files = [f for f in os.listdir(cache_dir) if f.endswith('.json')]
+    # 所有账号的结果合并在 account_regions.json 中；旧版按账号单独存放的 {account_id}.json 仍可读取
+    # os.scandir 一次返回文件名和路径（DirEntry），不必再逐个拼接路径
+    accounts = {}
+    with os.scandir(cache_dir) as it:
+        entries = sorted(
+            (entry for entry in it
+             if entry.name.endswith('.json') and entry.name != 'region_candidates.json' and entry.is_file()),
+            key=lambda entry: entry.name
+        )
+    for entry in entries:
+        cache_file = entry.name
+        try:
+            with open(entry.path, 'rb') as f:
+                cache_data = _loads(f.read())
+        except Exception as e:
+            print(f"❌ 读取缓存文件 {cache_file} 失败: {e}")
+            continue
+        
+        if cache_file == 'account_regions.json':
+            accounts.update(cache_data)
+        else:
+            accounts.setdefault(cache_file.replace('.json', ''), cache_data)
     
-    if not cache_files:
+    if not accounts:
         print(f"⚠️  缓存目录为空: {cache_dir}")
         print("   说明：还没有执行过 EC2 Region 发现")
         return {}
     
-    print(f"找到 {len(cache_files)} 个账号的缓存文件\n")
+    print(f"找到 {len(accounts)} 个账号的缓存\n")
     
     result = {}
-    for cache_file in sorted(cache_files):
-        account_id = cache_file.replace('.json', '')
-        cache_path = os.path.join(cache_dir, cache_file)
+    for account_id, cache_data in sorted(accounts.items()):
+        regions = cache_data.get('regions', [])
+        timestamp = cache_data.get('timestamp', 0)
         
-        try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            
-            regions = cache_data.get('regions', [])
-            timestamp = cache_data.get('timestamp', 0)
-            
-            # 检查缓存是否过期（24h）
-            cache_age = time.time() - timestamp
-            cache_age_hours = cache_age / 3600
-            is_expired = cache_age > 86400
-            
-            status = "✅ 有效" if not is_expired else "⚠️  已过期"
-            
-            result[account_id] = regions
-            
-            print(f"账号 {account_id}: {len(regions)} 个 EC2 Region {status} (缓存年龄: {cache_age_hours:.1f} 小时)")
-            if regions:
-                print(f"  Region 列表: {regions}")
-            else:
-                print(f"  Region 列表: [] (该账号没有使用过 EC2)")
-            print()
-            
-        except Exception as e:
-            print(f"❌ 读取缓存文件 {cache_file} 失败: {e}")
+        # 检查缓存是否过期（24h）
+        cache_age = time.time() - timestamp
+        cache_age_hours = cache_age / 3600
+        is_expired = cache_age > 86400
+        
+        status = "✅ 有效" if not is_expired else "⚠️  已过期"
+        
+        result[account_id] = regions
+        
+        print(f"账号 {account_id}: {len(regions)} 个 EC2 Region {status} (缓存年龄: {cache_age_hours:.1f} 小时)")
+        if regions:
+            print(f"  Region 列表: {regions}")
+        else:
+            print(f"  Region 列表: [] (该账号没有使用过 EC2)")
+        print()
     
     return result
 